@@ -14,17 +14,22 @@ Author: AEyePro Team
 Version: 1.0.0
 """
 
+import os
 import sys
 import json
+import base64
+import logging
 import time
 import threading
-import base64
 import traceback
+import uuid
+from collections import deque
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from pathlib import Path
 
 import cv2
 from flask import Flask, request, jsonify, send_from_directory
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room
 from flask_cors import CORS
 
 # Add paths to Python path for imports
@@ -33,8 +38,15 @@ project_root = current_dir.parent    # project root
 sys.path.insert(0, str(current_dir))      # For vision module
 sys.path.insert(0, str(project_root))     # For chatbot 'from src.chatbot...'
 
-# Import vision manager
-from vision.vision_manager import VisionManager
+from utils import ExecutorService
+
+# MessagePack encoding for metrics/status channels (falls back to JSON events)
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
 
 # Import chatbot interface
 try:
@@ -46,6 +58,26 @@ except ImportError as e:
     chat_interface = None
 
 
+# Logger for background threads and error paths. Tracebacks are only
+# formatted when a record is actually emitted.
+logger = logging.getLogger('aeyepro')
+
+# When enabled, API error responses include a formatted traceback in "details"
+# and broadcast loop warnings log the traceback. Off by default so error storms
+# don't pay for frame-walking on every request or loop iteration.
+DEBUG_ERRORS = os.getenv('AEYE_DEBUG', 'false').lower() == 'true'
+
+
+def error_details():
+    """
+    Get traceback details for an API error response
+    
+    Returns:
+        Formatted traceback when DEBUG_ERRORS is enabled, otherwise None
+    """
+    return traceback.format_exc() if DEBUG_ERRORS else None
+
+
 # =============================================================================
 # PART 1: BACKEND API SETUP
 # Flask Server Configuration with SocketIO and CORS
@@ -80,9 +112,59 @@ socketio = SocketIO(
 # VISION MANAGER INSTANCE
 # =============================================================================
 
-# Create a single global instance of VisionManager
-# This instance will be shared across all Flask routes and SocketIO handlers
-vision_manager = VisionManager()
+# Single global instance of VisionManager, shared across all Flask routes and
+# SocketIO handlers. Created on the first camera start so the server (and the
+# chatbot API) starts without importing the vision stack (MediaPipe, etc.).
+vision_manager = None
+_vision_manager_lock = threading.Lock()
+
+# Status reported while the vision system has never been started
+_IDLE_STATUS = {'is_running': False, 'session_id': None, 'fps': 0.0, 'last_error': None}
+
+
+def get_vision_manager():
+    """
+    Get or create the VisionManager (lazy initialization)
+    
+    Returns:
+        The global VisionManager instance
+    """
+    global vision_manager
+    with _vision_manager_lock:
+        if vision_manager is None:
+            from vision.vision_manager import VisionManager
+            vision_manager = VisionManager()
+        return vision_manager
+
+
+def vision_status():
+    """
+    Get vision system status without creating the VisionManager
+    
+    Returns:
+        Status dict as returned by vision_manager.get_status()
+    """
+    manager = vision_manager
+    return manager.get_status() if manager is not None else dict(_IDLE_STATUS)
+
+# Short-lived cache of vision_manager.get_status() for the broadcast loops,
+# which poll it many times per second and don't need exact freshness
+STATUS_CACHE_TTL = 0.05
+_status_cache = {'t': 0.0, 'v': None}
+
+
+def cached_status():
+    """
+    Get vision system status, reusing the last value for STATUS_CACHE_TTL seconds
+    
+    Returns:
+        Status dict as returned by vision_manager.get_status()
+    """
+    now = time.monotonic()
+    if _status_cache['v'] is None or now - _status_cache['t'] > STATUS_CACHE_TTL:
+        _status_cache['v'] = vision_status()
+        _status_cache['t'] = now
+    return _status_cache['v']
 
 
 # =============================================================================
@@ -94,6 +176,14 @@ _chatbot_app = None
 _chatbot_init_lock = threading.Lock()
 _chatbot_init_error = None
 
+# Chatbot requests run on their own pool so slow LLM calls do not tie up
+# Flask worker threads. The semaphore bounds running + queued requests.
+CHATBOT_MAX_WORKERS = 4
+CHATBOT_MAX_PENDING = 16
+CHATBOT_TIMEOUT_SECONDS = 30
+_chatbot_executor = ExecutorService(max_workers=CHATBOT_MAX_WORKERS)
+_chatbot_slots = threading.BoundedSemaphore(CHATBOT_MAX_PENDING)
+
 
 def get_chatbot_app():
     """
@@ -125,39 +215,304 @@ def get_chatbot_app():
             return _chatbot_app
         except Exception as e:
             _chatbot_init_error = str(e)
-            print(f"[Chatbot] Failed to initialize chatbot: {e}")
-            print(traceback.format_exc())
+            logger.exception("[Chatbot] Failed to initialize chatbot: %s", e)
             return None
 
 
+def submit_chatbot_request(user_message, thread_id, chatbot_app):
+    """
+    Queue a chatbot request on the chatbot executor
+    
+    Args:
+        user_message: User's message
+        thread_id: Chat thread identifier
+        chatbot_app: Initialized chatbot application
+        
+    Returns:
+        Future resolving to the chatbot response, or None if the queue is full
+    """
+    if not _chatbot_slots.acquire(blocking=False):
+        return None
+    
+    future = _chatbot_executor.submit(
+        chat_interface,
+        user_input=user_message,
+        thread_id=thread_id,
+        app=chatbot_app
+    )
+    future.add_done_callback(lambda _: _chatbot_slots.release())
+    return future
+
+
 # =============================================================================
 # REAL-TIME STREAMING
 # WebSocket Handlers for Frame and Metrics Broadcasting
 # =============================================================================
 
+def _msgpack_default(obj):
+    """Convert NumPy scalars/arrays that msgpack cannot pack natively"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Cannot serialize object of type {type(obj).__name__}")
+
+
+# Socket.IO rooms by payload encoding. Clients announce MessagePack support in
+# their connect auth ({msgpack: true}) once the decoder script has loaded; all
+# others (decoder blocked/offline, older pages) get plain JSON events.
+MSGPACK_ROOM = 'msgpack'
+JSON_ROOM = 'json'
+
+# Socket.IO sids of clients that decode MessagePack
+_msgpack_clients = set()
+
+
+def emit_packed(event, data, binary, emit_fn=None, **kwargs):
+    """
+    Emit an event as MessagePack when the receivers can decode it, otherwise as JSON
+    
+    MessagePack payloads are sent on '<event>_bin' as binary; the plain
+    event name is used for the JSON fallback so older clients keep working.
+    
+    Args:
+        event: Base event name (e.g. 'health_metrics')
+        data: JSON-serializable payload
+        binary: Whether the receiving clients decode MessagePack
+        emit_fn: Emit function to use (defaults to socketio.emit)
+        **kwargs: Extra arguments forwarded to the emit function
+    """
+    emit_fn = emit_fn or socketio.emit
+    if binary and MSGPACK_AVAILABLE:
+        emit_fn(f'{event}_bin', msgpack.packb(data, use_bin_type=True, default=_msgpack_default), **kwargs)
+    else:
+        emit_fn(event, data, **kwargs)
+
+
+# CPU affinity and nice value of the process at import, restored on encode
+# workers (see _reset_encode_worker)
+if sys.platform.startswith('linux'):
+    _BASE_AFFINITY = os.sched_getaffinity(0)
+    _BASE_NICE = os.getpriority(os.PRIO_PROCESS, 0)
+
+
+def _tune_broadcast_thread():
+    """
+    Pin the calling broadcast thread to the last CPU and raise its priority
+    
+    Keeps the broadcast loop's pacing, frame fan-out and emits on one core
+    and stops scheduler jitter from stretching the broadcast cadence under
+    load. JPEG encoding runs on _encode_executor, whose workers undo this
+    pinning (_reset_encode_worker). Every step is best-effort: unsupported
+    platforms or missing privileges are ignored.
+    """
+    if sys.platform.startswith('linux'):
+        try:
+            # pid 0 targets the calling thread on Linux
+            os.sched_setaffinity(0, {os.cpu_count() - 1})
+        except (AttributeError, OSError, TypeError):
+            pass
+        try:
+            if os.geteuid() == 0:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+            else:
+                os.nice(-5)
+        except (AttributeError, OSError):
+            pass
+    elif sys.platform == 'win32':
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(), 1 << (os.cpu_count() - 1))
+        except (AttributeError, OSError, TypeError):
+            pass
+
+
+# Bounding box frames are downscaled into (aspect ratio preserved) before any
+# encoding; the dashboard renders the feed at this size, so larger sources
+# only waste encode work and bandwidth
+BROADCAST_SIZE = (640, 360)
+
+# Adaptive streaming ladder, ordered from best to cheapest. Each client
+# starts at level 0 and is moved down when its unacknowledged frame backlog
+# grows, then back up once it has caught up again.
+#   q     - JPEG quality
+#   scale - bounding box the frame is fitted into (None keeps the
+#           BROADCAST_SIZE fit)
+#   skip  - send only every (skip + 1)-th frame
+STREAM_LEVELS = (
+    {'q': 85, 'scale': None, 'skip': 0},
+    {'q': 60, 'scale': None, 'skip': 0},
+    {'q': 60, 'scale': (480, 270), 'skip': 0},
+    {'q': 60, 'scale': (480, 270), 'skip': 1},
+)
+MAX_PENDING_FRAMES = 2
+
+# Upper bound on tracked unacknowledged frames per client, so clients that
+# never send 'frame_ack' don't grow their state without limit
+MAX_INFLIGHT_FRAMES = 16
+
+# cv2.imencode parameter lists keyed by JPEG quality, built once on first use.
+# Huffman optimization and progressive mode are disabled to keep encodes single-pass.
+_jpeg_params = {}
+
+def _reset_encode_worker():
+    """
+    Restore the process-wide CPU affinity and scheduling on a new encode worker
+    
+    ThreadPoolExecutor starts workers lazily inside submit(), i.e. on the
+    pinned broadcast thread, and Linux threads inherit their creator's
+    affinity mask, scheduling policy and nice value. Without this reset both
+    workers would share the broadcast thread's single core (serializing the
+    encodes) and run as real-time threads under root. Windows threads start
+    with the process affinity, so nothing is needed there.
+    """
+    if not sys.platform.startswith('linux'):
+        return
+    try:
+        os.sched_setaffinity(0, _BASE_AFFINITY)
+    except (AttributeError, OSError):
+        pass
+    try:
+        if os.sched_getscheduler(0) != os.SCHED_OTHER:
+            os.sched_setscheduler(0, os.SCHED_OTHER, os.sched_param(0))
+        # pid 0 targets the calling thread on Linux
+        os.setpriority(os.PRIO_PROCESS, 0, _BASE_NICE)
+    except (AttributeError, OSError):
+        pass
+
+
+# Dedicated pool for JPEG encoding, one worker per concurrent variant
+_encode_executor = ExecutorService(max_workers=2, initializer=_reset_encode_worker)
+
+# Actual (width, height) of the last broadcast frame before per-level
+# scaling, reported by /api/settings
+_broadcast_info = {'size': None}
+
+# Per-client streaming state keyed by Socket.IO sid
+_client_streams = {}
+_client_streams_lock = threading.Lock()
+
+
+def _new_client_stream():
+    """Create the initial streaming state for a newly connected client"""
+    # 'inflight' holds the seq number of every frame sent but not yet
+    # acknowledged, oldest first; 'seq' is the number of the next frame
+    return {'level': 0, 'inflight': deque(maxlen=MAX_INFLIGHT_FRAMES), 'tick': 0, 'seq': 0}
+
+
+def _adjust_stream_level(state):
+    """
+    Move a client up or down the STREAM_LEVELS ladder based on its backlog
+
+    Args:
+        state: Per-client streaming state (modified in place)
+    """
+    pending = len(state['inflight'])
+    if pending > MAX_PENDING_FRAMES:
+        if state['level'] < len(STREAM_LEVELS) - 1:
+            state['level'] += 1
+            # Give the client a fresh window at the new level; late acks
+            # for the dropped frames carry older seqs and are ignored
+            state['inflight'].clear()
+    elif pending == 0 and state['level'] > 0:
+        state['level'] -= 1
+
+
+def _fit_size(shape, bound):
+    """
+    Get the largest size that fits inside a bounding box with the same aspect ratio
+    
+    Args:
+        shape: Frame shape (height, width, ...)
+        bound: Bounding (width, height)
+        
+    Returns:
+        Target (width, height), or None if the frame already fits
+    """
+    height, width = shape[:2]
+    scale = min(bound[0] / width, bound[1] / height)
+    if scale >= 1.0:
+        return None
+    return (max(1, round(width * scale)), max(1, round(height * scale)))
+
+
+def _resize_for_broadcast(frame):
+    """
+    Downscale a frame to fit inside BROADCAST_SIZE, keeping its aspect ratio
+    (frames already that small are kept)
+    
+    Args:
+        frame: BGR frame from the vision pipeline
+        
+    Returns:
+        Frame no larger than BROADCAST_SIZE
+    """
+    size = _fit_size(frame.shape, BROADCAST_SIZE)
+    if size is None:
+        return frame
+    # INTER_AREA is the SIMD-optimized box filter, best for downscaling
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def _encode_jpeg(frame, quality, size):
+    """
+    Encode a frame as a base64 JPEG string
+    
+    Runs on _encode_executor so encodes of different variants overlap with
+    each other and with Flask request handlers (cv2.imencode drops the GIL
+    while the native encoder runs).
+
+    Args:
+        frame: BGR frame to encode
+        quality: JPEG quality (0-100)
+        size: Target (width, height), or None to keep the frame's resolution
+
+    Returns:
+        Base64 JPEG string, or None if encoding failed
+    """
+    params = _jpeg_params.get(quality)
+    if params is None:
+        params = _jpeg_params[quality] = [
+            int(cv2.IMWRITE_JPEG_QUALITY), quality,
+            int(cv2.IMWRITE_JPEG_OPTIMIZE), 0,
+            int(cv2.IMWRITE_JPEG_PROGRESSIVE), 0,
+        ]
+    
+    if size is not None:
+        frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    encode_success, buffer = cv2.imencode('.jpg', frame, params)
+    return base64.b64encode(buffer).decode('utf-8') if encode_success else None
+
+
 def broadcast_frame_loop():
     """
     Continuously broadcast camera frames to all connected WebSocket clients
     
     This function runs in a background thread and periodically emits
-    base64-encoded JPEG frames to all connected clients. The frames are
+    base64-encoded JPEG frames to every connected client. The frames are
     encoded to reduce bandwidth and ensure compatibility with web browsers.
     
     Broadcasting Strategy:
     - Runs at ~15 FPS to reduce network load (half of processing rate)
-    - Encodes frames as JPEG with 85% quality for size/quality balance
-    - Uses socketio.emit() to broadcast to all connected clients
+    - Downscales each frame once to fit inside BROADCAST_SIZE before encoding
+    - Adapts quality per client: each client acknowledges frames with
+      'frame_ack'; when more than MAX_PENDING_FRAMES are unacknowledged the
+      client is moved down STREAM_LEVELS (lower quality, then fitted into
+      480x270, then every other frame) and moved back up once it catches up
+    - Each distinct variant is encoded at most once per tick, off this
+      thread on _encode_executor, and shared between clients at the same level
     - Handles cases where no frame is available gracefully
     
     Thread Safety:
-        Accesses vision_manager.get_latest_frame() which is thread-safe
+        Accesses vision_manager.get_latest_frame() which is thread-safe;
+        per-client state is protected by _client_streams_lock
     """
     print("[Broadcast] Frame streaming thread started")
+    _tune_broadcast_thread()
     
     while True:
         try:
             # Check if vision system is running
-            status = vision_manager.get_status()
+            status = cached_status()
             if not status['is_running']:
                 # Sleep longer when not running to reduce CPU usage
                 time.sleep(0.5)
@@ -167,26 +522,49 @@ def broadcast_frame_loop():
             frame = vision_manager.get_latest_frame()
             
             if frame is not None:
-                # Encode frame as JPEG for efficient transmission
-                # Quality=85 provides good balance between size and visual quality
-                encode_success, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                timestamp = time.time()
+                frame = _resize_for_broadcast(frame)
+                _broadcast_info['size'] = (frame.shape[1], frame.shape[0])
+                
+                # Decide which clients get a frame this tick and at which level
+                targets = []
+                with _client_streams_lock:
+                    for sid, state in _client_streams.items():
+                        _adjust_stream_level(state)
+                        level = STREAM_LEVELS[state['level']]
+                        state['tick'] += 1
+                        if state['tick'] % (level['skip'] + 1) == 0:
+                            size = None if level['scale'] is None else _fit_size(frame.shape, level['scale'])
+                            targets.append((sid, state, (level['q'], size)))
                 
-                if encode_success:
-                    # Convert to base64 string for JSON transmission
-                    frame_base64 = base64.b64encode(buffer).decode('utf-8')
+                # Encode each distinct variant once, in parallel
+                futures = {
+                    key: _encode_executor.submit(_encode_jpeg, frame, *key)
+                    for key in {key for _, _, key in targets}
+                }
+                variants = {key: future.result() for key, future in futures.items()}
+                
+                for sid, state, key in targets:
+                    frame_base64 = variants[key]
+                    if frame_base64 is None:
+                        continue
+                    
+                    with _client_streams_lock:
+                        seq = state['seq']
+                        state['seq'] = seq + 1
+                        state['inflight'].append(seq)
                     
-                    # Broadcast to all connected clients via WebSocket
-                    # namespace='/' is the default namespace
                     socketio.emit('camera_frame', {
                         'frame': frame_base64,
-                        'timestamp': time.time()
-                    }, namespace='/')
+                        'timestamp': timestamp,
+                        'seq': seq
+                    }, to=sid, namespace='/')
             
             # Maintain ~15 FPS broadcast rate (every 66ms)
             time.sleep(0.066)
             
         except Exception as e:
-            print(f"[Broadcast] Error in frame loop: {e}")
+            logger.warning("[Broadcast] Error in frame loop: %s", e, exc_info=DEBUG_ERRORS)
             time.sleep(0.1)
 
 
@@ -200,18 +578,21 @@ def broadcast_metrics_loop():
     
     Broadcasting Strategy:
     - Runs at ~2 Hz (every 0.5s) to provide smooth updates without overwhelming network
-    - Sends JSON data directly (no encoding needed)
+    - Sends MessagePack binary ('health_metrics_bin') to clients that can
+      decode it when msgpack is installed, plain JSON ('health_metrics')
+      to all others
     - Includes all metrics from vision modules
     
     Thread Safety:
         Accesses vision_manager.get_latest_metrics() which is thread-safe
     """
     print("[Broadcast] Metrics streaming thread started")
+    _tune_broadcast_thread()
     
     while True:
         try:
             # Check if vision system is running
-            status = vision_manager.get_status()
+            status = cached_status()
             if not status['is_running']:
                 # Sleep longer when not running
                 time.sleep(1.0)
@@ -222,30 +603,44 @@ def broadcast_metrics_loop():
             
             if metrics:
                 # Broadcast metrics to all connected clients
-                socketio.emit('health_metrics', metrics, namespace='/')
+                emit_packed('health_metrics', metrics, True, to=MSGPACK_ROOM, namespace='/')
+                emit_packed('health_metrics', metrics, False, to=JSON_ROOM, namespace='/')
             
             # Update every 0.5 seconds (2 Hz)
             time.sleep(0.5)
             
         except Exception as e:
-            print(f"[Broadcast] Error in metrics loop: {e}")
+            logger.warning("[Broadcast] Error in metrics loop: %s", e, exc_info=DEBUG_ERRORS)
             time.sleep(0.5)
 
 
 @socketio.on('connect')
-def handle_connect():
+def handle_connect(auth=None):
     """
     Handle new WebSocket client connection
     
     This event fires when a client successfully establishes a WebSocket
     connection to the server. We can use this to send initial state
     or perform connection logging.
+    
+    Args:
+        auth: Client connect auth; {'msgpack': true} if it decodes MessagePack
     """
     print(f"[WebSocket] Client connected: {request.sid}")
     
+    # Register client for adaptive frame streaming
+    with _client_streams_lock:
+        _client_streams[request.sid] = _new_client_stream()
+    
+    # Route metrics/status to the encoding this client can decode
+    binary = isinstance(auth, dict) and auth.get('msgpack') is True
+    if binary:
+        _msgpack_clients.add(request.sid)
+    join_room(MSGPACK_ROOM if binary else JSON_ROOM)
+    
     # Send current system status to newly connected client
-    status = vision_manager.get_status()
-    emit('system_status', status)
+    status = vision_status()
+    emit_packed('system_status', status, binary, emit_fn=emit)
 
 
 @socketio.on('disconnect')
@@ -257,6 +652,35 @@ def handle_disconnect():
     Useful for cleanup and logging.
     """
     print(f"[WebSocket] Client disconnected: {request.sid}")
+    
+    with _client_streams_lock:
+        _client_streams.pop(request.sid, None)
+    _msgpack_clients.discard(request.sid)
+
+
+@socketio.on('frame_ack')
+def handle_frame_ack(data=None):
+    """
+    Handle client acknowledgement of a received camera frame
+    
+    Clients emit 'frame_ack' with the frame's 'seq' after rendering each
+    'camera_frame'. Frames arrive in order, so the ack also settles every
+    older frame whose ack was lost. The number of unacknowledged frames is
+    used to estimate the client's available bandwidth for adaptive streaming.
+    """
+    seq = data.get('seq') if isinstance(data, dict) else None
+    with _client_streams_lock:
+        state = _client_streams.get(request.sid)
+        if state is None:
+            return
+        inflight = state['inflight']
+        if not isinstance(seq, int):
+            # Older clients ack without a seq number
+            if inflight:
+                inflight.popleft()
+            return
+        while inflight and inflight[0] <= seq:
+            inflight.popleft()
 
 
 @socketio.on('request_status')
@@ -267,8 +691,8 @@ def handle_status_request():
     Clients can emit 'request_status' to get the current state
     of the vision system on demand.
     """
-    status = vision_manager.get_status()
-    emit('system_status', status)
+    status = vision_status()
+    emit_packed('system_status', status, request.sid in _msgpack_clients, emit_fn=emit)
 
 
 # =============================================================================
@@ -307,7 +731,7 @@ def api_camera_start():
         print("[API] POST /api/camera/start - Starting camera")
         
         # Start the vision manager
-        result = vision_manager.start()
+        result = get_vision_manager().start()
         
         # Return appropriate HTTP status code based on result
         status_code = 200 if result['success'] else 400
@@ -320,7 +744,7 @@ def api_camera_start():
             "success": False,
             "message": f"Server error: {str(e)}",
             "error": "SERVER_ERROR",
-            "details": traceback.format_exc()
+            "details": error_details()
         }), 500
 
 
@@ -352,7 +776,7 @@ def api_camera_stop():
         print("[API] POST /api/camera/stop - Stopping camera")
         
         # Stop the vision manager
-        result = vision_manager.stop()
+        result = get_vision_manager().stop()
         
         # Return appropriate HTTP status code based on result
         status_code = 200 if result['success'] else 400
@@ -365,7 +789,7 @@ def api_camera_stop():
             "success": False,
             "message": f"Server error: {str(e)}",
             "error": "SERVER_ERROR",
-            "details": traceback.format_exc()
+            "details": error_details()
         }), 500
 
 
@@ -389,7 +813,7 @@ def api_camera_status():
         Response: {"is_running": true, "session_id": "abc123", "fps": 30.2, "last_error": null}
     """
     try:
-        status = vision_manager.get_status()
+        status = vision_status()
         return jsonify(status), 200
         
     except Exception as e:
@@ -413,9 +837,13 @@ def api_get_settings():
             "settings": {
                 "health_monitoring": {...},
                 "ui_settings": {...}
-            }
+            },
+            "stream": {"width": 480, "height": 360}
         }
     
+    "stream" is the size of the last broadcast frame (fitted inside
+    BROADCAST_SIZE with its aspect ratio kept), or null before the first one.
+    
     Error Codes:
         - FILE_NOT_FOUND: settings.json does not exist
         - PARSE_ERROR: JSON parsing failed
@@ -443,9 +871,14 @@ def api_get_settings():
         with open(config_path, 'r', encoding='utf-8') as f:
             settings = json.load(f)
         
+        stream_size = _broadcast_info['size']
         return jsonify({
             "success": True,
-            "settings": settings
+            "settings": settings,
+            "stream": {
+                "width": stream_size[0],
+                "height": stream_size[1]
+            } if stream_size is not None else None
         }), 200
         
     except json.JSONDecodeError as e:
@@ -479,7 +912,7 @@ def api_toggle_face_mesh():
         enabled = data.get('enabled', True)
         
         # Update vision app's face mesh setting
-        if vision_manager.vision_app:
+        if vision_manager is not None and vision_manager.vision_app:
             vision_manager.vision_app.show_face_mesh = enabled
             
         return jsonify({
@@ -583,7 +1016,7 @@ def api_update_settings():
         reload_error = None
         
         if reload_vision:
-            status = vision_manager.get_status()
+            status = vision_status()
             
             if status['is_running']:
                 print("[API] Reloading vision system with new settings...")
@@ -644,7 +1077,7 @@ def api_update_settings():
             "success": False,
             "message": f"Server error: {str(e)}",
             "error": "SERVER_ERROR",
-            "details": traceback.format_exc()
+            "details": error_details()
         }), 500
 
 
@@ -662,9 +1095,19 @@ def api_chatbot_message():
     Request Body:
         {
             "message": str (required),
-            "thread_id": str (optional, default: "default_user")
+            "thread_id": str (optional, default: "default_user"),
+            "async": bool (optional, default: false),
+            "sid": str (required when async is true)
         }
     
+    The request runs on a dedicated executor. By default the handler waits
+    up to CHATBOT_TIMEOUT_SECONDS for the answer. With "async": true it
+    returns 202 and a job_id immediately, and the answer is emitted on the
+    'chatbot_response' WebSocket event to the requesting client only: the
+    client sends its own Socket.IO session id (socket.id in the JS client)
+    as "sid", which must belong to a currently connected client, and matches
+    the event to its request by job_id.
+    
     Response:
         {
             "success": true/false,
@@ -677,6 +1120,8 @@ def api_chatbot_message():
     Error Codes:
         - CHATBOT_UNAVAILABLE: Chatbot module not installed or failed to initialize
         - INVALID_REQUEST: Missing required fields or invalid JSON
+        - CHATBOT_BUSY: Too many chatbot requests queued
+        - TIMEOUT: Chatbot did not answer in time
         - PROCESSING_ERROR: Error during chatbot processing
         - SERVER_ERROR: Unexpected server error
     
@@ -730,6 +1175,19 @@ def api_chatbot_message():
         if not isinstance(thread_id, str) or not thread_id.strip():
             thread_id = 'default_user'
         
+        # Async answers are delivered only to the requesting WebSocket client
+        is_async = bool(request_data.get('async'))
+        sid = request_data.get('sid')
+        if is_async:
+            with _client_streams_lock:
+                connected = isinstance(sid, str) and sid in _client_streams
+            if not connected:
+                return jsonify({
+                    "success": False,
+                    "message": "Async requests require the 'sid' of a connected WebSocket client",
+                    "error": "INVALID_REQUEST"
+                }), 400
+        
         print(f"[Chatbot] User message: {user_message[:50]}... (thread_id: {thread_id})")
         
         # Get or initialize chatbot app
@@ -744,13 +1202,40 @@ def api_chatbot_message():
                 "details": error_detail
             }), 503
         
-        # Call chatbot interface
+        # Queue the request on the chatbot executor
+        future = submit_chatbot_request(user_message, thread_id, chatbot_app)
+        
+        if future is None:
+            return jsonify({
+                "success": False,
+                "message": "Chatbot is busy, please try again shortly",
+                "error": "CHATBOT_BUSY"
+            }), 503
+        
+        # Asynchronous mode: reply immediately, deliver the answer over WebSocket
+        if is_async:
+            job_id = uuid.uuid4().hex
+            
+            def _deliver(done_future):
+                try:
+                    payload = {"success": True, "response": done_future.result()}
+                except Exception as e:
+                    payload = {"success": False, "error": "PROCESSING_ERROR", "details": str(e)}
+                payload.update({"job_id": job_id, "thread_id": thread_id, "timestamp": time.time()})
+                socketio.emit('chatbot_response', payload, to=sid, namespace='/')
+            
+            future.add_done_callback(_deliver)
+            
+            return jsonify({
+                "success": True,
+                "message": "Message accepted, response will be sent via 'chatbot_response'",
+                "job_id": job_id,
+                "thread_id": thread_id
+            }), 202
+        
+        # Synchronous mode: wait for the answer with a timeout
         try:
-            bot_response = chat_interface(
-                user_input=user_message,
-                thread_id=thread_id,
-                app=chatbot_app
-            )
+            bot_response = future.result(timeout=CHATBOT_TIMEOUT_SECONDS)
             
             print(f"[Chatbot] Response: {bot_response[:50]}...")
             
@@ -762,9 +1247,17 @@ def api_chatbot_message():
                 "thread_id": thread_id
             }), 200
             
+        except FuturesTimeoutError:
+            print(f"[Chatbot] Request timed out after {CHATBOT_TIMEOUT_SECONDS}s")
+            
+            return jsonify({
+                "success": False,
+                "message": f"Chatbot did not respond within {CHATBOT_TIMEOUT_SECONDS} seconds",
+                "error": "TIMEOUT"
+            }), 504
+            
         except Exception as e:
-            print(f"[Chatbot] Processing error: {e}")
-            print(traceback.format_exc())
+            logger.exception("[Chatbot] Processing error: %s", e)
             
             return jsonify({
                 "success": False,
@@ -774,14 +1267,13 @@ def api_chatbot_message():
             }), 500
         
     except Exception as e:
-        print(f"[API] Unexpected error in chatbot endpoint: {e}")
-        print(traceback.format_exc())
+        logger.exception("[API] Unexpected error in chatbot endpoint: %s", e)
         
         return jsonify({
             "success": False,
             "message": f"Server error: {str(e)}",
             "error": "SERVER_ERROR",
-            "details": traceback.format_exc()
+            "details": error_details()
         }), 500
 
 
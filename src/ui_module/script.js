@@ -322,8 +322,12 @@ saveBtn.addEventListener('click', async () => {
 // Backend server URL
 const BACKEND_URL = 'http://localhost:5000';
 
-// Initialize Socket.IO connection
-const socket = io(BACKEND_URL);
+// Initialize Socket.IO connection. MessagePack events are only requested when
+// the decoder script loaded (CDN may be blocked/offline); otherwise the backend
+// falls back to JSON events.
+const socket = io(BACKEND_URL, {
+    auth: { msgpack: typeof msgpack !== 'undefined' }
+});
 
 // Connection status
 socket.on('connect', () => {
@@ -353,11 +357,20 @@ socket.on('health_metrics', (data) => {
     updateHealthMetricsFromBackend(data);
 });
 
+/**
+ * MessagePack-encoded health metrics (sent when the backend has msgpack)
+ */
+socket.on('health_metrics_bin', (buffer) => {
+    updateHealthMetricsFromBackend(msgpack.decode(new Uint8Array(buffer)));
+});
+
 /**
  * Handle camera frame data from backend
  */
 socket.on('camera_frame', (data) => {
     updateCameraFrame(data.frame);
+    // Acknowledge so the backend can adapt quality to our bandwidth
+    socket.emit('frame_ack', { seq: data.seq, timestamp: data.timestamp });
 });
 
 /**
@@ -368,6 +381,12 @@ socket.on('system_status', (status) => {
     updateSystemStatus(status);
 });
 
+socket.on('system_status_bin', (buffer) => {
+    const status = msgpack.decode(new Uint8Array(buffer));
+    console.log('System status:', status);
+    updateSystemStatus(status);
+});
+
 /**
  * Update health metrics display with real backend data
  */
@@ -5,10 +5,10 @@ Package này cung cấp các tiện ích chung cho toàn bộ hệ thống AEyeP
 bao gồm quản lý cấu hình, xử lý dữ liệu, và quản lý thread pool.
 
 Main Components:
-- Configuration Management: get_config(), AppConfig
-- Data Storage: save_data(), append_csv_row(), read_csv()
+- Configuration Management: get_config(), get_config_value(), AppConfig
+- Data Storage: save_data(), append_csv_row(), flush_csv(), read_csv()
 - Path Management: DATA_DIR, CONFIG_DIR
-- Thread Management: ExecutorService
+- Thread Management: ExecutorService, get_default_executor()
 - Camera Calibration: get_camera_calibration()
 
 Usage:
@@ -20,30 +20,54 @@ Author: AEyePro Team
 Version: 3.0.0
 """
 
-# Import tất cả các hàm và classes quan trọng từ utils.py
-from .utils import (
-    get_config,           # Load JSON configuration files
-    save_data,           # Save data to JSON with NumPy conversion
-    append_csv,          # Append to CSV (deprecated, use append_csv_row)
-    append_csv_row,      # Append dictionary row to CSV with thread safety
-    read_csv,            # Read CSV file as pandas DataFrame
-    get_camera_calibration, # Get camera calibration parameters
-    ExecutorService,      # Thread pool for background processing
-    AppConfig,            # Application configuration class
-    app_config,           # Global application configuration instance
-    DATA_DIR,            # Path to data directory
-    CONFIG_DIR            # Path to configuration directory
+# Các symbols được re-export từ utils.py. Việc import được trì hoãn (PEP 562)
+# cho đến lần truy cập đầu tiên để giảm cold-start và RSS khi khởi động.
+_LAZY_EXPORTS = (
+    'get_config',           # Load JSON configuration files
+    'get_config_value',     # Read a single cached configuration value
+    'save_data',            # Save data to JSON with NumPy conversion
+    'append_csv',           # Append to CSV (deprecated, use append_csv_row)
+    'append_csv_row',       # Append dictionary row to CSV with thread safety
+    'flush_csv',            # Write buffered CSV rows to disk immediately
+    'close_csv',            # Flush and close buffered CSV file handles
+    'CsvRowLogger',         # Buffered CSV row writer
+    'read_csv',             # Read CSV file as pandas DataFrame
+    'get_camera_calibration',  # Get camera calibration parameters
+    'ExecutorService',      # Thread pool for background processing
+    'get_default_executor', # Shared thread pool, created on first use
+    'AppConfig',            # Application configuration class
+    'app_config',           # Global application configuration instance
+    'DATA_DIR',             # Path to data directory
+    'CONFIG_DIR',           # Path to configuration directory
 )
 
+
+def __getattr__(name):
+    """Import symbol từ utils.py ở lần truy cập đầu tiên rồi cache lại"""
+    if name in _LAZY_EXPORTS:
+        from . import utils as _impl
+        value = getattr(_impl, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
 # Danh sách các symbols được export khi import *
 __all__ = [
     # Configuration Functions
     'get_config',
+    'get_config_value',
 
     # Data Storage Functions
     'save_data',
     'append_csv',
     'append_csv_row',
+    'flush_csv',
+    'close_csv',
     'read_csv',
 
     # Hardware Functions
@@ -52,9 +76,11 @@ __all__ = [
     # Classes
     'ExecutorService',
     'AppConfig',
+    'CsvRowLogger',
 
     # Global Instances
     'app_config',
+    'get_default_executor',
 
     # Constants
     'DATA_DIR',
@@ -4,7 +4,7 @@ AEyePro Utils Package - Các tiện ích chung cho hệ thống
 Package này cung cấp các hàm tiện ích cho:
 - Quản lý cấu hình ứng dụng (JSON files)
 - Xử lý dữ liệu với NumPy/Pandas compatibility
-- Thao tác với files CSV (thread-safe)
+- Thao tác với files CSV (thread-safe, ghi theo lô)
 - Quản lý thread pool cho xử lý đa luồng
 - Quản lý paths và directories một cách linh hoạt
 
@@ -12,21 +12,40 @@ Author: AEyePro Team
 Version: 3.0.0
 """
 
+import atexit
+import concurrent.futures
+import copy
+import csv
+import functools
 import json
+import multiprocessing as mp
 import os
+import threading
+import time
 import numpy as np
-import pandas as pd
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Any, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Union
+
+# orjson nhanh hơn ~10x so với json chuẩn và serialize được NumPy trực tiếp;
+# fallback về json chuẩn nếu chưa cài đặt
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pandas chỉ được import khi thực sự cần (nặng ~200ms và ~80MB RSS)
+if TYPE_CHECKING:
+    import pandas as pd
 
 # ==============================================================================
 # PATH MANAGEMENT - Quản lý đường dẫn file và thư mục
 # ==============================================================================
 
 # Xác định đường dẫn một cách linh hoạt và đáng tin cậy
-# Lấy đường dẫn thư mục utils (AEYE/utils)
-UTILS_DIR = Path(__file__).resolve().parent
+# Lấy đường dẫn thư mục utils (AEYE/utils); abspath không cần realpath syscall
+_UTILS_DIR_STR = os.path.dirname(os.path.abspath(__file__))
+UTILS_DIR = Path(_UTILS_DIR_STR)
 
 # Lấy đường dẫn gốc của dự án AEYE
 PROJECT_ROOT = UTILS_DIR.parent
@@ -35,16 +54,27 @@ PROJECT_ROOT = UTILS_DIR.parent
 DATA_DIR = PROJECT_ROOT / "data"      # Thư mục lưu trữ dữ liệu
 CONFIG_DIR = PROJECT_ROOT / "config"  # Thư mục cấu hình
 
+# Bản str để ghép đường dẫn bằng os.path.join trên hot path (không tạo Path mới)
+DATA_DIR_STR = str(DATA_DIR)
+CONFIG_DIR_STR = str(CONFIG_DIR)
+
 # ==============================================================================
 # CONFIGURATION MANAGEMENT - Quản lý cấu hình ứng dụng
 # ==============================================================================
 
+# Cache cấu hình đã parse: config_file -> (st_mtime_ns, dict)
+_CONFIG_CACHE: Dict[str, tuple] = {}
+
+
 def get_config(config_file: str = 'settings.json') -> Dict[str, Any]:
     """
     Tải cấu hình từ file JSON với đường dẫn tương đối
 
     Hàm này tự động tìm file cấu hình trong thư mục CONFIG_DIR và
-    parse JSON thành Python dictionary với error handling.
+    parse JSON thành Python dictionary với error handling. Kết quả được cache
+    theo mtime của file nên chỉ đọc và parse lại khi file thay đổi; mỗi lần gọi
+    trả về một bản copy để caller có thể sửa đổi tự do.
+    Dùng get_config.cache_clear() để xóa cache.
 
     Args:
         config_file (str): Tên file cấu hình (mặc định: 'settings.json')
@@ -60,12 +90,90 @@ def get_config(config_file: str = 'settings.json') -> Dict[str, Any]:
         >>> config = get_config('settings.json')
         >>> camera_index = config.get('health_monitoring', {}).get('camera_index', 0)
     """
-    config_path = CONFIG_DIR / config_file
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return copy.deepcopy(_load_config_cached(config_file))
+
+
+def _load_config_cached(config_file: str) -> Dict[str, Any]:
+    """Trả về dict cấu hình trong cache (không copy), parse lại nếu file thay đổi"""
+    config_path = os.path.join(CONFIG_DIR_STR, config_file)
+    mtime_ns = os.stat(config_path).st_mtime_ns
+
+    cached = _CONFIG_CACHE.get(config_file)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    if orjson is not None:
+        with open(config_path, 'rb') as f:
+            config = orjson.loads(f.read())
+    else:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+    _CONFIG_CACHE[config_file] = (mtime_ns, config)
+    return config
+
+
+def get_config_value(*keys: str, config_file: str = 'settings.json', default: Any = None) -> Any:
+    """
+    Đọc một giá trị cấu hình theo đường dẫn key mà không copy toàn bộ config
+
+    Dùng chung cache với get_config(); giá trị trả về không được sửa đổi
+    nếu là dict/list.
+
+    Args:
+        *keys (str): Đường dẫn key, ví dụ 'health_monitoring', 'DROWSY_THRESHOLD'
+        config_file (str): Tên file cấu hình (mặc định: 'settings.json')
+        default (Any): Giá trị trả về nếu không tìm thấy key
+
+    Returns:
+        Any: Giá trị cấu hình hoặc default
+
+    Example:
+        >>> th = get_config_value('health_monitoring', 'DROWSY_THRESHOLD')
+    """
+    value: Any = _load_config_cached(config_file)
+    for key in keys:
+        if not isinstance(value, dict) or key not in value:
+            return default
+        value = value[key]
+    return value
+
+
+get_config.cache_clear = _CONFIG_CACHE.clear
+
+
+def _numpy_default(obj: Any) -> Any:
+    """
+    Hook default= cho JSON encoder: chuyển NumPy types sang Python native types
+
+    Encoder chỉ gọi hook này với các object không serialize được trực tiếp,
+    nên payload thuần Python không tốn thêm chi phí duyệt/copy.
 
+    Args:
+        obj (Any): Object encoder không xử lý được
 
-def save_data(data: Any, file_path: Union[str, Path]) -> None:
+    Returns:
+        Any: Giá trị tương thích JSON
+
+    Raises:
+        TypeError: Khi object không thể chuyển đổi
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# Kích thước buffer ghi file JSON
+_SAVE_BUFFER_SIZE = 1 << 16
+
+
+def save_data(data: Any, file_path: Union[str, Path], sync: bool = False) -> None:
     """
     Lưu dữ liệu vào file JSON với hỗ trợ chuyển đổi NumPy types
 
@@ -75,6 +183,8 @@ def save_data(data: Any, file_path: Union[str, Path]) -> None:
     Args:
         data (Any): Dữ liệu cần lưu (có thể chứa NumPy arrays, types)
         file_path (Union[str, Path]): Đường dẫn đến file JSON cần lưu
+        sync (bool): Gọi os.fsync sau khi ghi để đảm bảo dữ liệu đã xuống đĩa
+                     (mặc định: False)
 
     Returns:
         None
@@ -88,58 +198,151 @@ def save_data(data: Any, file_path: Union[str, Path]) -> None:
         ... }
         >>> save_data(data, 'output.json')
     """
-    def convert_numpy(obj: Any) -> Any:
-        """
-        Chuyển đổi đệ quy các kiểu NumPy sang Python native types
-
-        Args:
-            obj (Any): Object cần chuyển đổi
-
-        Returns:
-            Any: Object đã được chuyển đổi sang compatible types
-        """
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, dict):
-            return {k: convert_numpy(v) for k, v in obj.items()}
-        elif isinstance(obj, (list, tuple)):
-            return [convert_numpy(item) for item in obj]
-        return obj
-
     # Tạo directory nếu chưa tồn tại
     os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
 
-    # Lưu file với format JSON đẹp
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(convert_numpy(data), f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        # orjson tự serialize NumPy; _numpy_default chỉ xử lý các trường hợp còn lại
+        payload = orjson.dumps(
+            data,
+            default=_numpy_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+        with open(file_path, 'wb', buffering=_SAVE_BUFFER_SIZE) as f:
+            f.write(payload)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        return
+
+    # Lưu file với format JSON đẹp; json.dump ghi nhiều chunk nhỏ nên cần buffer lớn
+    with open(file_path, 'w', encoding='utf-8', buffering=_SAVE_BUFFER_SIZE) as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=_numpy_default)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
 
 
 # ==============================================================================
 # CSV DATA HANDLING - Xử lý dữ liệu CSV với thread safety
 # ==============================================================================
 
-def append_csv(row_dict: Dict[str, Any], file_path: Union[str, Path],
-              fieldnames: Optional[List[str]] = None) -> None:
+class CsvRowLogger:
     """
-    Thêm một row vào file CSV (deprecated - sử dụng append_csv_row để có documentation tốt hơn)
+    Ghi CSV theo từng row với buffer trong bộ nhớ và file handle mở sẵn
 
-    Args:
-        row_dict (Dict[str, Any]): Dictionary chứa data của row
-        file_path (Union[str, Path]): Đường dẫn đến file CSV
-        fieldnames (Optional[List[str]]): Danh sách các column names (optional)
+    Thay vì mở file, tạo DataFrame và ghi mỗi lần gọi, class này giữ mỗi file
+    mở (buffer 64KB) với một csv.DictWriter và gom rows lại, chỉ ghi xuống
+    khi đủ flush_rows rows hoặc đã quá flush_interval giây.
 
-    Note:
-        Function này được giữ để tương thích, nhưng nên sử dụng append_csv_row()
+    Attributes:
+        flush_rows (int): Số rows tối đa trong buffer trước khi ghi
+        flush_interval (float): Thời gian tối đa (giây) giữ rows trong buffer
+
+    Example:
+        >>> csv_logger = CsvRowLogger()
+        >>> csv_logger.append('health_data.csv', {'avg_ear': 0.25}, ['avg_ear'])
+        >>> csv_logger.close()  # Ghi nốt buffer và đóng files
     """
-    file_exists = os.path.isfile(file_path)
-    df = pd.DataFrame([row_dict])
-    if not file_exists and fieldnames:
-        df = df.reindex(columns=fieldnames)
-    df.to_csv(file_path, mode='a', header=not file_exists, index=False, encoding='utf-8')
+
+    def __init__(self, flush_rows: int = 64, flush_interval: float = 1.0):
+        """
+        Khởi tạo logger
+
+        Args:
+            flush_rows (int): Số rows gom lại trước khi ghi xuống file
+            flush_interval (float): Số giây tối đa giữa hai lần ghi
+        """
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        # path -> [file_handle, DictWriter, buffered rows, last flush time]
+        self._files: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def append(self, file_path: Union[str, Path], row_dict: Dict[str, Any],
+               fieldnames: Optional[List[str]] = None) -> None:
+        """
+        Thêm một row vào buffer của file, ghi xuống khi đủ điều kiện
+
+        Args:
+            file_path (Union[str, Path]): Đường dẫn đến file CSV
+            row_dict (Dict[str, Any]): Dictionary chứa data của row
+            fieldnames (Optional[List[str]]): Thứ tự columns khi tạo file mới
+        """
+        path = str(file_path)
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is None:
+                entry = self._open(path, row_dict, fieldnames)
+            entry[2].append(row_dict)
+            if (len(entry[2]) >= self.flush_rows or
+                    time.monotonic() - entry[3] >= self.flush_interval):
+                self._flush_entry(entry)
+
+    def flush(self, file_path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Ghi ngay các rows đang buffer xuống file
+
+        Args:
+            file_path (Optional[Union[str, Path]]): File cần flush
+                                                   (None = tất cả files)
+        """
+        with self._lock:
+            if file_path is None:
+                entries = list(self._files.values())
+            else:
+                entries = [self._files[str(file_path)]] if str(file_path) in self._files else []
+            for entry in entries:
+                self._flush_entry(entry)
+
+    def close(self, file_path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Flush và đóng file handle(s)
+
+        Args:
+            file_path (Optional[Union[str, Path]]): File cần đóng
+                                                   (None = tất cả files)
+        """
+        with self._lock:
+            paths = list(self._files) if file_path is None else [str(file_path)]
+            for path in paths:
+                entry = self._files.pop(path, None)
+                if entry is not None:
+                    self._flush_entry(entry)
+                    entry[0].close()
+
+    def _open(self, path: str, row_dict: Dict[str, Any],
+              fieldnames: Optional[List[str]]) -> list:
+        """Mở file ở chế độ append, dùng header có sẵn hoặc ghi header mới"""
+        existing_header = None
+        if os.path.isfile(path) and os.path.getsize(path) > 0:
+            with open(path, 'r', newline='', encoding='utf-8') as f:
+                existing_header = next(csv.reader(f), None)
+
+        columns = existing_header or fieldnames or list(row_dict.keys())
+        f = open(path, 'a', newline='', encoding='utf-8', buffering=65536)
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        if existing_header is None:
+            writer.writeheader()
+
+        entry = [f, writer, [], time.monotonic()]
+        self._files[path] = entry
+        return entry
+
+    @staticmethod
+    def _flush_entry(entry: list) -> None:
+        """Ghi các rows trong buffer của một file và flush OS buffer"""
+        f, writer, rows, _ = entry
+        if rows:
+            writer.writerows(rows)
+            rows.clear()
+        f.flush()
+        entry[3] = time.monotonic()
+
+
+# Logger dùng chung cho append_csv_row(); buffer được ghi nốt khi thoát
+_csv_row_logger = CsvRowLogger()
+atexit.register(_csv_row_logger.close)
 
 
 def append_csv_row(row_dict: Dict[str, Any], file_path: Union[str, Path],
@@ -148,7 +351,9 @@ def append_csv_row(row_dict: Dict[str, Any], file_path: Union[str, Path],
     Thêm một row (dictionary) vào file CSV với thread safety và flexibility cao
 
     Function này được thiết kế để hoạt động hiệu quả trong multi-threading environment,
-    tự động tạo file mới với header nếu file chưa tồn tại.
+    tự động tạo file mới với header nếu file chưa tồn tại. Rows được buffer bởi
+    CsvRowLogger dùng chung và ghi theo lô (64 rows hoặc mỗi giây); dùng
+    flush_csv() khi cần dữ liệu xuất hiện trên đĩa ngay.
 
     Args:
         row_dict (Dict[str, Any]): Dictionary chứa data cần lưu.
@@ -156,7 +361,7 @@ def append_csv_row(row_dict: Dict[str, Any], file_path: Union[str, Path],
         file_path (Union[str, Path]): Đường dẫn đến file CSV cần ghi
         fieldnames (Optional[List[str]]): List để specify thứ tự columns.
                                        Nếu không cung cấp, columns sẽ theo
-                                       thứ tự alphabet của keys.
+                                       header có sẵn hoặc thứ tự keys của row.
 
     Returns:
         None
@@ -175,28 +380,49 @@ def append_csv_row(row_dict: Dict[str, Any], file_path: Union[str, Path],
         >>> append_csv_row(data, 'health_data.csv',
         ...                ['timestamp', 'avg_ear', 'distance_cm', 'status'])
     """
-    file_path = str(file_path)  # Đảm bảo file_path là string
+    _csv_row_logger.append(file_path, row_dict, fieldnames)
+
+
+# Tên cũ, giữ để tương thích (deprecated - sử dụng append_csv_row)
+append_csv = append_csv_row
+
 
-    # Kiểm tra xem file đã tồn tại chưa
-    file_exists = os.path.isfile(file_path)
+def flush_csv(file_path: Optional[Union[str, Path]] = None) -> None:
+    """
+    Ghi ngay các rows đang được buffer bởi append_csv_row() xuống đĩa
+
+    Args:
+        file_path (Optional[Union[str, Path]]): File cần flush (None = tất cả)
+
+    Example:
+        >>> append_csv_row(summary_row, 'summary.csv')
+        >>> flush_csv('summary.csv')
+    """
+    _csv_row_logger.flush(file_path)
 
-    # Tạo DataFrame từ row data
-    df = pd.DataFrame([row_dict])
 
-    # Enforce column order nếu fieldnames được cung cấp
-    if not file_exists and fieldnames:
-        df = df.reindex(columns=fieldnames)
+def close_csv(file_path: Optional[Union[str, Path]] = None) -> None:
+    """
+    Flush và đóng file handle được giữ bởi append_csv_row()
 
-    # Append to CSV với header nếu file mới, không header nếu file đã tồn tại
-    df.to_csv(file_path, mode='a', header=not file_exists, index=False, encoding='utf-8')
+    Args:
+        file_path (Optional[Union[str, Path]]): File cần đóng (None = tất cả)
+    """
+    _csv_row_logger.close(file_path)
 
 
-def read_csv(file_path: Union[str, Path]) -> pd.DataFrame:
+def read_csv(file_path: Union[str, Path], arrow_dtypes: bool = False) -> "pd.DataFrame":
     """
     Đọc file CSV thành DataFrame với error handling
 
+    Dùng CSV reader đa luồng của PyArrow nếu đã cài đặt (nhanh hơn nhiều với
+    file health data chủ yếu là số), fallback về pd.read_csv nếu không có
+    hoặc PyArrow không parse được file.
+
     Args:
         file_path (Union[str, Path]): Đường dẫn đến file CSV
+        arrow_dtypes (bool): Giữ cột dạng Arrow (pd.ArrowDtype) thay vì
+                             chuyển sang NumPy dtypes (mặc định: False)
 
     Returns:
         pd.DataFrame: DataFrame chứa dữ liệu từ file CSV
@@ -210,6 +436,25 @@ def read_csv(file_path: Union[str, Path]) -> pd.DataFrame:
         >>> df = read_csv('health_data.csv')
         >>> print(df.head())
     """
+    import pandas as pd
+
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        pa = None
+
+    if pa is not None:
+        try:
+            table = pa_csv.read_csv(str(file_path))
+        except pa.ArrowInvalid:
+            # File rỗng/sai định dạng: để pandas xử lý và raise lỗi tương ứng
+            pass
+        else:
+            if arrow_dtypes:
+                return table.to_pandas(types_mapper=pd.ArrowDtype)
+            return table.to_pandas()
+
     return pd.read_csv(file_path, encoding='utf-8')
 
 
@@ -273,8 +518,15 @@ class ExecutorService:
     Class này cung cấp abstraction layer trên ThreadPoolExecutor
     với các tùy chọn được tối ưu cho computer vision tasks.
 
+    Chọn loại pool qua tham số kind:
+    - "thread": I/O bound hoặc code gọi OpenCV/NumPy ngắn (mặc định)
+    - "process": tính toán nặng bằng NumPy/OpenCV cần song song thật sự
+      (function và arguments phải pickle được)
+    - "interpreter": sub-interpreter không chia sẻ GIL (Python 3.14+)
+
     Attributes:
-        executor (ThreadPoolExecutor): Internal thread pool
+        executor (Executor): Internal pool
+        kind (str): Loại pool đang dùng
 
     Example:
         >>> service = ExecutorService(max_workers=2)
@@ -284,19 +536,44 @@ class ExecutorService:
         >>> service.shutdown()  # Cleanup
     """
 
-    def __init__(self, max_workers: int = 4):
+    __slots__ = ("executor", "kind")
+
+    def __init__(self, max_workers: int = 4, kind: str = "thread", initializer=None):
         """
-        Khởi tạo thread pool với số worker threads
+        Khởi tạo pool với số workers
 
         Args:
-            max_workers (int): Số lượng concurrent threads (mặc định: 4)
+            max_workers (int): Số lượng concurrent workers (mặc định: 4)
                                Nên được thiết lập dựa trên CPU cores
                                và nature của tasks (I/O bound vs CPU bound)
+            kind (str): "thread", "process" hoặc "interpreter" (mặc định: "thread")
+            initializer (callable): Gọi một lần khi mỗi worker khởi động (optional)
+
+        Raises:
+            ValueError: Nếu kind không hợp lệ hoặc không được hỗ trợ
         """
-        self.executor = ThreadPoolExecutor(
-            max_workers=max_workers,
-            thread_name_prefix="AEyePro"
-        )
+        if kind == "thread":
+            self.executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="AEyePro",
+                initializer=initializer
+            )
+        elif kind == "process":
+            # forkserver tránh fork process đang giữ camera/thread; Windows chỉ có spawn
+            method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+            self.executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=mp.get_context(method),
+                initializer=initializer
+            )
+        elif kind == "interpreter":
+            interpreter_pool = getattr(concurrent.futures, "InterpreterPoolExecutor", None)
+            if interpreter_pool is None:
+                raise ValueError("kind='interpreter' requires Python 3.14+")
+            self.executor = interpreter_pool(max_workers=max_workers, initializer=initializer)
+        else:
+            raise ValueError(f"Unknown executor kind: {kind!r}")
+        self.kind = kind
 
     def submit(self, fn, *args, **kwargs):
         """
@@ -335,6 +612,11 @@ class ExecutorService:
 # APPLICATION CONFIGURATION - Quản lý cấu hình ứng dụng
 # ==============================================================================
 
+# Giá trị mặc định cho AppConfig
+_DEFAULT_CAMERA_INDEX = 0
+_DEFAULT_DATA_RETENTION_DAYS = 7
+
+
 class AppConfig:
     """
     Lớp quản lý cấu hình ứng dụng với support cho environment variables
@@ -353,14 +635,17 @@ class AppConfig:
         >>> print(f"Using camera {config.camera_index}")
     """
 
+    __slots__ = ("camera_index", "data_retention_days", "model_path", "force_cpu")
+
     def __init__(self):
         """Khởi tạo với default values"""
-        self.camera_index = 0
-        self.data_retention_days = 7
+        self.camera_index = _DEFAULT_CAMERA_INDEX
+        self.data_retention_days = _DEFAULT_DATA_RETENTION_DAYS
         self.model_path = "models/Submodel/Llama-3.2-3B-Instruct-Q8_0.gguf"
         self.force_cpu = False
 
     @classmethod
+    @functools.cache
     def from_env(cls):
         """
         Load configuration từ environment variables với fallback values
@@ -371,7 +656,9 @@ class AppConfig:
             AEYE_FORCE_CPU: Force CPU mode (default: false)
 
         Returns:
-            AppConfig: Instance với configuration từ environment
+            AppConfig: Instance với configuration từ environment. Kết quả được
+                       cache nên các lần gọi sau trả về cùng một instance;
+                       gọi AppConfig.from_env.cache_clear() để đọc lại.
 
         Example:
             # Trong shell:
@@ -382,11 +669,16 @@ class AppConfig:
             >>> config = AppConfig.from_env()
         """
         config = cls()
+        env = os.environ
 
         # Override với environment variables nếu tồn tại
-        config.camera_index = int(os.getenv('AEYE_CAMERA_INDEX', '0'))
-        config.data_retention_days = int(os.getenv('AEYE_DATA_RETENTION_DAYS', '7'))
-        config.force_cpu = os.getenv('AEYE_FORCE_CPU', 'false').lower() == 'true'
+        camera_index = env.get('AEYE_CAMERA_INDEX')
+        if camera_index is not None:
+            config.camera_index = int(camera_index)
+        retention_days = env.get('AEYE_DATA_RETENTION_DAYS')
+        if retention_days is not None:
+            config.data_retention_days = int(retention_days)
+        config.force_cpu = env.get('AEYE_FORCE_CPU', 'false').lower() == 'true'
 
         return config
 
@@ -398,5 +690,39 @@ class AppConfig:
 # Global configuration instance cho toàn ứng dụng
 app_config = AppConfig()
 
-# Global thread pool service cho các background tasks
-default_executor = ExecutorService()
\ No newline at end of file
+# Global thread pool service cho các background tasks, chỉ tạo khi cần
+_default_executor: Optional[ExecutorService] = None
+_default_executor_lock = threading.Lock()
+
+
+def get_default_executor() -> ExecutorService:
+    """
+    Lấy thread pool dùng chung, khởi tạo ở lần gọi đầu tiên
+
+    Returns:
+        ExecutorService: Instance dùng chung cho toàn ứng dụng
+
+    Example:
+        >>> future = get_default_executor().submit(process_data, data)
+    """
+    global _default_executor
+    if _default_executor is None:
+        with _default_executor_lock:
+            if _default_executor is None:
+                _default_executor = ExecutorService()
+    return _default_executor
+
+
+def _shutdown_default_executor() -> None:
+    if _default_executor is not None:
+        _default_executor.shutdown(wait=False)
+
+
+atexit.register(_shutdown_default_executor)
+
+
+def __getattr__(name):
+    # Giữ tương thích với code cũ dùng utils.utils.default_executor
+    if name == 'default_executor':
+        return get_default_executor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,240 @@
+"""
+Module Eye Kernels - Các kernel số học nhỏ cho EyeTracker
+
+Module này cung cấp:
+- ear6: Eye Aspect Ratio từ 6 landmarks của một mắt
+- roi_std_u8: Độ lệch chuẩn của ROI trên ảnh grayscale uint8
+- ear_thresholds: Tính ngưỡng BLINK/DROWSY từ EAR samples khi calibration
+- landmarks_px: Decode NormalizedLandmarkList đã serialize sang tọa độ pixel (N, 2)
+
+Khi có Numba, các kernel được biên dịch sang native code (njit) để tránh
+overhead dispatch của Python/NumPy trên các array rất nhỏ; nếu không có
+sẽ fallback về cài đặt NumPy/OpenCV tương đương.
+"""
+
+from __future__ import annotations
+
+import math
+
+import cv2
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(cache=True, fastmath=True)
+    def ear6(pts, eps):
+        """
+        Tính EAR = (|p2-p6| + |p3-p5|) / (2 * |p1-p4|)
+
+        Args:
+            pts: Array (6, 2) landmarks của một mắt
+            eps: Epsilon tránh chia cho 0
+
+        Returns:
+            float: EAR value
+        """
+        vert1 = math.hypot(pts[1, 0] - pts[5, 0], pts[1, 1] - pts[5, 1])
+        vert2 = math.hypot(pts[2, 0] - pts[4, 0], pts[2, 1] - pts[4, 1])
+        horiz = math.hypot(pts[0, 0] - pts[3, 0], pts[0, 1] - pts[3, 1])
+        return (vert1 + vert2) / (2.0 * horiz + eps)
+
+    @numba.njit(cache=True, fastmath=True)
+    def roi_std_u8(gray, x0, x1, y0, y1):
+        """
+        Tính độ lệch chuẩn của ROI trong một lượt, không tạo array trung gian
+
+        Args:
+            gray: Ảnh grayscale uint8 (H, W)
+            x0, x1, y0, y1: Biên ROI đã clamp trong ảnh
+
+        Returns:
+            float: Standard deviation (0-255), 0.0 nếu ROI rỗng
+        """
+        n = (x1 - x0) * (y1 - y0)
+        if n <= 0:
+            return 0.0
+        acc = 0.0
+        acc_sq = 0.0
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                v = float(gray[y, x])
+                acc += v
+                acc_sq += v * v
+        mean = acc / n
+        var = acc_sq / n - mean * mean
+        return math.sqrt(var) if var > 0.0 else 0.0
+
+else:
+
+    def ear6(pts, eps):
+        """
+        Tính EAR = (|p2-p6| + |p3-p5|) / (2 * |p1-p4|)
+
+        Args:
+            pts: Array (6, 2) landmarks của một mắt
+            eps: Epsilon tránh chia cho 0
+
+        Returns:
+            float: EAR value
+        """
+        vert1 = math.hypot(pts[1, 0] - pts[5, 0], pts[1, 1] - pts[5, 1])
+        vert2 = math.hypot(pts[2, 0] - pts[4, 0], pts[2, 1] - pts[4, 1])
+        horiz = math.hypot(pts[0, 0] - pts[3, 0], pts[0, 1] - pts[3, 1])
+        return float((vert1 + vert2) / (2.0 * horiz + eps))
+
+    def roi_std_u8(gray, x0, x1, y0, y1):
+        """
+        Tính độ lệch chuẩn của ROI bằng cv2.meanStdDev (SIMD, một lượt)
+
+        Args:
+            gray: Ảnh grayscale uint8 (H, W)
+            x0, x1, y0, y1: Biên ROI đã clamp trong ảnh
+
+        Returns:
+            float: Standard deviation (0-255), 0.0 nếu ROI rỗng
+        """
+        roi = gray[y0:y1, x0:x1]
+        if roi.size == 0:
+            return 0.0
+        _, stddev = cv2.meanStdDev(roi)
+        return float(stddev[0, 0])
+
+
+def ear_thresholds(samples):
+    """
+    Tính ngưỡng EAR cá nhân hóa từ samples calibration
+
+    - Loại outliers (nháy mắt) bằng IQR, fallback 2σ nếu còn quá ít samples
+    - BLINK = mean - 1.5σ trong [0.15, 0.35], DROWSY = mean - 0.8σ trong [0.20, 0.40]
+    - Đảm bảo DROWSY >= BLINK
+
+    Args:
+        samples: Array 1D EAR samples (float32)
+
+    Returns:
+        Tuple: (blink_threshold, drowsy_threshold, baseline_mean, baseline_std, n_used)
+    """
+    # Quartiles bằng selection O(n) thay vì sort toàn bộ hai lần như np.percentile
+    n = samples.size
+    k1 = n // 4
+    k3 = (3 * n) // 4
+    qs = np.partition(samples, np.array([k1, k3]))
+    q1 = qs[k1]
+    q3 = qs[k3]
+    iqr = q3 - q1
+    lower_bound = q1 - 1.5 * iqr
+    upper_bound = q3 + 1.5 * iqr
+
+    # Giữ lại chỉ các EAR "bình thường" (không nháy mắt)
+    normal = samples[(samples >= lower_bound) & (samples <= upper_bound)]
+    if normal.size < 30:
+        # Fallback: dùng standard deviation rejection
+        mean_all = samples.mean()
+        std_all = samples.std()
+        dev = np.empty_like(samples)
+        np.subtract(samples, mean_all, dev)
+        np.abs(dev, dev)
+        normal = samples[dev <= 2 * std_all]
+
+    mean = float(normal.mean())
+    std = float(normal.std())
+
+    blink = min(max(mean - 1.5 * std, 0.15), 0.35)
+    drowsy = min(max(mean - 0.8 * std, 0.20), 0.40)
+    if drowsy < blink:
+        drowsy = blink + 0.03
+    return blink, drowsy, mean, std, normal.size
+
+
+def _read_varint(buf, i):
+    """Đọc một varint protobuf tại vị trí i, trả về (giá trị, vị trí kế tiếp)"""
+    value = 0
+    shift = 0
+    while True:
+        b = buf[i]
+        i += 1
+        value |= (int(b) & 0x7F) << shift
+        shift += 7
+        if b < 0x80:
+            return value, i
+
+
+def landmarks_px(buf, w, h, raw, out):
+    """
+    Decode NormalizedLandmarkList (MediaPipe protobuf) đã serialize sang pixel
+
+    Đọc trực tiếp wire format: mỗi landmark là message con (field 1) với x, y là
+    fixed32 (field 1, 2); các field khác (z, visibility, presence) được bỏ qua.
+    Bit pattern float32 gom vào `raw` rồi reinterpret một lần ở cuối.
+
+    Args:
+        buf: Bytes của NormalizedLandmarkList.SerializeToString() dạng array uint8
+        w, h: Kích thước frame (pixel)
+        raw: Scratch array (N, 2) uint32
+        out: Array (N, 2) float32 nhận tọa độ pixel (x * w, y * h)
+
+    Returns:
+        int: Số landmarks đã decode (tối đa N)
+    """
+    n = 0
+    i = 0
+    size = buf.shape[0]
+    cap = raw.shape[0]
+    while i < size and n < cap:
+        key = buf[i]
+        length, i = _read_varint(buf, i + 1)
+        end = i + length
+        if key != 0x0A:
+            i = end
+            continue
+        raw[n, 0] = 0
+        raw[n, 1] = 0
+        while i < end:
+            tag = buf[i]
+            i += 1
+            wire_type = tag & 7
+            if wire_type == 5:
+                bits = (np.uint32(buf[i]) | (np.uint32(buf[i + 1]) << 8)
+                        | (np.uint32(buf[i + 2]) << 16) | (np.uint32(buf[i + 3]) << 24))
+                if tag == 0x0D:
+                    raw[n, 0] = bits
+                elif tag == 0x15:
+                    raw[n, 1] = bits
+                i += 4
+            elif wire_type == 0:
+                _, i = _read_varint(buf, i)
+            elif wire_type == 1:
+                i += 8
+            else:
+                length, i = _read_varint(buf, i)
+                i += length
+        n += 1
+
+    coords = raw.view(np.float32)
+    for k in range(n):
+        out[k, 0] = coords[k, 0] * w
+        out[k, 1] = coords[k, 1] * h
+    return n
+
+
+if NUMBA_AVAILABLE:
+    ear_thresholds = numba.njit(cache=True)(ear_thresholds)
+    _read_varint = numba.njit(cache=True)(_read_varint)
+    landmarks_px = numba.njit(cache=True)(landmarks_px)
+
+
+def warmup() -> None:
+    """Gọi các kernel một lần với dữ liệu giả để trả trước chi phí JIT"""
+    if not NUMBA_AVAILABLE:
+        return
+    ear6(np.zeros((6, 2), dtype=np.float32), 1e-6)
+    roi_std_u8(np.zeros((4, 4), dtype=np.uint8), 0, 4, 0, 4)
+    landmarks_px(np.zeros(0, dtype=np.uint8), 1.0, 1.0,
+                 np.zeros((1, 2), dtype=np.uint32), np.zeros((1, 2), dtype=np.float32))
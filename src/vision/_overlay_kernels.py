@@ -0,0 +1,146 @@
+"""
+Module Overlay Kernels - Kernel phân loại cho các panel của camera overlay
+
+Module này cung cấp:
+- classify_alerts: Mức border và các alert của alerts panel từ EAR, khoảng cách,
+  blink rate, posture và drowsiness
+- classify_health: Mức blink rate và eye fatigue của health status panel
+- blend_fill: Tô nền bán trong suốt (màu cố định) lên ROI của frame
+
+Kết quả phân loại là mã số nguyên (và bitmask alert) để code vẽ tra màu/nhãn
+trong các tuple hằng phía Python. Hai hàm phân loại chỉ là chuỗi so sánh vô
+hướng nên chạy bằng Python thuần (gọi qua dispatch của njit còn chậm hơn).
+Khi có Numba, blend_fill được biên dịch sang native code (njit); nếu không có
+sẽ fallback về cv2.addWeighted.
+"""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Bit alert trong kết quả classify_alerts (theo thứ tự hiển thị trên panel)
+ALERT_TOO_CLOSE = 1
+ALERT_TOO_FAR = 2
+ALERT_EYE_FATIGUE = 4
+ALERT_POOR_POSTURE = 8
+ALERT_DROWSY = 16
+ALERT_EAR_LOW = 32
+ALERT_BLINK_LOW = 64
+ALERT_BLINK_HIGH = 128
+
+
+def classify_alerts(ear, distance, blink_rate, posture_poor, drowsy):
+    """
+    Phân loại alerts panel trong một lần gọi
+
+    - Mức border: EAR < 0.22 (+1), posture poor (+1), drowsiness (+2);
+      tổng >= 3 → 2 (critical), >= 2 → 1 (warning), còn lại 0 (good)
+    - Alerts: khoảng cách < 40 / > 100 cm (bỏ qua nếu distance = 0), EAR < 0.22,
+      posture poor, drowsiness hoặc EAR < 0.28, blink rate < 10 / > 30 lần/phút
+
+    Args:
+        ear: EAR trung bình (0.3 nếu không có)
+        distance: Khoảng cách tới màn hình (cm), 0.0 nếu không có
+        blink_rate: Số lần chớp mắt / phút
+        posture_poor: True nếu posture status là "poor"
+        drowsy: True nếu đang detect buồn ngủ
+
+    Returns:
+        Tuple: (border_code, alert_flags)
+    """
+    level = 0
+    flags = 0
+    if distance != 0.0:
+        if distance < 40.0:
+            flags |= ALERT_TOO_CLOSE
+        elif distance > 100.0:
+            flags |= ALERT_TOO_FAR
+    if ear < 0.22:
+        level += 1
+        flags |= ALERT_EYE_FATIGUE
+    if posture_poor:
+        level += 1
+        flags |= ALERT_POOR_POSTURE
+    if drowsy:
+        level += 2
+        flags |= ALERT_DROWSY
+    elif ear < 0.28:
+        flags |= ALERT_EAR_LOW
+    if blink_rate < 10.0:
+        flags |= ALERT_BLINK_LOW
+    elif blink_rate > 30.0:
+        flags |= ALERT_BLINK_HIGH
+    border_code = 2 if level >= 3 else (1 if level >= 2 else 0)
+    return border_code, flags
+
+
+def classify_health(blink_rate, avg_ear):
+    """
+    Phân loại blink rate và eye fatigue cho health status panel
+
+    Args:
+        blink_rate: Số lần chớp mắt / phút (bình thường 15-25)
+        avg_ear: EAR trung bình gần đây
+
+    Returns:
+        Tuple: (blink_code, fatigue_code) - blink 0 = NORMAL, 1 = ABNORMAL;
+        fatigue 0 = LOW, 1 = MEDIUM (< 0.25), 2 = HIGH (< 0.2)
+    """
+    blink_code = 0 if 15.0 <= blink_rate <= 25.0 else 1
+    fatigue_code = 2 if avg_ear < 0.2 else (1 if avg_ear < 0.25 else 0)
+    return blink_code, fatigue_code
+
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(cache=True)
+    def blend_fill(roi, b, g, r, frame_w256):
+        """
+        roi = (roi * frame_w256 + color * (256 - frame_w256)) / 256, số nguyên, làm tròn
+
+        Args:
+            roi: View (H, W, 3) uint8 của frame, được sửa trực tiếp
+            b, g, r: Màu nền
+            frame_w256: Trọng số của frame gốc nhân 256 (0-256)
+        """
+        tint_w = 256 - frame_w256
+        cb = b * tint_w + 128
+        cg = g * tint_w + 128
+        cr = r * tint_w + 128
+        for y in range(roi.shape[0]):
+            for x in range(roi.shape[1]):
+                roi[y, x, 0] = (roi[y, x, 0] * frame_w256 + cb) >> 8
+                roi[y, x, 1] = (roi[y, x, 1] * frame_w256 + cg) >> 8
+                roi[y, x, 2] = (roi[y, x, 2] * frame_w256 + cr) >> 8
+
+else:
+
+    def blend_fill(roi, b, g, r, frame_w256):
+        """
+        roi = roi * w + color * (1 - w) với w = frame_w256 / 256, bằng cv2.addWeighted
+
+        Args:
+            roi: View (H, W, 3) uint8 của frame, được sửa trực tiếp
+            b, g, r: Màu nền
+            frame_w256: Trọng số của frame gốc nhân 256 (0-256)
+        """
+        frame_weight = frame_w256 / 256.0
+        tint = np.empty_like(roi)
+        tint[:] = (b, g, r)
+        cv2.addWeighted(roi, frame_weight, tint, 1.0 - frame_weight, 0, dst=roi)
+
+
+def warmup() -> None:
+    """Gọi kernel một lần với dữ liệu giả để trả trước chi phí JIT"""
+    if not NUMBA_AVAILABLE:
+        return
+    # ROI luôn là view (không contiguous) của frame
+    blend_fill(np.zeros((2, 4, 3), dtype=np.uint8)[:, 1:3], 0, 0, 0, 179)
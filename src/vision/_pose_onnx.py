@@ -0,0 +1,270 @@
+"""
+Module Pose ONNX - Backend INT8 (ONNX Runtime) thay cho MediaPipe Pose
+
+Module này cung cấp:
+- quantize_pose_model: Lượng tử hóa động (weights INT8) model pose landmark ONNX, chạy một lần offline
+- OnnxPose: Wrapper có cùng giao diện process(rgb) như mp.solutions.pose.Pose
+
+Model mặc định là BlazePose landmark (256x256 RGB, float 0-1) đã export sang ONNX.
+Cũng hỗ trợ model pose gọn hơn (vd: kiểu LitePose, chỉ upper body, input 192x192):
+kích thước và layout input (NHWC/NCHW) đọc từ model, thứ tự keypoints output
+khai báo qua keypoint_map.
+Khi không có onnxruntime hoặc không cấu hình model, PostureAnalyzer tự fallback
+về MediaPipe Pose (FP32).
+"""
+
+from __future__ import annotations
+
+import os
+from types import SimpleNamespace
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+# Kích thước input mặc định (BlazePose landmark) khi model khai báo chiều động
+_INPUT_SIZE = 256
+# Số landmarks MediaPipe Pose (BlazePose trả thêm 6 auxiliary landmarks, bỏ qua)
+_NUM_LANDMARKS = 33
+# Số keypoints output của BlazePose landmark model
+_BLAZEPOSE_OUTPUTS = 39
+# Chỉ số PoseLandmark mà PostureAnalyzer đọc: NOSE, LEFT_EYE, RIGHT_EYE,
+# LEFT_SHOULDER, RIGHT_SHOULDER; keypoint_map phải bao gồm đủ
+_REQUIRED_LANDMARKS = (0, 2, 5, 11, 12)
+
+
+def quantize_pose_model(model_input: str, model_output: str) -> str:
+    """
+    Lượng tử hóa động model pose landmark: weights INT8, activations dynamic
+
+    Args:
+        model_input: Đường dẫn model ONNX FP32 (vd: pose_landmark.onnx)
+        model_output: Đường dẫn lưu model INT8 (vd: pose_landmark.int8.onnx)
+
+    Returns:
+        str: Đường dẫn model INT8
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(
+        model_input=model_input,
+        model_output=model_output,
+        weight_type=QuantType.QInt8,
+    )
+    return model_output
+
+
+class _Landmark:
+    """Landmark chuẩn hóa 0-1 theo frame gốc, giống NormalizedLandmark của MediaPipe"""
+
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x: float, y: float, z: float):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class OnnxPose:
+    """
+    Pose landmark bằng ONNX Runtime (model INT8)
+
+    Frame được letterbox về kích thước input của model rồi đưa vào session;
+    kết quả trả về có dạng `results.pose_landmarks.landmark[i].x/.y/.z` như
+    MediaPipe để PostureAnalyzer dùng chung một code path.
+
+    Attributes:
+        _session: onnxruntime.InferenceSession
+        _min_conf: Ngưỡng pose flag để coi là detect được người
+        _keypoint_map: Chỉ số PoseLandmark của từng keypoint output (None = BlazePose 33 điểm)
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        min_detection_confidence: float = 0.5,
+        keypoint_map: Optional[Sequence[int]] = None,
+    ):
+        """
+        Khởi tạo ONNX Runtime session
+
+        Args:
+            model_path: Đường dẫn model ONNX (khuyến nghị bản INT8)
+            min_detection_confidence: Ngưỡng pose flag [0, 1]
+            keypoint_map: Với model chỉ trả một phần keypoints (vd: 5 điểm upper body),
+                chỉ số PoseLandmark tương ứng với từng keypoint output theo thứ tự
+
+        Raises:
+            ValueError: keypoint_map có chỉ số ngoài [0, 33) hoặc thiếu landmark
+                mà PostureAnalyzer cần (_REQUIRED_LANDMARKS)
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime is not installed")
+        if not os.path.isfile(model_path):
+            raise FileNotFoundError(f"Pose ONNX model not found: {model_path}")
+        if keypoint_map:
+            mapped = [int(i) for i in keypoint_map]
+            invalid = sorted(i for i in mapped if not 0 <= i < _NUM_LANDMARKS)
+            if invalid:
+                raise ValueError(f"Invalid pose keypoint_map: indices out of range {invalid}")
+            missing = sorted(set(_REQUIRED_LANDMARKS) - set(mapped))
+            if missing:
+                raise ValueError(
+                    f"Invalid pose keypoint_map: missing required PoseLandmark indices {missing}"
+                )
+
+        sess_options = ort.SessionOptions()
+        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Chạy trong background thread của vision loop, không tranh CPU với các thread khác
+        sess_options.intra_op_num_threads = 1
+        self._session = ort.InferenceSession(
+            model_path, sess_options=sess_options, providers=["CPUExecutionProvider"]
+        )
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._min_conf = float(min_detection_confidence)
+        self._keypoint_map = tuple(int(i) for i in keypoint_map) if keypoint_map else None
+
+        # Layout và kích thước input: (1, H, W, 3) hoặc (1, 3, H, W); chiều động dùng mặc định
+        shape = list(model_input.shape)
+        self._nchw = len(shape) == 4 and shape[1] == 3
+        dims = shape[2:4] if self._nchw else shape[1:3]
+        self._in_h, self._in_w = (
+            d if isinstance(d, int) and d > 0 else _INPUT_SIZE for d in (dims + [None, None])[:2]
+        )
+
+        # Buffer input tái sử dụng giữa các frame
+        self._canvas = np.zeros((self._in_h, self._in_w, 3), dtype=np.uint8)
+        tensor_shape = (1, 3, self._in_h, self._in_w) if self._nchw else (1, self._in_h, self._in_w, 3)
+        self._tensor = np.empty(tensor_shape, dtype=np.float32)
+
+        # IOBinding: OrtValue bọc trực tiếp bộ nhớ của self._tensor (CPU, không copy) và được
+        # bind một lần; mỗi frame chỉ ghi vào tensor rồi chạy, không tạo OrtValue/feed dict mới
+        self._input_ortval = ort.OrtValue.ortvalue_from_numpy(self._tensor)
+        self._io = self._session.io_binding()
+        self._io.bind_ortvalue_input(self._input_name, self._input_ortval)
+        for output in self._session.get_outputs():
+            self._io.bind_output(output.name)
+
+    def _letterbox(self, image: np.ndarray, bgr: bool):
+        """
+        Resize giữ tỉ lệ và pad vào canvas kích thước input của model
+
+        Args:
+            image: Frame (H, W, 3) uint8
+            bgr: True nếu frame là BGR; đảo kênh được gộp vào bước chuẩn hóa
+                 sang float nên không tốn thêm một lượt qua ảnh
+
+        Returns:
+            Tuple: (scale, pad_x, pad_y)
+        """
+        h, w = image.shape[:2]
+        scale = min(self._in_w / w, self._in_h / h)
+        new_w = max(1, int(round(w * scale)))
+        new_h = max(1, int(round(h * scale)))
+        pad_x = (self._in_w - new_w) // 2
+        pad_y = (self._in_h - new_h) // 2
+
+        self._canvas.fill(0)
+        self._canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = cv2.resize(
+            image, (new_w, new_h), interpolation=cv2.INTER_AREA
+        )
+        canvas = self._canvas[:, :, ::-1] if bgr else self._canvas
+        if self._nchw:
+            canvas = canvas.transpose(2, 0, 1)
+        np.multiply(canvas[None], 1.0 / 255.0, out=self._tensor, casting="unsafe")
+        return scale, pad_x, pad_y
+
+    def process(self, rgb: np.ndarray):
+        """
+        Chạy inference trên frame RGB
+
+        Args:
+            rgb: Frame RGB (H, W, 3) uint8
+
+        Returns:
+            SimpleNamespace: `pose_landmarks` là None nếu không detect được người
+        """
+        return self._run(rgb, bgr=False)
+
+    def process_bgr(self, bgr: np.ndarray):
+        """
+        Chạy inference trực tiếp trên frame BGR từ camera (không cần cvtColor)
+
+        Args:
+            bgr: Frame BGR (H, W, 3) uint8
+
+        Returns:
+            SimpleNamespace: `pose_landmarks` là None nếu không detect được người
+        """
+        return self._run(bgr, bgr=True)
+
+    def _run(self, image: np.ndarray, bgr: bool):
+        """Letterbox, inference và chuyển landmarks về tọa độ chuẩn hóa của frame gốc"""
+        h, w = image.shape[:2]
+        scale, pad_x, pad_y = self._letterbox(image, bgr)
+        self._session.run_with_iobinding(self._io)
+        outputs = self._io.copy_outputs_to_cpu()
+
+        # outputs[0]: K keypoints x (x, y, z, ...) theo pixel của input model
+        #   (BlazePose: (1, 195) = 39 x (x, y, z, visibility, presence))
+        # outputs[1]: (1, 1) pose flag (nếu model có)
+        pose_flag = float(np.ravel(outputs[1])[0]) if len(outputs) > 1 else 1.0
+        if pose_flag < self._min_conf:
+            return SimpleNamespace(pose_landmarks=None)
+
+        flat = np.asarray(outputs[0], dtype=np.float32).ravel()
+        n_out = len(self._keypoint_map) if self._keypoint_map else _BLAZEPOSE_OUTPUTS
+        raw = flat.reshape(n_out, -1)[:, :3]
+        inv_w = 1.0 / (scale * w)
+        inv_h = 1.0 / (scale * h)
+        points: List[_Landmark] = [
+            _Landmark(
+                float((x - pad_x) * inv_w),
+                float((y - pad_y) * inv_h),
+                float(z * inv_w),
+            )
+            for x, y, z in raw.tolist()
+        ]
+
+        if self._keypoint_map is None:
+            landmarks = points[:_NUM_LANDMARKS]
+        else:
+            # Đặt từng keypoint vào đúng chỉ số PoseLandmark, các vị trí còn lại để trống
+            landmarks = [None] * _NUM_LANDMARKS
+            for idx, point in zip(self._keypoint_map, points):
+                landmarks[idx] = point
+        return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=landmarks))
+
+    def close(self) -> None:
+        """Giải phóng session (giống Pose.close của MediaPipe)"""
+        self._io = None
+        self._input_ortval = None
+        self._session = None
+
+
+def create_onnx_pose(
+    model_path: Optional[str],
+    min_detection_confidence: float,
+    keypoint_map: Optional[Sequence[int]] = None,
+) -> Optional[OnnxPose]:
+    """
+    Tạo OnnxPose nếu có model và onnxruntime, ngược lại trả None để fallback MediaPipe
+
+    Args:
+        model_path: Đường dẫn model ONNX hoặc None/"" nếu không dùng
+        min_detection_confidence: Ngưỡng pose flag
+        keypoint_map: Chỉ số PoseLandmark của từng keypoint output (model upper body)
+
+    Returns:
+        Optional[OnnxPose]: Backend ONNX hoặc None
+    """
+    if not model_path or not ONNXRUNTIME_AVAILABLE or not os.path.isfile(model_path):
+        return None
+    return OnnxPose(model_path, min_detection_confidence, keypoint_map)
@@ -0,0 +1,115 @@
+"""
+Module Posture Kernels - Kernel số học cho PostureAnalyzer
+
+Module này cung cấp:
+- posture_math: Tính yaw/pitch/shoulder tilt (đã chuẩn hóa) và khoảng cách tới màn hình
+  từ 5 key landmarks trong một lần gọi
+- classify_panel_angles: Trị tuyệt đối và mức GOOD/WARN/POOR của yaw/pitch/shoulder
+  cho posture panel trên overlay
+
+Khi có Numba, posture_math được biên dịch sang native code (njit) để tránh
+overhead dispatch của NumPy trên các giá trị vô hướng; nếu không có sẽ chạy
+bằng math thuần Python với cùng công thức. classify_panel_angles chỉ là vài
+phép so sánh vô hướng nên luôn chạy bằng Python thuần (gọi qua dispatch của
+njit còn chậm hơn).
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def posture_math(pts, focal, avg_eye_cm, min_eye_px, min_dist_cm, max_dist_cm):
+    """
+    Tính các góc tư thế và khoảng cách từ 5 key landmarks
+
+    - Góc có dấu bằng atan2(cross, dot) với vector tham chiếu: yaw (1, 0),
+      pitch (0, -1), shoulder tilt (1, 0); chuẩn hóa về [-90, +90).
+      atan2 chỉ phụ thuộc hướng vector nên các góc đã bất biến với tỉ lệ
+      (khoảng cách ngồi, độ phân giải) và vị trí trong khung hình; chuẩn hóa
+      theo chiều dài torso không làm thay đổi kết quả nên không cần tính
+    - distance = (avg_eye_cm * focal) / eye_px, clamp trong [min_dist_cm, max_dist_cm]
+
+    Args:
+        pts: Array (5, 3) pixel: mắt trái, mắt phải, vai trái, vai phải, mũi
+        focal: Camera focal length
+        avg_eye_cm: Khoảng cách trung bình giữa 2 mắt (cm)
+        min_eye_px: Khoảng cách mắt tối thiểu (pixel) để ước tính khoảng cách
+        min_dist_cm, max_dist_cm: Khoảng cách hợp lý
+
+    Returns:
+        Tuple: (yaw, pitch, shoulder_tilt, eye_px, distance_cm), distance_cm = -1.0
+        nếu eye_px quá nhỏ
+    """
+    lex = pts[0, 0]
+    ley = pts[0, 1]
+    rex = pts[1, 0]
+    rey = pts[1, 1]
+
+    # Vector mắt trái → mắt phải, vai trái → vai phải, trung điểm mắt → mũi
+    ex = rex - lex
+    ey = rey - ley
+    sx = pts[3, 0] - pts[2, 0]
+    sy = pts[3, 1] - pts[2, 1]
+    hx = pts[4, 0] - (lex + rex) * 0.5
+    hy = pts[4, 1] - (ley + rey) * 0.5
+
+    yaw = math.degrees(math.atan2(-ey, ex))
+    pitch = math.degrees(math.atan2(-hx, -hy))
+    shoulder = math.degrees(math.atan2(-sy, sx))
+
+    # Chuẩn hóa modulo 180 về [-90, +90)
+    yaw = ((yaw + 90.0) % 180.0) - 90.0
+    pitch = ((pitch + 90.0) % 180.0) - 90.0
+    shoulder = ((shoulder + 90.0) % 180.0) - 90.0
+
+    eye_px = math.hypot(ex, ey)
+    distance_cm = -1.0
+    if eye_px >= min_eye_px:
+        distance_cm = (avg_eye_cm * focal) / eye_px
+        if distance_cm < min_dist_cm:
+            distance_cm = min_dist_cm
+        elif distance_cm > max_dist_cm:
+            distance_cm = max_dist_cm
+    return yaw, pitch, shoulder, eye_px, distance_cm
+
+
+def classify_panel_angles(yaw, pitch, shoulder):
+    """
+    Phân loại 3 góc tư thế cho posture panel trong một lần gọi
+
+    Ngưỡng (độ): head turn 15/20, head tilt 15/22, shoulder 10/15;
+    mức 0 = GOOD, 1 = WARN, 2 = POOR
+
+    Args:
+        yaw, pitch, shoulder: Góc đã chuẩn hóa (độ)
+
+    Returns:
+        Tuple: (abs_yaw, abs_pitch, abs_shoulder, yaw_code, pitch_code, shoulder_code)
+    """
+    abs_yaw = abs(yaw)
+    abs_pitch = abs(pitch)
+    abs_shoulder = abs(shoulder)
+    yaw_code = 0 if abs_yaw <= 15.0 else (1 if abs_yaw <= 20.0 else 2)
+    pitch_code = 0 if abs_pitch <= 15.0 else (1 if abs_pitch <= 22.0 else 2)
+    shoulder_code = 0 if abs_shoulder <= 10.0 else (1 if abs_shoulder <= 15.0 else 2)
+    return abs_yaw, abs_pitch, abs_shoulder, yaw_code, pitch_code, shoulder_code
+
+
+if NUMBA_AVAILABLE:
+    posture_math = numba.njit(cache=True, fastmath=True)(posture_math)
+
+
+def warmup() -> None:
+    """Gọi kernel một lần với dữ liệu giả để trả trước chi phí JIT"""
+    if not NUMBA_AVAILABLE:
+        return
+    posture_math(np.zeros((5, 3), dtype=np.float32), 600.0, 6.3, 30.0, 50.0, 80.0)
@@ -14,6 +14,8 @@ import time
 from typing import Tuple, Optional, Any
 from collections import deque
 
+import numpy as np
+
 from utils import get_config
 from vision.eye_tracker import EyeTracker
 
@@ -71,7 +73,12 @@ class BlinkDetector:
         self.session_start_time = time.time()
 
         # --- Queue chống nhiễu khi quay đầu ---
-        self._yaw_queue: deque[float] = deque(maxlen=30)  # ~1 giây @ 30fps
+        # Ring yaw ~1 giây @ 30fps, lưu int16 centi-degrees; tổng nguyên cập nhật tăng dần
+        # nên trung bình là O(1) và không tích lũy sai số float
+        self._yaw_ring = np.zeros(30, dtype=np.int16)
+        self._yaw_idx = 0
+        self._yaw_count = 0
+        self._yaw_sum = 0
         self._yaw_window = 1.0  # giây
         self._counting_active = False
 
@@ -196,8 +203,17 @@ class BlinkDetector:
 
         if yaw is not None:
             # Moving average filter cho yaw
-            self._yaw_queue.append(yaw)
-            avg_yaw = sum(self._yaw_queue) / len(self._yaw_queue)
+            ring = self._yaw_ring
+            idx = self._yaw_idx
+            centi = max(-32768, min(32767, int(round(yaw * 100))))
+            if self._yaw_count == ring.shape[0]:
+                self._yaw_sum -= int(ring[idx])
+            else:
+                self._yaw_count += 1
+            ring[idx] = centi
+            self._yaw_sum += centi
+            self._yaw_idx = (idx + 1) % ring.shape[0]
+            avg_yaw = self._yaw_sum / (100.0 * self._yaw_count)
 
             if abs(avg_yaw) > self.max_head_yaw:
                 reason = "head_yaw_exceeded"
@@ -275,7 +291,9 @@ class BlinkDetector:
         self._counting_active = False
         self._closed_frames = 0
         self._ear_buffer.clear()
-        self._yaw_queue.clear()
+        self._yaw_idx = 0
+        self._yaw_count = 0
+        self._yaw_sum = 0
 
     def _calculate_blink_rate(self) -> float:
         """
@@ -10,11 +10,86 @@ Module này cung cấp các chức năng:
 
 from __future__ import annotations
 import time
-import numpy as np
-from collections import deque
+from operator import itemgetter
 from typing import Dict, Any, Optional
 
-from utils import get_config
+try:
+    import numpy as np
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+from utils import get_config, get_config_value
+
+EAR_FILTER_LEN = 5  # Kích thước buffer moving average cho EAR
+_NS_PER_SEC = 1_000_000_000  # Timestamp dùng time.monotonic_ns()
+
+
+def _ear_weights(n: int) -> tuple:
+    """Weights tăng dần từ 0.5 đến 1.0 (như np.linspace) đã chuẩn hóa tổng = 1"""
+    if n == 1:
+        return (1.0,)
+    raw = [0.5 + 0.5 * i / (n - 1) for i in range(n)]
+    total = sum(raw)
+    return tuple(w / total for w in raw)
+
+
+# Weights tính sẵn theo độ dài buffer để không phải tạo lại mảng mỗi frame
+# (hàng n chứa weights cho buffer có n phần tử, hàng 0 không dùng)
+_EAR_WEIGHTS = ((0.0,) * EAR_FILTER_LEN,) + tuple(
+    _ear_weights(n) + (0.0,) * (EAR_FILTER_LEN - n) for n in range(1, EAR_FILTER_LEN + 1)
+)
+
+
+def _ear_ring_step(val, ring, state, weights):
+    """
+    Ghi EAR mới vào ring buffer và trả về weighted moving average
+
+    Args:
+        val: Giá trị EAR mới
+        ring: Ring buffer kích thước cố định EAR_FILTER_LEN
+        state: [vị trí ghi tiếp theo, số phần tử hiện có]
+        weights: Bảng weights theo độ dài buffer (_EAR_WEIGHTS)
+
+    Returns:
+        float: Giá trị đã filter
+    """
+    size = len(ring)
+    idx = state[0]
+    n = state[1]
+    ring[idx] = val
+    idx = (idx + 1) % size
+    if n < size:
+        n += 1
+    state[0] = idx
+    state[1] = n
+    if n < 2:
+        return val
+
+    # Phần tử cũ nhất nằm ở idx - n (weights tăng dần về phần tử mới nhất)
+    start = (idx - n) % size
+    acc = 0.0
+    for i in range(n):
+        acc += weights[n][i] * ring[(start + i) % size]
+    return acc
+
+
+if NUMBA_AVAILABLE:
+    # Biên dịch sang native code; state phải là numpy array
+    _ear_ring_step = numba.njit(cache=True, fastmath=True)(_ear_ring_step)
+    _EAR_WEIGHTS = np.array(_EAR_WEIGHTS, dtype=np.float64)
+
+
+# Lấy các trường posture cần thiết trong một lần gọi
+_posture_fields = itemgetter("head_side_angle", "head_updown_angle", "shoulder_tilt", "eye_distance_cm")
+
+
+def _new_ear_ring():
+    """Tạo (ring, state) phù hợp với backend hiện tại"""
+    if NUMBA_AVAILABLE:
+        return np.zeros(EAR_FILTER_LEN, dtype=np.float64), np.zeros(2, dtype=np.int64)
+    return [0.0] * EAR_FILTER_LEN, [0, 0]
 
 
 class DrowsinessDetector:
@@ -35,6 +110,29 @@ class DrowsinessDetector:
         _drowsy: Trạng thái buồn ngủ hiện tại
     """
 
+    # Attribute cố định, truy cập mỗi frame -> dùng slots thay cho __dict__
+    __slots__ = (
+        "cfg",
+        "ear_th", "ear_duration_th",
+        "max_head_pitch", "max_head_yaw", "max_shoulder_tilt",
+        "min_gaze_distance_cm", "max_gaze_distance_cm",
+        "posture_window_sec", "gaze_off_threshold_sec",
+        "_ear_buf", "_ear_state", "_ear_low_start", "_ear_low_frames", "EAR_CONSEC_FRAMES",
+        "_posture_bad_start", "_gaze_off_start", "_gaze_last_seen", "MAX_MISSING_DIST_SEC",
+        "_drowsy", "_drowsy_end_time", "DROWSY_RELEASE_SEC",
+        "_ear_duration_th_ns", "_posture_window_ns", "_gaze_off_threshold_ns",
+        "_max_missing_dist_ns", "_drowsy_release_ns", "_posture_limits",
+    )
+
+    # Template kết quả, copy mỗi lần update (nhanh hơn dựng dict literal)
+    _INFO_TEMPLATE: Dict[str, Any] = {
+        "drowsiness_detected": False,
+        "reason": None,
+        "ear_duration": 0.0,
+        "posture_bad_duration": 0.0,
+        "gaze_off_duration": 0.0,
+    }
+
     def __init__(self, config_path: str = "settings.json"):
         """
         Khởi tạo Drowsiness Detector
@@ -62,22 +160,35 @@ class DrowsinessDetector:
         self.gaze_off_threshold_sec = 2.0  # Gaze off trong 2s
 
         # EAR filtering
-        self._ear_buf = deque(maxlen=5)            # Buffer cho moving average
-        self._ear_low_start: Optional[float] = None  # Thời điểm bắt đầu EAR thấp
+        self._ear_buf, self._ear_state = _new_ear_ring()  # Ring buffer cho moving average
+        self._ear_low_start: Optional[int] = None    # Thời điểm bắt đầu EAR thấp (ns)
         self._ear_low_frames: int = 0               # Số frame liên tục EAR thấp
         self.EAR_CONSEC_FRAMES: int = 3             # ~100ms ở 30 FPS
 
         # Posture & Gaze tracking
-        self._posture_bad_start: Optional[float] = None  # Thời điểm bắt đầu tư thế xấu
-        self._gaze_off_start: Optional[float] = None     # Thời điểm bắt đầu gaze off
-        self._gaze_last_seen: Optional[float] = None     # Lần cuối thấy gaze hợp lệ
+        self._posture_bad_start: Optional[int] = None    # Thời điểm bắt đầu tư thế xấu (ns)
+        self._gaze_off_start: Optional[int] = None       # Thời điểm bắt đầu gaze off (ns)
+        self._gaze_last_seen: Optional[int] = None       # Lần cuối thấy gaze hợp lệ (ns)
         self.MAX_MISSING_DIST_SEC: float = 1.0           # Thời gian mất distance tối đa
 
         # Drowsiness state với hysteresis
         self._drowsy: bool = False
-        self._drowsy_end_time: Optional[float] = None    # Thời điểm kết thúc drowsy
+        self._drowsy_end_time: Optional[int] = None      # Thời điểm kết thúc drowsy (ns)
         self.DROWSY_RELEASE_SEC: float = 0.5             # Giữ trạng thái drowsy thêm 0.5s (nhạy hơn)
 
+        # Ngưỡng thời gian quy đổi sẵn sang nanosecond cho hot path
+        self._ear_duration_th_ns = int(self.ear_duration_th * _NS_PER_SEC)
+        self._posture_window_ns = int(self.posture_window_sec * _NS_PER_SEC)
+        self._gaze_off_threshold_ns = int(self.gaze_off_threshold_sec * _NS_PER_SEC)
+        self._max_missing_dist_ns = int(self.MAX_MISSING_DIST_SEC * _NS_PER_SEC)
+        self._drowsy_release_ns = int(self.DROWSY_RELEASE_SEC * _NS_PER_SEC)
+
+        # Ngưỡng tư thế gom vào một tuple để unpack một lần mỗi frame
+        self._posture_limits = (
+            self.max_head_yaw, self.max_head_pitch, self.max_shoulder_tilt,
+            self.min_gaze_distance_cm, self.max_gaze_distance_cm,
+        )
+
     def update(
         self,
         ear: Optional[float] = None,
@@ -98,161 +209,118 @@ class DrowsinessDetector:
                 - posture_bad_duration: float - thời gian tư thế xấu
                 - gaze_off_duration: float - thời gian gaze off
         """
-        now = time.time()
+        now = time.monotonic_ns()
 
         # Initialize result
-        info: Dict[str, Any] = {
-            "drowsiness_detected": False,
-            "reason": None,
-            "ear_duration": 0.0,
-            "posture_bad_duration": 0.0,
-            "gaze_off_duration": 0.0,
-        }
-
-        # 1) Phân tích EAR với debounce
-        ear_drowsy = self._analyze_ear(ear, now, info)
+        info = self._INFO_TEMPLATE.copy()
 
-        # 2) Phân tích tư thế xấu
-        posture_drowsy = self._analyze_posture(posture_data, now, info)
-
-        # 3) Phân tích gaze off
-        gaze_drowsy = self._analyze_gaze_off(posture_data, now, info)
+        # 1-3) Phân tích EAR, tư thế và gaze off trong một lượt
+        drowsy_signals = self._analyze_all(ear, posture_data, now, info)
 
         # 4) Tổng hợp các signals với hysteresis
-        drowsy_signals = sum([ear_drowsy, posture_drowsy, gaze_drowsy])
         self._update_drowsy_state(drowsy_signals, now, info)
 
         info["drowsiness_detected"] = self._drowsy
         return info
 
-    def _analyze_ear(self, ear: Optional[float], now: float, info: Dict[str, Any]) -> bool:
+    def _analyze_all(
+        self,
+        ear: Optional[float],
+        posture_data: Optional[Dict[str, Any]],
+        now: int,
+        info: Dict[str, Any],
+    ) -> int:
         """
-        Phân tích EAR để detect mệt mỏi
+        Phân tích EAR, tư thế xấu và gaze off trong một lượt duy nhất
+
+        Mỗi trường của posture_data chỉ được đọc một lần và cả ba state machine
+        được cập nhật trong cùng một khối code.
 
         Args:
             ear: Eye Aspect Ratio value
-            now: Timestamp hiện tại
+            posture_data: Dict từ PostureAnalyzer
+            now: Timestamp hiện tại (time.monotonic_ns)
             info: Dict để lưu kết quả
 
         Returns:
-            bool: True nếu detect được drowsiness từ EAR
+            int: Số signals drowsy (0-3)
         """
+        signals = 0
+
+        # 1) EAR với debounce
         if ear is None:
             self._ear_low_start = None
             self._ear_low_frames = 0
-            return False
-
-        # Áp dụng moving average filter
-        ear_f = self._filter_ear(ear, self._ear_buf)
-        ear_low_now = ear_f < self.ear_th
-
-        if ear_low_now:
-            # EAR đang thấp
+        elif self._filter_ear(ear) < self.ear_th:
+            # EAR đang thấp, bắt đầu đếm thời gian sau đủ frames liên tục
             self._ear_low_frames += 1
-
-            # Bắt đầu đếm thời gian sau đủ frames liên tục
-            if self._ear_low_start is None and self._ear_low_frames >= self.EAR_CONSEC_FRAMES:
-                self._ear_low_start = now
-
-            if self._ear_low_start is not None:
-                info["ear_duration"] = now - self._ear_low_start
-                return info["ear_duration"] >= self.ear_duration_th
+            ear_low_start = self._ear_low_start
+            if ear_low_start is None and self._ear_low_frames >= self.EAR_CONSEC_FRAMES:
+                ear_low_start = self._ear_low_start = now
+            if ear_low_start is not None:
+                dur_ns = now - ear_low_start
+                info["ear_duration"] = dur_ns / _NS_PER_SEC
+                if dur_ns >= self._ear_duration_th_ns:
+                    signals += 1
         else:
             # EAR trở lại bình thường
             self._ear_low_start = None
             self._ear_low_frames = 0
 
-        return False
-
-    def _analyze_posture(self, posture_data: Optional[Dict[str, Any]], now: float, info: Dict[str, Any]) -> bool:
-        """
-        Phân tích tư thế để detect buồn ngủ
-
-        Args:
-            posture_data: Dict từ PostureAnalyzer
-            now: Timestamp hiện tại
-            info: Dict để lưu kết quả
-
-        Returns:
-            bool: True nếu detect được drowsiness từ tư thế
-        """
         if posture_data is None:
             self._posture_bad_start = None
-            return False
-
-        # Extract posture metrics
-        yaw = posture_data.get("head_side_angle")
-        pitch = posture_data.get("head_updown_angle")
-        shoulder = posture_data.get("shoulder_tilt")
-        dist_cm = posture_data.get("eye_distance_cm")
-
-        # Kiểm tra tư thế xấu
-        posture_bad = False
-        for val, limit in [
-            (yaw, self.max_head_yaw),
-            (pitch, self.max_head_pitch),
-            (shoulder, self.max_shoulder_tilt),
-        ]:
-            if val is not None and abs(val) > limit:
-                posture_bad = True
-
-        # Kiểm tra khoảng cách不合理
-        if dist_cm is not None and (
-            dist_cm < self.min_gaze_distance_cm or dist_cm > self.max_gaze_distance_cm
+            return signals
+
+        # Unpack posture_data một lần
+        try:
+            yaw, pitch, shoulder, dist_cm = _posture_fields(posture_data)
+        except KeyError:
+            yaw = posture_data.get("head_side_angle")
+            pitch = posture_data.get("head_updown_angle")
+            shoulder = posture_data.get("shoulder_tilt")
+            dist_cm = posture_data.get("eye_distance_cm")
+
+        max_yaw, max_pitch, max_shoulder, min_dist, max_dist = self._posture_limits
+        has_dist = dist_cm is not None
+        too_close = has_dist and dist_cm < min_dist
+
+        # 2) Tư thế xấu (góc đầu/vai hoặc khoảng cách bất hợp lý)
+        if (
+            (yaw is not None and abs(yaw) > max_yaw)
+            or (pitch is not None and abs(pitch) > max_pitch)
+            or (shoulder is not None and abs(shoulder) > max_shoulder)
+            or too_close
+            or (has_dist and dist_cm > max_dist)
         ):
-            posture_bad = True
-
-        if posture_bad:
-            # Bắt đầu đếm thời gian tư thế xấu
             if self._posture_bad_start is None:
                 self._posture_bad_start = now
-
-            dur = now - self._posture_bad_start
-            info["posture_bad_duration"] = dur
-            return dur >= self.posture_window_sec
+            dur_ns = now - self._posture_bad_start
+            info["posture_bad_duration"] = dur_ns / _NS_PER_SEC
+            if dur_ns >= self._posture_window_ns:
+                signals += 1
         else:
-            # Tư thế trở lại bình thường
             self._posture_bad_start = None
-            return False
 
-    def _analyze_gaze_off(self, posture_data: Optional[Dict[str, Any]], now: float, info: Dict[str, Any]) -> bool:
-        """
-        Phân tích gaze off để detect mất tập trung
-
-        Args:
-            posture_data: Dict từ PostureAnalyzer
-            now: Timestamp hiện tại
-            info: Dict để lưu kết quả
-
-        Returns:
-            bool: True nếu detect được drowsiness từ gaze off
-        """
-        if posture_data is None:
-            return False
-
-        dist_cm = posture_data.get("eye_distance_cm")
-
-        # Không có distance hoặc distance quá gần
-        if dist_cm is None or dist_cm < self.min_gaze_distance_cm:
-            # Nếu mất distance quá lâu → reset timer
-            if dist_cm is None and self._gaze_off_start is not None:
-                if now - self._gaze_off_start > self.MAX_MISSING_DIST_SEC:
-                    self._gaze_off_start = None
-            elif dist_cm is not None and dist_cm < self.min_gaze_distance_cm:
-                # Distance quá gần (người ngả gần màn hình)
-                if self._gaze_off_start is None:
-                    self._gaze_off_start = now
-
-                off_dur = now - self._gaze_off_start
-                info["gaze_off_duration"] = off_dur
-                return off_dur >= self.gaze_off_threshold_sec
+        # 3) Gaze off
+        if too_close:
+            # Distance quá gần (người ngả gần màn hình)
+            if self._gaze_off_start is None:
+                self._gaze_off_start = now
+            off_ns = now - self._gaze_off_start
+            info["gaze_off_duration"] = off_ns / _NS_PER_SEC
+            if off_ns >= self._gaze_off_threshold_ns:
+                signals += 1
+        elif not has_dist:
+            # Mất distance quá lâu → reset timer
+            if self._gaze_off_start is not None and now - self._gaze_off_start > self._max_missing_dist_ns:
+                self._gaze_off_start = None
         else:
             # Distance hợp lệ
             self._gaze_off_start = None
 
-        return False
+        return signals
 
-    def _update_drowsy_state(self, drowsy_signals: int, now: float, info: Dict[str, Any]) -> None:
+    def _update_drowsy_state(self, drowsy_signals: int, now: int, info: Dict[str, Any]) -> None:
         """
         Cập nhật trạng thái drowsiness với hysteresis - TĂNG NHẠY
 
@@ -262,7 +330,7 @@ class DrowsinessDetector:
 
         Args:
             drowsy_signals: Số signals hiện tại (0-3)
-            now: Timestamp hiện tại
+            now: Timestamp hiện tại (time.monotonic_ns)
             info: Dict để lưu lý do
         """
         if drowsy_signals >= 1:
@@ -275,7 +343,7 @@ class DrowsinessDetector:
                 self._drowsy_end_time = now
 
             # Kết thúc drowsiness sau hysteresis period
-            if self._drowsy_end_time and now - self._drowsy_end_time >= self.DROWSY_RELEASE_SEC:
+            if self._drowsy_end_time is not None and now - self._drowsy_end_time >= self._drowsy_release_ns:
                 self._drowsy = False
                 self._drowsy_end_time = None
 
@@ -304,7 +372,7 @@ class DrowsinessDetector:
         """
         Reset tất cả trạng thái về giá trị ban đầu
         """
-        self._ear_buf.clear()
+        self._ear_buf, self._ear_state = _new_ear_ring()
         self._ear_low_start = None
         self._ear_low_frames = 0
         self._posture_bad_start = None
@@ -313,26 +381,17 @@ class DrowsinessDetector:
         self._drowsy = False
         self._drowsy_end_time = None
 
-    @staticmethod
-    def _filter_ear(val: float, buf: deque) -> float:
+    def _filter_ear(self, val: float) -> float:
         """
         Áp dụng weighted moving average filter cho EAR
 
         Args:
             val: Giá trị EAR mới
-            buf: Buffer cũ
 
         Returns:
             float: Giá trị đã filter
         """
-        buf.append(val)
-        if len(buf) < 2:
-            return val
-
-        # Weighted average (weights tăng dần)
-        weights = np.linspace(0.5, 1.0, len(buf))
-        weights /= weights.sum()
-        return float(np.average(buf, weights=weights))
+        return float(_ear_ring_step(float(val), self._ear_buf, self._ear_state, _EAR_WEIGHTS))
 
     def reload_threshold(self, config_path: str = "settings.json") -> None:
         """
@@ -341,9 +400,10 @@ class DrowsinessDetector:
         Args:
             config_path: Đường dẫn đến file config
         """
-        cfg = get_config(config_path)
-        health_cfg = cfg["health_monitoring"]
-        self.ear_th = float(health_cfg["DROWSY_THRESHOLD"])
+        threshold = get_config_value("health_monitoring", "DROWSY_THRESHOLD", config_file=config_path)
+        if threshold is None:
+            raise KeyError("DROWSY_THRESHOLD")
+        self.ear_th = float(threshold)
 
     def is_drowsy(self) -> bool:
         """
@@ -11,16 +11,82 @@ Module này cung cấp các chức năng:
 
 from __future__ import annotations
 
+import atexit
 import cv2
 import json
+import math
+import os
 import numpy as np
 import mediapipe as mp
 import threading
 import time
+import warnings
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
-from utils import get_config, ExecutorService
+from utils import get_config, ExecutorService, CONFIG_DIR
+from vision import _eye_kernels
+from vision._eye_kernels import ear6, roi_std_u8
+
+
+def _cuda_device_available() -> bool:
+    """Kiểm tra OpenCV có được build với CUDA và có GPU khả dụng không"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+class _FaceMeshPool:
+    """
+    Pool MediaPipe Face Mesh dùng chung giữa các EyeTracker
+
+    Khởi tạo Face Mesh (TFLite graph) tốn 100 ms - 1 s và nhiều bộ nhớ nên mỗi
+    bộ tham số chỉ tạo một instance. Face Mesh không thread-safe, vì vậy mỗi
+    instance đi kèm một lock cho process(). Pool tự đóng các instance khi thoát.
+    """
+
+    _instances: Dict[Tuple, Tuple[Any, threading.Lock]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, key: Tuple[bool, float, float]) -> Tuple[Any, threading.Lock]:
+        """
+        Lấy (face_mesh, lock) cho bộ tham số, tạo mới nếu chưa có
+
+        Args:
+            key: (refine_landmarks, min_detection_confidence, min_tracking_confidence)
+
+        Returns:
+            Tuple: (FaceMesh, threading.Lock)
+        """
+        with cls._lock:
+            entry = cls._instances.get(key)
+            if entry is None:
+                refine, min_det, min_track = key
+                face_mesh = mp.solutions.face_mesh.FaceMesh(
+                    max_num_faces=1,
+                    refine_landmarks=refine,
+                    min_detection_confidence=min_det,
+                    min_tracking_confidence=min_track,
+                )
+                entry = cls._instances[key] = (face_mesh, threading.Lock())
+            return entry
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Đóng toàn bộ Face Mesh trong pool"""
+        with cls._lock:
+            for face_mesh, _ in cls._instances.values():
+                try:
+                    face_mesh.close()
+                except Exception:
+                    pass
+            cls._instances.clear()
+
+
+atexit.register(_FaceMeshPool.close_all)
 
 
 class EyeTracker:
@@ -36,14 +102,42 @@ class EyeTracker:
 
     Attributes:
         cfg: Dict - Cấu hình từ file settings
-        _face_mesh: MediaPipe Face Mesh object
+        _face_mesh: MediaPipe Face Mesh object (dùng chung qua _FaceMeshPool)
         _cap: OpenCV VideoCapture object
         _latest: Dict - Dữ liệu processing frame mới nhất
         _running: bool - Trạng thái hoạt động
     """
 
-    # Class-level executor để chia sẻ giữa các instance
-    _executor = ExecutorService(max_workers=2)
+    # Class-level executor để chia sẻ giữa các instance (capture + processing mỗi instance)
+    _executor = ExecutorService(max_workers=4)
+
+    # Cặp điểm cho EAR: (p2, p3, p1) - (p6, p5, p4) → vert1, vert2, horiz
+    _EAR_FROM = (1, 2, 0)
+    _EAR_TO = (5, 4, 3)
+
+    # Số scratch buffer điểm mắt dùng xoay vòng
+    _EYE_BUF_SLOTS = 3
+    # Số face landmarks tối đa (468, hoặc 478 khi refine_landmarks bật thêm iris)
+    _MAX_LANDMARKS = 478
+
+    # Template kết quả mỗi frame, copy thay vì dựng dict literal
+    _OUT_TEMPLATE: Dict[str, Any] = {
+        "frame": None,
+        "landmarks": None,
+        "landmarks_px": None,
+        "left_eye": None,
+        "right_eye": None,
+        "gaze_point": None,
+        "left_ear": None,
+        "right_ear": None,
+        "avg_ear": None,
+        "left_contrast": None,
+        "right_contrast": None,
+        "avg_contrast": None,
+        "distance_cm": None,
+        "timestamp": None,
+        "proc_ms": 0.0,
+    }
 
     def __init__(self, config_path: str | Path = "settings.json"):
         """
@@ -52,51 +146,103 @@ class EyeTracker:
         Args:
             config_path: Đường dẫn đến file cấu hình
         """
-        self.cfg = get_config(str(config_path))
+        self._config_name = str(config_path)
+        self.cfg = get_config(self._config_name)
         health_cfg = self.cfg.get("health_monitoring", {})
 
         if not health_cfg:
             raise ValueError("Invalid config: 'health_monitoring' section not found")
 
-        # Khởi tạo MediaPipe Face Mesh với high precision
-        self._mp_face_mesh = mp.solutions.face_mesh
-        self._face_mesh = self._mp_face_mesh.FaceMesh(
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=float(health_cfg["min_detection_confidence"]),
-            min_tracking_confidence=float(health_cfg["min_tracking_confidence"]),
-        )
+        # MediaPipe Face Mesh với high precision, dùng chung qua pool
+        self._face_mesh, self._face_mesh_lock = _FaceMeshPool.get((
+            True,
+            float(health_cfg["min_detection_confidence"]),
+            float(health_cfg["min_tracking_confidence"]),
+        ))
 
         # Camera configuration
         self._cap: Optional[cv2.VideoCapture] = None
         self._camera_idx = int(health_cfg.get("camera_index", 0))
         self._frame_rate = int(health_cfg.get("frame_rate", 30))
+        # FOURCC yêu cầu từ camera; MJPG cho FPS cao hơn ở độ phân giải lớn ("" = mặc định driver)
+        self._fourcc = str(health_cfg.get("camera_fourcc", "MJPG"))
 
-        # Threading và data
-        self._lock = threading.Lock()
+        # Threading và data: mỗi frame tạo dict kết quả mới và publish bằng một
+        # phép gán tham chiếu (single-slot SPSC, không cần lock)
         self._latest: Dict[str, Any] = {}
         self._running = False
+        self._workers: Tuple = ()  # Futures của capture/processing loop
 
         # Eye landmarks indices theo MediaPipe Face Mesh
         self._LEFT_EYE = health_cfg["LEFT_EYE"]
         self._RIGHT_EYE = health_cfg["RIGHT_EYE"]
         self._EPS = float(health_cfg["EPSILON"])
 
+        # Indices hai mắt gộp lại để gather landmarks trong một lần
+        self._EYE_IDX = tuple(self._LEFT_EYE) + tuple(self._RIGHT_EYE)
+        self._n_left = len(self._LEFT_EYE)
+        self._EYE_IDX_MAX = max(self._EYE_IDX)
+
+        # Scratch buffers cho điểm mắt, dùng xoay vòng giữa các frame để không
+        # cấp phát mới; kết quả đã publish giữ nguyên trong EYE_BUF_SLOTS - 1 frame
+        self._eye_bufs = [
+            np.empty((len(self._EYE_IDX), 2), dtype=np.float32) for _ in range(self._EYE_BUF_SLOTS)
+        ]
+        self._eye_buf_idx = 0
+
+        # Khi có Numba: toàn bộ face landmarks (pixel) decode từ protobuf vào buffer (N, 2)
+        # float32 xoay vòng cùng nhịp với scratch buffer điểm mắt; điểm mắt gather từ đó
+        self._eye_idx_arr = np.asarray(self._EYE_IDX, dtype=np.intp)
+        self._lm_raw: Optional[np.ndarray] = None
+        self._lm_bufs: Optional[List[np.ndarray]] = None
+        if _eye_kernels.NUMBA_AVAILABLE:
+            self._lm_raw = np.empty((self._MAX_LANDMARKS, 2), dtype=np.uint32)
+            self._lm_bufs = [
+                np.empty((self._MAX_LANDMARKS, 2), dtype=np.float32) for _ in range(self._EYE_BUF_SLOTS)
+            ]
+
+        # Biên dịch trước các kernel Numba (nếu có) để frame đầu không bị trễ
+        _eye_kernels.warmup()
+
         # Camera calibration parameters for distance estimation
         self._focal_length = float(health_cfg.get("camera_focal_length", 600))
         self._avg_eye_distance_cm = float(health_cfg.get("AVERAGE_EYE_DISTANCE_CM", 6.3))
         self._min_distance_cm = float(health_cfg.get("MIN_REASONABLE_DISTANCE", 20.0))
         self._max_distance_cm = float(health_cfg.get("MAX_REASONABLE_DISTANCE", 150.0))
+        # Tử số cố định của công thức khoảng cách (pinhole model)
+        self._distance_numer = self._avg_eye_distance_cm * self._focal_length
         # Frame buffer cho debugging
         self.f = None
+        # Buffer RGB dùng lại giữa các frame cho MediaPipe (cấp phát khi có frame đầu)
+        self._rgb_buf: Optional[np.ndarray] = None
+
+        # Tiền xử lý (BGR → RGB/Gray) trên GPU nếu OpenCV có CUDA
+        self._use_cuda = bool(health_cfg.get("use_cuda", True)) and _cuda_device_available()
+        self._gpu = None  # (stream, gpu_bgr, gpu_rgb, gpu_gray), tạo ở frame đầu
+        self._gray_buf: Optional[np.ndarray] = None
+
+        # Hàng đợi frame giữa capture thread và processing thread; đọc camera chạy
+        # song song với MediaPipe. batch_size=1 chỉ giữ frame mới nhất (low latency)
+        self._batch_size = max(1, int(health_cfg.get("batch_size", 1)))
+        self._frame_q: deque = deque(maxlen=self._batch_size)
+        self._frame_ready = threading.Event()
+        self._processing = False  # Processing thread đang chạy MediaPipe
+
+        # Chỉ chạy MediaPipe cho 1 trong mỗi N frame; low_latency bỏ các frame
+        # đã nằm sẵn trong buffer driver để luôn xử lý frame mới nhất
+        self._inference_interval = max(1, int(health_cfg.get("inference_interval", 1)))
+        self._low_latency = bool(health_cfg.get("low_latency", False))
+
+        # Buffer EAR samples cho calibration, được processing thread ghi trực tiếp
+        self._ear_samples: Optional[np.ndarray] = None
+        self._ear_sample_count = 0
 
     def start(self) -> None:
         """
         Bắt đầu tracking mắt
 
         - Mở camera theo cấu hình
-        - Khởi tạo thread processing
-        - Bắt đầu capture loop
+        - Bắt đầu capture loop và processing loop trên hai thread
 
         Raises:
             RuntimeError: Nếu không thể mở camera
@@ -109,18 +255,26 @@ class EyeTracker:
         if not self._cap.isOpened():
             raise RuntimeError(f"Không thể mở camera {self._camera_idx}")
 
-        # Cấu hình FPS
+        # Cấu hình định dạng nén (bỏ qua nếu camera không hỗ trợ) và FPS
+        if len(self._fourcc) == 4:
+            self._cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self._fourcc))
         self._cap.set(cv2.CAP_PROP_FPS, self._frame_rate)
+        # Giữ tối đa 1 frame trong buffer driver để frame không bị tồn đọng
+        self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
-        # Bắt đầu processing
+        # Bắt đầu capture và processing
         self._running = True
-        EyeTracker._executor.submit(self._capture_loop)
+        self._frame_q.clear()
+        self._workers = (
+            EyeTracker._executor.submit(self._capture_loop),
+            EyeTracker._executor.submit(self._process_loop),
+        )
 
     def stop(self) -> None:
         """
         Dừng tracking mắt
 
-        - Dừng processing thread
+        - Dừng và đợi capture/processing thread thoát
         - Giải phóng camera
         - Đóng MediaPipe resources
         """
@@ -128,49 +282,164 @@ class EyeTracker:
             return
 
         self._running = False
+        self._frame_ready.set()
+
+        # Đợi các loop thoát trước khi giải phóng camera/MediaPipe
+        for future in self._workers:
+            try:
+                future.result(timeout=2.0)
+            except Exception:
+                pass
+        self._workers = ()
+
         self._cleanup()
 
-    def get_frame(self) -> Optional[np.ndarray]:
+    def close(self) -> None:
+        """
+        Giải phóng toàn bộ resources (camera, threads, MediaPipe)
+
+        Nên gọi explicit hoặc dùng EyeTracker như context manager:
+            >>> with EyeTracker() as tracker:
+            ...     tracker.start()
+        """
+        self.stop()
+
+    def __enter__(self) -> "EyeTracker":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def get_frame(self, copy: bool = False) -> Optional[np.ndarray]:
         """
         Lấy frame mới nhất từ camera
 
+        Frame được chia sẻ với processing thread và phải được coi là read-only;
+        truyền copy=True nếu cần vẽ/sửa trực tiếp lên frame.
+
+        Args:
+            copy: Trả về bản copy thay vì tham chiếu
+
         Returns:
             np.ndarray: Frame hiện tại hoặc None nếu chưa có
         """
-        return self.f
+        frame = self.f
+        if copy and frame is not None:
+            return frame.copy()
+        return frame
 
     def get_latest(self) -> Dict[str, Any]:
         """
         Lấy dữ liệu processing mới nhất với thread safety
 
+        Dict kết quả không bao giờ bị sửa sau khi publish nên được trả về trực
+        tiếp; caller phải coi nó là read-only. Các array left_eye/right_eye và
+        landmarks_px là view vào scratch buffer dùng xoay vòng, caller cần
+        .copy() nếu muốn giữ lâu hơn vài frame.
+
         Returns:
-            Dict: Copy của dữ liệu mới nhất
+            Dict: Dữ liệu mới nhất
         """
-        with self._lock:
-            return self._latest.copy()
+        return self._latest
 
     def _capture_loop(self) -> None:
         """
-        Main capture loop - chạy trong thread riêng
+        Capture loop - chạy trong thread riêng
 
-        - Đọc frame từ camera
-        - Xử lý với MediaPipe
-        - Lưu trữ kết quả với thread safety
+        - grab() liên tục để buffer driver không tồn đọng frame cũ
+        - Chỉ retrieve() (decode) khi processing thread sẵn sàng nhận frame
+        - Publish frame mới nhất cho display
+        - Đưa frame vào hàng đợi cho processing thread
         """
-        while self._running and self._cap and self._cap.isOpened():
-            ret, frame = self._cap.read()
+        cap = self._cap
+        frame_q = self._frame_q
+        counter = 0
+        while self._running and cap.isOpened():
+            ok = self._grab_fresh() if self._low_latency else cap.grab()
+            if not ok:
+                continue
+
+            # Processing đang bận và không còn chỗ trong hàng đợi: bỏ frame này
+            # mà không decode, frame tiếp theo sẽ mới hơn
+            if len(frame_q) >= frame_q.maxlen or (frame_q.maxlen == 1 and self._processing):
+                continue
+
+            ret, frame = cap.retrieve()
             if not ret or frame is None:
                 continue
 
-            # Lưu frame gốc cho debugging
-            self.f = frame.copy()
+            # Publish frame mới bằng tham chiếu (retrieve() luôn trả về array mới,
+            # gán tham chiếu là atomic nên không cần copy)
+            self.f = frame
+
+            # Frame bị bỏ qua chỉ được publish cho display, không chạy MediaPipe
+            counter += 1
+            if counter % self._inference_interval:
+                continue
+
+            # Hàng đợi có giới hạn: frame cũ nhất tự bị loại khi đầy
+            frame_q.append(frame)
+            self._frame_ready.set()
 
-            # Xử lý frame
-            data = self._process_frame(frame)
+        # Đánh thức processing thread để nó thoát
+        self._frame_ready.set()
 
-            # Thread-safe update
-            with self._lock:
-                self._latest = data
+    def _grab_fresh(self, max_drain: int = 4) -> bool:
+        """
+        Grab frame mới nhất, bỏ qua các frame đã nằm sẵn trong buffer driver
+
+        grab() trả về gần như ngay lập tức khi frame đã có sẵn trong buffer;
+        tiếp tục grab cho tới khi phải chờ frame mới (hoặc đạt max_drain).
+
+        Args:
+            max_drain: Số frame tối đa được bỏ qua mỗi lần grab
+
+        Returns:
+            bool: True nếu grab thành công
+        """
+        cap = self._cap
+        for _ in range(max_drain + 1):
+            t0 = time.perf_counter()
+            if not cap.grab():
+                return False
+            if time.perf_counter() - t0 > 0.005:  # Phải chờ → đây là frame mới
+                break
+        return True
+
+    def _process_loop(self) -> None:
+        """
+        Processing loop - chạy trong thread riêng
+
+        - Lấy lần lượt các frame trong hàng đợi
+        - Xử lý với MediaPipe
+        - Publish kết quả
+        """
+        frame_q = self._frame_q
+        while self._running:
+            try:
+                frame = frame_q.popleft()
+            except IndexError:
+                self._frame_ready.wait(0.1)
+                self._frame_ready.clear()
+                continue
+
+            self._processing = True
+            try:
+                data = self._process_frame(frame)
+            finally:
+                self._processing = False
+
+            # Publish kết quả (gán tham chiếu là atomic)
+            self._latest = data
+
+            # Ghi EAR sample nếu đang calibration
+            samples = self._ear_samples
+            if samples is not None:
+                avg_ear = data["avg_ear"]
+                n = self._ear_sample_count
+                if avg_ear is not None and avg_ear > 0 and n < samples.shape[0]:
+                    samples[n] = avg_ear
+                    self._ear_sample_count = n + 1
 
     def _process_frame(self, frame: np.ndarray) -> Dict[str, Any]:
         """
@@ -189,56 +458,75 @@ class EyeTracker:
         """
         start_time = time.perf_counter()
 
-        # Chuyển đổi sang RGB cho MediaPipe
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        rgb.flags.writeable = False
-        results = self._face_mesh.process(rgb)
-        rgb.flags.writeable = True
+        # Chuyển đổi sang RGB cho MediaPipe (kèm grayscale nếu chạy trên GPU)
+        gray = None
+        if self._use_cuda:
+            try:
+                rgb, gray = self._to_rgb_gray_cuda(frame)
+            except cv2.error:
+                # Lỗi CUDA runtime → chuyển hẳn sang CPU
+                self._use_cuda = False
+                rgb = self._to_rgb(frame)
+        else:
+            rgb = self._to_rgb(frame)
+        with self._face_mesh_lock:
+            results = self._face_mesh.process(rgb)
 
         h, w, _ = frame.shape
 
         # Output structure
-        out = {
-            "frame": frame,
-            "landmarks": None,
-            "left_eye": None,
-            "right_eye": None,
-            "gaze_point": None,
-            "left_ear": None,
-            "right_ear": None,
-            "avg_ear": None,
-            "left_contrast": None,
-            "right_contrast": None,
-            "avg_contrast": None,
-            "distance_cm": None,
-            "timestamp": time.time(),
-            "proc_ms": 0.0,
-        }
+        out = self._OUT_TEMPLATE.copy()
+        out["frame"] = frame
+        out["timestamp"] = time.time()
 
         if results.multi_face_landmarks:
-            lm = results.multi_face_landmarks[0].landmark
-
-            # Trích xuất landmarks cho mắt
-            l_pts = np.array([(lm[i].x * w, lm[i].y * h) for i in self._LEFT_EYE])
-            r_pts = np.array([(lm[i].x * w, lm[i].y * h) for i in self._RIGHT_EYE])
+            face = results.multi_face_landmarks[0]
+            lm = face.landmark
+
+            # Trích xuất landmarks cho cả hai mắt (theo pixel) vào scratch buffer kế tiếp
+            self._eye_buf_idx = (self._eye_buf_idx + 1) % self._EYE_BUF_SLOTS
+            pts = self._eye_bufs[self._eye_buf_idx]
+            lm_px = None
+            if self._lm_bufs is not None:
+                # Decode toàn bộ landmarks từ bytes đã serialize trong một lần gọi kernel
+                # thay vì đọc x/y của từng object protobuf, rồi gather điểm mắt
+                lm_px = self._lm_bufs[self._eye_buf_idx]
+                n = _eye_kernels.landmarks_px(
+                    np.frombuffer(face.SerializeToString(), dtype=np.uint8),
+                    float(w), float(h), self._lm_raw, lm_px,
+                )
+                lm_px = lm_px[:n]
+                if n > self._EYE_IDX_MAX:
+                    np.take(lm_px, self._eye_idx_arr, axis=0, out=pts)
+                else:
+                    lm_px = None
+            if lm_px is None:
+                for k, i in enumerate(self._EYE_IDX):
+                    p = lm[i]
+                    pts[k, 0] = p.x * w
+                    pts[k, 1] = p.y * h
+            l_pts = pts[:self._n_left]
+            r_pts = pts[self._n_left:]
 
             # Lưu landmarks
             out["landmarks"] = lm
+            out["landmarks_px"] = lm_px
             out["left_eye"] = l_pts
             out["right_eye"] = r_pts
 
             # Tính Eye Aspect Ratio (EAR)
-            left_ear = self._calculate_ear(l_pts)
-            right_ear = self._calculate_ear(r_pts)
+            left_ear, right_ear = self._calculate_ear_pair(pts)
             avg_ear = (left_ear + right_ear) / 2.0
 
             out["left_ear"] = left_ear
             out["right_ear"] = right_ear
             out["avg_ear"] = avg_ear
 
-            # Phân tích độ tương phản vùng mắt
-            left_contrast = self._calculate_eye_contrast(frame, l_pts)
-            right_contrast = self._calculate_eye_contrast(frame, r_pts)
+            # Phân tích độ tương phản vùng mắt trên ảnh grayscale (chuyển đổi một lần)
+            if gray is None:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            left_contrast = self._calculate_eye_contrast(gray, l_pts)
+            right_contrast = self._calculate_eye_contrast(gray, r_pts)
             avg_contrast = (left_contrast + right_contrast) / 2.0
 
             out["left_contrast"] = left_contrast
@@ -246,10 +534,14 @@ class EyeTracker:
             out["avg_contrast"] = avg_contrast
 
             # Ước tính khoảng cách đến camera
-            eye_distance_px = np.linalg.norm(l_pts[0] - r_pts[0])
+            eye_distance_px = math.hypot(l_pts[0, 0] - r_pts[0, 0], l_pts[0, 1] - r_pts[0, 1])
             if eye_distance_px > 30:  # Minimum reasonable pixel distance
-                distance_cm = (self._avg_eye_distance_cm * self._focal_length) / eye_distance_px
-                distance_cm = np.clip(distance_cm, self._min_distance_cm, self._max_distance_cm)  # Reasonable range
+                distance_cm = self._distance_numer / eye_distance_px
+                # Reasonable range
+                if distance_cm < self._min_distance_cm:
+                    distance_cm = self._min_distance_cm
+                elif distance_cm > self._max_distance_cm:
+                    distance_cm = self._max_distance_cm
                 out["distance_cm"] = distance_cm
 
             # Gaze point estimation (simplified - center of eyes)
@@ -262,6 +554,56 @@ class EyeTracker:
 
         return out
 
+    def _to_rgb(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Chuyển BGR → RGB vào buffer dùng lại thay vì cấp phát frame mới mỗi lần
+
+        Buffer được cấp phát lại nếu camera đổi độ phân giải.
+
+        Args:
+            frame: Input frame BGR
+
+        Returns:
+            np.ndarray: Buffer RGB (read-only cho tới lần gọi tiếp theo)
+        """
+        buf = self._rgb_buf
+        if buf is None or buf.shape != frame.shape or buf.dtype != frame.dtype:
+            buf = self._rgb_buf = np.empty_like(frame)
+        buf.flags.writeable = True
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=buf)
+        buf.flags.writeable = False
+        return buf
+
+    def _to_rgb_gray_cuda(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Upload frame lên GPU một lần rồi tạo cả bản RGB (cho MediaPipe) và
+        grayscale (cho contrast) trên cùng một CUDA stream
+
+        Args:
+            frame: Input frame BGR
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (rgb, gray) trong các buffer dùng lại
+        """
+        if self._gpu is None:
+            self._gpu = (cv2.cuda_Stream(), cv2.cuda_GpuMat(), cv2.cuda_GpuMat(), cv2.cuda_GpuMat())
+        stream, gpu_bgr, gpu_rgb, gpu_gray = self._gpu
+
+        rgb_buf = self._rgb_buf
+        if rgb_buf is None or rgb_buf.shape != frame.shape or self._gray_buf is None:
+            rgb_buf = self._rgb_buf = np.empty_like(frame)
+            self._gray_buf = np.empty(frame.shape[:2], dtype=np.uint8)
+
+        gpu_bgr.upload(frame, stream)
+        cv2.cuda.cvtColor(gpu_bgr, cv2.COLOR_BGR2RGB, gpu_rgb, stream=stream)
+        cv2.cuda.cvtColor(gpu_bgr, cv2.COLOR_BGR2GRAY, gpu_gray, stream=stream)
+        rgb_buf.flags.writeable = True
+        gpu_rgb.download(stream, rgb_buf)
+        gpu_gray.download(stream, self._gray_buf)
+        stream.waitForCompletion()
+        rgb_buf.flags.writeable = False
+        return rgb_buf, self._gray_buf
+
     def _calculate_ear(self, eye_pts: np.ndarray) -> float:
         """
         Tính Eye Aspect Ratio (EAR)
@@ -277,26 +619,37 @@ class EyeTracker:
         if len(eye_pts) != 6:
             return 0.0
 
-        # Vertical distances
-        vert1 = np.linalg.norm(eye_pts[1] - eye_pts[5])  # p3-p5
-        vert2 = np.linalg.norm(eye_pts[2] - eye_pts[4])  # p2-p6
+        # EAR calculation with epsilon to avoid division by zero
+        return float(ear6(eye_pts, self._EPS))
 
-        # Horizontal distance
-        horiz = np.linalg.norm(eye_pts[0] - eye_pts[3])  # p1-p4
+    def _calculate_ear_pair(self, pts: np.ndarray) -> Tuple[float, float]:
+        """
+        Tính EAR cho cả hai mắt trong một phép tính vectorized
 
-        # EAR calculation with epsilon to avoid division by zero
-        ear = (vert1 + vert2) / (2.0 * horiz + self._EPS)
+        Args:
+            pts: Landmarks hai mắt (6 điểm mắt trái rồi 6 điểm mắt phải)
 
-        return ear
+        Returns:
+            Tuple[float, float]: (left_ear, right_ear)
+        """
+        if pts.shape[0] != 12 or self._n_left != 6 or _eye_kernels.NUMBA_AVAILABLE:
+            # Kernel native nhanh hơn einsum với array nhỏ như vậy
+            return self._calculate_ear(pts[:self._n_left]), self._calculate_ear(pts[self._n_left:])
+
+        eyes = pts.reshape(2, 6, 2)
+        d = eyes[:, self._EAR_FROM, :] - eyes[:, self._EAR_TO, :]
+        dist = np.sqrt(np.einsum('ijk,ijk->ij', d, d))  # (2, 3): vert1, vert2, horiz
+        ear = (dist[:, 0] + dist[:, 1]) / (2.0 * dist[:, 2] + self._EPS)
+        return float(ear[0]), float(ear[1])
 
-    def _calculate_eye_contrast(self, frame: np.ndarray, eye_pts: np.ndarray) -> float:
+    def _calculate_eye_contrast(self, gray: np.ndarray, eye_pts: np.ndarray) -> float:
         """
         Tính độ tương phản của vùng mắt để đánh giá mắt mở
 
         Sử dụng standard deviation của grayscale values trong ROI mắt
 
         Args:
-            frame: Input frame BGR
+            gray: Frame grayscale (H, W)
             eye_pts: 6 eye landmarks
 
         Returns:
@@ -315,21 +668,12 @@ class EyeTracker:
         # Padding để đảm bảo lấy đủ vùng mắt
         padding = 5
         x_min = max(0, x_min - padding)
-        x_max = min(frame.shape[1], x_max + padding)
+        x_max = min(gray.shape[1], x_max + padding)
         y_min = max(0, y_min - padding)
-        y_max = min(frame.shape[0], y_max + padding)
-
-        # Trích xuất ROI và chuyển sang grayscale
-        roi = frame[y_min:y_max, x_min:x_max]
-        if roi.size == 0:
-            return 0.0
-
-        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+        y_max = min(gray.shape[0], y_max + padding)
 
-        # Tính standard deviation là measure của contrast
-        contrast = float(np.std(gray))
-
-        return contrast
+        # Standard deviation của grayscale ROI là measure của contrast
+        return float(roi_std_u8(gray, x_min, x_max, y_min, y_max))
 
     def _cleanup(self) -> None:
         """
@@ -338,9 +682,7 @@ class EyeTracker:
         if self._cap:
             self._cap.release()
             self._cap = None
-
-        if self._face_mesh:
-            self._face_mesh.close()
+        # Face Mesh thuộc _FaceMeshPool nên không close ở đây
 
     def calibrate_ear_thresholds(self, calibration_duration: float = 10.0) -> dict[str, Any]:
         """
@@ -358,9 +700,6 @@ class EyeTracker:
         Returns:
             Dict: Ket qua calibration voi thresholds moi
         """
-        import json
-        from pathlib import Path
-
         if not self._running:
             print("Khoi tao eye tracker truoc...")
             self.start()
@@ -368,78 +707,36 @@ class EyeTracker:
         print(f"Bat dau EAR calibration trong {calibration_duration} giay...")
         print("Vui long nhin thang vao camera va nhem mat binh thuong")
 
-        # Thu thap EAR samples
-        ear_samples = []
-        start_time = time.time()
-        frame_count = 0
-
-        while time.time() - start_time < calibration_duration:
-            data = self.get_latest()
-            avg_ear = data.get("avg_ear")
-
-            if avg_ear is not None and avg_ear > 0:
-                ear_samples.append(avg_ear)
-                frame_count += 1
-
-            # Progress indicator
-            elapsed = time.time() - start_time
-            remaining = calibration_duration - elapsed
-            if frame_count % 10 == 0:
-                print(f"Dang calibrate... {remaining:.1f}s con lai, samples: {len(ear_samples)}")
-
-            time.sleep(0.033)  # ~30 FPS
-
-        if len(ear_samples) < 50:
+        # Thu thap EAR samples: processing thread ghi thang vao buffer float32
+        self._ear_sample_count = 0
+        self._ear_samples = np.empty(int(calibration_duration * self._frame_rate * 2) + 1, dtype=np.float32)
+        try:
+            time.sleep(calibration_duration)
+        finally:
+            samples = self._ear_samples
+            count = self._ear_sample_count
+            self._ear_samples = None
+        ear_array = samples[:count]
+
+        if count < 50:
             return {
                 "success": False,
-                "error": f"Khong du samples ({len(ear_samples)} < 50). Vui long thu lai.",
-                "samples_collected": len(ear_samples)
+                "error": f"Khong du samples ({count} < 50). Vui long thu lai.",
+                "samples_collected": count
             }
 
-        # Chuyen doi thanh numpy array
-        ear_array = np.array(ear_samples)
-
-        # Loai bo outliers bang IQR method
-        q1 = np.percentile(ear_array, 25)
-        q3 = np.percentile(ear_array, 75)
-        iqr = q3 - q1
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
-
-        # Giu lai chi cac EAR "binh thuong" (khong nhay mat)
-        normal_ears = ear_array[(ear_array >= lower_bound) & (ear_array <= upper_bound)]
-
-        if len(normal_ears) < 30:
-            # Fallback: dung standard deviation rejection
-            mean_ear = np.mean(ear_array)
-            std_ear = np.std(ear_array)
-            normal_ears = ear_array[np.abs(ear_array - mean_ear) <= 2 * std_ear]
-
-        # Tinh statistics
-        baseline_mean = float(np.mean(normal_ears))
-        baseline_std = float(np.std(normal_ears))
-
-        # Tinh personalized thresholds
-        # BLINK_THRESHOLD: baseline_mean - 1.5*std (khi mat bat dau nhem)
-        personalized_blink_threshold = baseline_mean - (1.5 * baseline_std)
-
-        # DROWSY_THRESHOLD: baseline_mean - 0.8*std (khi mat bat dau met)
-        personalized_drowsy_threshold = baseline_mean - (0.8 * baseline_std)
-
-        # Dam bao thresholds trong khoang hop ly
-        personalized_blink_threshold = np.clip(personalized_blink_threshold, 0.15, 0.35)
-        personalized_drowsy_threshold = np.clip(personalized_drowsy_threshold, 0.20, 0.40)
-
-        # Dam bao drowsy threshold >= blink threshold
-        if personalized_drowsy_threshold < personalized_blink_threshold:
-            personalized_drowsy_threshold = personalized_blink_threshold + 0.03
+        # Loai bo outliers (IQR) va tinh personalized thresholds:
+        # BLINK = mean - 1.5*std (khi mat bat dau nhem), DROWSY = mean - 0.8*std (khi mat bat dau met)
+        (personalized_blink_threshold, personalized_drowsy_threshold,
+         baseline_mean, baseline_std, n_used) = _eye_kernels.ear_thresholds(ear_array)
+        n_used = int(n_used)
 
         # Update settings.json
-        config_path = Path(__file__).parent.parent / "config" / "settings.json"
+        config_path = CONFIG_DIR / self._config_name
 
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            # Lấy config hiện tại từ cache (chỉ parse lại nếu file đã bị sửa ở nơi khác)
+            config = get_config(self._config_name)
 
             # Update thresholds
             config["health_monitoring"]["BLINK_THRESHOLD"] = round(personalized_blink_threshold, 3)
@@ -451,13 +748,16 @@ class EyeTracker:
                 "calibration_timestamp": time.time(),
                 "baseline_ear_mean": round(baseline_mean, 3),
                 "baseline_ear_std": round(baseline_std, 3),
-                "samples_used": len(normal_ears),
-                "samples_total": len(ear_samples)
+                "samples_used": n_used,
+                "samples_total": count
             }
 
-            # Save updated config
-            with open(config_path, 'w', encoding='utf-8') as f:
+            # Save updated config: ghi file tạm rồi os.replace để không bao giờ
+            # để lại settings.json ghi dở
+            tmp_path = config_path.with_name(config_path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, config_path)
 
             # Cap nhat internal config
             self.cfg = config
@@ -466,7 +766,7 @@ class EyeTracker:
             print(f"   Baseline EAR: {baseline_mean:.3f} ± {baseline_std:.3f}")
             print(f"   Blink Threshold: {personalized_blink_threshold:.3f}")
             print(f"   Drowsy Threshold: {personalized_drowsy_threshold:.3f}")
-            print(f"   Samples su dung: {len(normal_ears)}/{len(ear_samples)}")
+            print(f"   Samples su dung: {n_used}/{count}")
 
             return {
                 "success": True,
@@ -474,8 +774,8 @@ class EyeTracker:
                 "baseline_std": baseline_std,
                 "blink_threshold": personalized_blink_threshold,
                 "drowsy_threshold": personalized_drowsy_threshold,
-                "samples_used": len(normal_ears),
-                "samples_total": len(ear_samples),
+                "samples_used": n_used,
+                "samples_total": count,
                 "config_updated": True
             }
 
@@ -493,6 +793,10 @@ class EyeTracker:
 
     def __del__(self):
         """
-        Destructor - dam bao cleanup
+        Destructor - chi canh bao neu chua close()
+
+        Khong cleanup o day: __del__ co the chay tren thread bat ky hoac luc
+        interpreter shutdown va tranh chap voi destructor C++ cua MediaPipe.
         """
-        self.stop()
\ No newline at end of file
+        if getattr(self, "_running", False):
+            warnings.warn("EyeTracker was not closed; call close() or stop()", ResourceWarning, stacklevel=2)
\ No newline at end of file
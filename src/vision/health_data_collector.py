@@ -11,14 +11,29 @@ Module này cung cấp các chức năng:
 from __future__ import annotations
 import time
 import uuid
+import atexit
 import logging
+import weakref
 from datetime import datetime
 from typing import Dict, Any, Optional
 
-from utils import ExecutorService, append_csv_row, DATA_DIR
+from utils import ExecutorService, CsvRowLogger, DATA_DIR
 
 logger = logging.getLogger(__name__)
 
+# Realtime loggers của các collector còn sống: hook atexit duy nhất ghi nốt buffer
+# của những collector chưa stop_collection, không giữ collector sống tới lúc thoát
+_rt_loggers: weakref.WeakSet = weakref.WeakSet()
+
+
+def _close_rt_loggers() -> None:
+    """Ghi nốt và đóng các realtime CSV còn mở khi interpreter thoát"""
+    for rt_logger in list(_rt_loggers):
+        rt_logger.close()
+
+
+atexit.register(_close_rt_loggers)
+
 
 class HealthDataCollector:
     """
@@ -54,6 +69,10 @@ class HealthDataCollector:
 
         self.data_dir = DATA_DIR
         self.rt_csv_path = None
+        # Realtime CSV chỉ có 1 row / giây: gom ~30 rows (~30 giây) mỗi lần ghi thay vì
+        # flush mỗi giây như logger dùng chung; phần còn lại được ghi khi stop_collection
+        self._rt_logger = CsvRowLogger(flush_rows=30, flush_interval=30.0)
+        _rt_loggers.add(self._rt_logger)
         self.summary_csv_path = self.data_dir / "summary.csv"
 
         self._running = False
@@ -93,7 +112,7 @@ class HealthDataCollector:
             'shoulder_tilt', 'head_pitch', 'head_yaw',
             'drowsiness_detected', 'posture_status'
         ]
-        append_csv_row({h: None for h in realtime_headers}, self.rt_csv_path, realtime_headers)
+        self._rt_logger.append(self.rt_csv_path, {h: None for h in realtime_headers}, realtime_headers)
 
         # Bắt đầu collection loop
         self._future = self.executor.submit(self._loop)
@@ -118,6 +137,10 @@ class HealthDataCollector:
             except Exception as e:
                 logger.error("Error stopping collection: %s", e)
 
+        # Ghi nốt các rows còn trong buffer và đóng file realtime
+        if self.rt_csv_path:
+            self._rt_logger.close(self.rt_csv_path)
+
         # Ghi summary khi kết thúc
         self._write_summary()
         logger.info("HealthDataCollector stopped (session: %s)", self.session_id)
@@ -247,7 +270,7 @@ class HealthDataCollector:
 
                 # Ghi vào CSV file
                 if self.rt_csv_path and data_row:
-                    append_csv_row(data_row, str(self.rt_csv_path))
+                    self._rt_logger.append(self.rt_csv_path, data_row)
                     self.total_records += 1
 
                 # Sleep để maintain collect_interval
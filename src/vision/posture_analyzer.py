@@ -9,14 +9,68 @@ Module này cung cấp các chức năng:
 """
 
 from __future__ import annotations
+import os
 import time
 import cv2
 import numpy as np
-from collections import deque
+from operator import itemgetter
 from typing import Dict, Any, Optional, Tuple
 
 import mediapipe as mp
-from utils import get_config, get_camera_calibration
+from utils import get_config, get_camera_calibration, CONFIG_DIR
+from vision import _posture_kernels
+from vision._pose_onnx import create_onnx_pose
+from vision._posture_kernels import posture_math
+
+
+# Chỉ số PoseLandmark dạng int, tra enum một lần khi import thay vì mỗi frame
+_L = mp.solutions.pose.PoseLandmark
+IDX_LEFT_EYE = _L.LEFT_EYE.value
+IDX_RIGHT_EYE = _L.RIGHT_EYE.value
+IDX_LEFT_SHOULDER = _L.LEFT_SHOULDER.value
+IDX_RIGHT_SHOULDER = _L.RIGHT_SHOULDER.value
+IDX_NOSE = _L.NOSE.value
+del _L
+
+# Lấy 5 landmarks cần dùng theo thứ tự: mắt trái, mắt phải, vai trái, vai phải, mũi
+_key_landmarks = itemgetter(IDX_LEFT_EYE, IDX_RIGHT_EYE, IDX_LEFT_SHOULDER, IDX_RIGHT_SHOULDER, IDX_NOSE)
+
+
+class _RunningMean:
+    """
+    Moving average O(1) trên ring buffer cố định với tổng chạy (running sum)
+
+    Thay cho deque + np.mean: không cấp phát node/array mới mỗi frame.
+    """
+
+    __slots__ = ("_buf", "_idx", "_count", "_sum", "_maxlen")
+
+    def __init__(self, maxlen: int):
+        self._maxlen = maxlen
+        # float64 để phép trừ giá trị cũ khỏi tổng chạy là chính xác, tránh drift
+        self._buf = np.zeros(maxlen, dtype=np.float64)
+        self._idx = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def append(self, value: float) -> None:
+        """Thêm giá trị mới, đẩy giá trị cũ nhất ra khi buffer đầy"""
+        idx = self._idx
+        value = float(value)
+        self._sum += value - float(self._buf[idx])
+        self._buf[idx] = value
+        self._idx = (idx + 1) % self._maxlen
+        if self._count < self._maxlen:
+            self._count += 1
+
+    def mean(self) -> Optional[float]:
+        """Trung bình các giá trị trong cửa sổ, None nếu chưa có giá trị nào"""
+        if self._count == 0:
+            return None
+        return self._sum / self._count
+
+    def __len__(self) -> int:
+        return self._count
 
 
 class PostureAnalyzer:
@@ -30,7 +84,7 @@ class PostureAnalyzer:
     - Phân loại chất lượng tư thế
 
     Attributes:
-        _pose: MediaPipe Pose object
+        _pose: MediaPipe Pose object hoặc OnnxPose (INT8) nếu cấu hình pose_onnx_model
         _focal: Camera focal length
         _avg_eye_cm: Khoảng cách trung bình giữa 2 mắt (cm)
         _yaw_filter/_pitch_filter/_shoulder_filter: Moving average filters
@@ -50,12 +104,21 @@ class PostureAnalyzer:
         if not health_cfg:
             raise ValueError("Invalid config: 'health_monitoring' section not found")
 
-        # Khởi tạo MediaPipe Pose
+        # Khởi tạo pose backend: ONNX Runtime INT8 nếu có model, ngược lại MediaPipe Pose
         self._mp_pose = mp.solutions.pose
-        self._pose = self._mp_pose.Pose(
-            min_detection_confidence=float(health_cfg["pose_detection_confidence"]),
-            min_tracking_confidence=float(health_cfg["pose_tracking_confidence"]),
+        onnx_model = health_cfg.get("pose_onnx_model")
+        if onnx_model and not os.path.isabs(onnx_model):
+            onnx_model = str(CONFIG_DIR.parent / onnx_model)
+        self._pose = create_onnx_pose(
+            onnx_model,
+            float(health_cfg["pose_detection_confidence"]),
+            health_cfg.get("pose_onnx_keypoints"),
         )
+        if self._pose is None:
+            self._pose = self._mp_pose.Pose(
+                min_detection_confidence=float(health_cfg["pose_detection_confidence"]),
+                min_tracking_confidence=float(health_cfg["pose_tracking_confidence"]),
+            )
 
         # Cấu hình camera và đo lường
         self._focal = float(health_cfg["camera_focal_length"] or get_camera_calibration()["focal_length"])
@@ -70,11 +133,38 @@ class PostureAnalyzer:
         self._max_head_pitch = float(health_cfg["max_head_updown_angle"])  # Góc nghiêng đầu lên/xuống
         self._max_shoulder_tilt = float(health_cfg["max_shoulder_tilt"])   # Góc nghiêng vai
 
+        # Tất cả ngưỡng góc trong một tuple để unpack một lần mỗi frame
+        self._posture_limits = (self._max_head_yaw, self._max_head_pitch, self._max_shoulder_tilt)
+
+        # Biên dịch trước kernel tính góc/khoảng cách (nếu có Numba)
+        _posture_kernels.warmup()
+
         # Moving average filters để giảm nhiễu
-        self._yaw_filter = deque(maxlen=5)
-        self._pitch_filter = deque(maxlen=5)
-        self._shoulder_filter = deque(maxlen=5)
-        self._dist_filter = deque(maxlen=3)
+        self._yaw_filter = _RunningMean(5)
+        self._pitch_filter = _RunningMean(5)
+        self._shoulder_filter = _RunningMean(5)
+        self._dist_filter = _RunningMean(3)
+
+        # Cạnh dài tối đa của frame đưa vào pose model: landmark model chạy ở 256x256
+        # nên 256 là đủ; giữ tỉ lệ khung hình để góc atan2 không bị méo
+        self._pose_input_w = int(health_cfg.get("pose_input_width", 256))
+
+        # Buffer tái sử dụng giữa các frame (cấp phát lại khi đổi kích thước)
+        self._small_buf: Optional[np.ndarray] = None
+        self._rgb_buf: Optional[np.ndarray] = None
+
+        # Backend nhận thẳng frame BGR (OnnxPose) hay cần convert sang RGB (MediaPipe)
+        self._bgr_input = hasattr(self._pose, "process_bgr")
+
+        # Hệ số chuyển landmark chuẩn hóa sang pixel [w, h, w], cập nhật khi đổi kích thước frame
+        self._scale = np.ones(3, dtype=np.float32)
+        self._scale_wh: Tuple[int, int] = (0, 0)
+
+        # Bỏ qua pose inference khi frame gần như không đổi (tổng chênh lệch hash 16x16 < ngưỡng)
+        self._skip_threshold = int(health_cfg.get("pose_skip_threshold", 512))
+        self._last_hash: Optional[np.ndarray] = None
+        self._last_wh: Tuple[int, int] = (0, 0)
+        self._last_pts: Optional[np.ndarray] = None
 
         # Runtime state
         self._latest: Dict[str, Any] = {}
@@ -83,7 +173,7 @@ class PostureAnalyzer:
         """
         Phân tích tư thế từ frame ảnh
 
-        - Detect pose landmarks
+        - Detect pose landmarks (dùng lại kết quả cũ nếu frame gần như không đổi)
         - Tính toán các góc và khoảng cách
         - Áp dụng moving average filter
         - Phân loại chất lượng tư thế
@@ -104,60 +194,43 @@ class PostureAnalyzer:
 
         h, w = frame.shape[:2]
 
-        # Convert RGB cho MediaPipe
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        rgb.flags.writeable = False
-        results = self._pose.process(rgb)
-        rgb.flags.writeable = True
+        # Frame gần như không đổi so với lần inference trước: dùng lại landmarks,
+        # vẫn đưa qua filters để smoothing tiếp tục hoạt động
+        frame_hash = self._frame_hash(frame)
+        if (
+            self._last_hash is not None
+            and self._last_wh == (w, h)
+            and int(np.abs(frame_hash - self._last_hash).sum()) < self._skip_threshold
+        ):
+            pts = self._last_pts
+        else:
+            pts = self._detect_keypoints(frame, w, h)
+            self._last_hash = frame_hash
+            self._last_wh = (w, h)
+            self._last_pts = pts
 
         # Không detect được pose
-        if not results.pose_landmarks:
+        if pts is None:
             return self._empty_result()
 
-        lm = results.pose_landmarks.landmark
+        # Góc có dấu (đã chuẩn hóa về [-90, +90]) và khoảng cách trong một kernel:
+        # distance = (real_distance * focal_length) / pixel_distance, -1 nếu mắt quá nhỏ
+        yaw, pitch, shoulder_tilt, _, distance_cm = posture_math(
+            pts, self._focal, self._avg_eye_cm, self._min_eye_px, self._min_dist_cm, self._max_dist_cm
+        )
 
-        # Trích xuất key landmarks
-        left_eye = self._landmark_xyz(lm, mp.solutions.pose.PoseLandmark.LEFT_EYE, w, h)
-        right_eye = self._landmark_xyz(lm, mp.solutions.pose.PoseLandmark.RIGHT_EYE, w, h)
-        left_shoulder = self._landmark_xyz(lm, mp.solutions.pose.PoseLandmark.LEFT_SHOULDER, w, h)
-        right_shoulder = self._landmark_xyz(lm, mp.solutions.pose.PoseLandmark.RIGHT_SHOULDER, w, h)
-        nose = self._landmark_xyz(lm, mp.solutions.pose.PoseLandmark.NOSE, w, h)
-
-        # Tính toán các vector
-        eye_vec = right_eye[:2] - left_eye[:2]      # Vector từ mắt trái đến mắt phải
-        shoulder_vec = right_shoulder[:2] - left_shoulder[:2]  # Vector từ vai trái đến vai phải
-        head_vec = nose[:2] - (left_eye[:2] + right_eye[:2]) / 2  # Vector từ trung bình mắt đến mũi
-
-        # Tính góc
-        yaw = self._angle(eye_vec, (1, 0))           # Góc quay ngang đầu
-        pitch = self._angle(head_vec, (0, -1))       # Góc nghiêng đầu lên/xuống
-        shoulder_tilt = self._angle(shoulder_vec, (1, 0))  # Góc nghiêng vai
-
-        # Ước tính khoảng cách tới màn hình
-        eye_px = np.linalg.norm(right_eye[:2] - left_eye[:2])  # Khoảng cách mắt theo pixel
-        distance_cm = None
-        if eye_px >= self._min_eye_px:
-            # Công thức: distance = (real_distance * focal_length) / pixel_distance
-            distance_cm = (self._avg_eye_cm * self._focal) / eye_px
-            distance_cm = np.clip(distance_cm, self._min_dist_cm, self._max_dist_cm)
-
-        # Áp dụng moving average filter
+        # Áp dụng moving average filter trên góc đã chuẩn hóa (tránh lấy trung bình qua điểm ±180)
         self._yaw_filter.append(yaw)
         self._pitch_filter.append(pitch)
         self._shoulder_filter.append(shoulder_tilt)
-        if distance_cm is not None:
+        if distance_cm >= 0.0:
             self._dist_filter.append(distance_cm)
 
         # Lấy giá trị trung bình
-        yaw_f = np.mean(self._yaw_filter)
-        pitch_f = np.mean(self._pitch_filter)
-        shoulder_f = np.mean(self._shoulder_filter)
-        dist_f = np.mean(self._dist_filter) if self._dist_filter else None
-
-        # Chuẩn hóa góc về quanh 0 độ [-90, +90]
-        yaw_normalized = self._normalize_angle_to_zero(yaw_f)
-        pitch_normalized = self._normalize_angle_to_zero(pitch_f)
-        shoulder_normalized = self._normalize_angle_to_zero(shoulder_f)
+        yaw_normalized = self._yaw_filter.mean()
+        pitch_normalized = self._pitch_filter.mean()
+        shoulder_normalized = self._shoulder_filter.mean()
+        dist_f = self._dist_filter.mean()
 
         # Phân loại chất lượng tư thế (dùng góc đã chuẩn hóa)
         status = self._classify_normalized(yaw_normalized, pitch_normalized, shoulder_normalized, dist_f)
@@ -174,80 +247,112 @@ class PostureAnalyzer:
 
         return self._latest
 
-    def get_latest(self) -> Dict[str, Any]:
+    def _detect_keypoints(self, frame: np.ndarray, w: int, h: int) -> Optional[np.ndarray]:
         """
-        Lấy kết quả phân tích mới nhất
+        Chạy pose model và trích xuất 5 key landmarks theo pixel
+
+        Args:
+            frame: Input image frame (BGR)
+            w: Image width
+            h: Image height
 
         Returns:
-            Dict: Kết quả phân tích posture gần nhất
+            Optional[np.ndarray]: Array (5, 3) mắt trái, mắt phải, vai trái, vai phải, mũi;
+            None nếu không detect được pose
         """
-        if not self._latest or "timestamp" not in self._latest:
-            # Return empty result if no analysis has been run
-            return self._empty_result()
-        return self._latest.copy()
+        # Thu nhỏ trước khi convert: model pose tự resize về 256x256 nên frame lớn chỉ tốn băng thông.
+        # Landmarks chuẩn hóa 0-1 nên vẫn nhân với w, h của frame gốc.
+        src = frame
+        long_side = max(w, h)
+        if long_side > self._pose_input_w:
+            ratio = self._pose_input_w / long_side
+            small_shape = (max(1, int(round(h * ratio))), max(1, int(round(w * ratio)))) + frame.shape[2:]
+            if self._small_buf is None or self._small_buf.shape != small_shape:
+                self._small_buf = np.empty(small_shape, dtype=frame.dtype)
+            src = cv2.resize(frame, (small_shape[1], small_shape[0]), dst=self._small_buf,
+                             interpolation=cv2.INTER_AREA)
+
+        if self._bgr_input:
+            # Backend ONNX đảo kênh ngay trong bước chuẩn hóa tensor, không cần cvtColor
+            results = self._pose.process_bgr(src)
+        else:
+            # Convert RGB cho MediaPipe vào buffer tái sử dụng. Buffer C-contiguous và
+            # read-only để MediaPipe tham chiếu trực tiếp thay vì copy thêm một lần;
+            # view đảo kênh (frame[:, :, ::-1]) không liên tục nên MediaPipe luôn copy nó
+            if self._rgb_buf is None or self._rgb_buf.shape != src.shape:
+                self._rgb_buf = np.empty_like(src)
+            rgb = cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            rgb.flags.writeable = False
+            results = self._pose.process(rgb)
+            rgb.flags.writeable = True
+
+        # Không detect được pose
+        if not results.pose_landmarks:
+            return None
+
+        lm = results.pose_landmarks.landmark
+
+        # Trích xuất 5 key landmarks vào một array (5, 3) pixel duy nhất
+        if self._scale_wh != (w, h):
+            self._scale = np.array([w, h, w], dtype=np.float32)
+            self._scale_wh = (w, h)
+        pts = np.fromiter(
+            (c for p in _key_landmarks(lm) for c in (p.x, p.y, p.z)),
+            dtype=np.float32,
+            count=15,
+        ).reshape(5, 3)
+        pts *= self._scale
+        return pts
 
     @staticmethod
-    def _landmark_xyz(lm, enum, w, h) -> np.ndarray:
+    def _frame_hash(frame: np.ndarray) -> np.ndarray:
         """
-        Chuyển đổi landmark từ MediaPipe sang tọa độ pixel
+        Hash cảm quan rẻ: ảnh xám 16x16 (INTER_AREA lấy trung bình nên gần như không nhạy nhiễu)
 
         Args:
-            lm: MediaPipe landmarks list
-            enum: PoseLandmark enum value
-            w: Image width
-            h: Image height
+            frame: Input image frame (BGR)
 
         Returns:
-            np.ndarray: Tọa độ [x, y, z] trong pixel
+            np.ndarray: Array (16, 16) int16
         """
-        p = lm[enum.value]
-        return np.array([p.x * w, p.y * h, p.z * w])
+        tiny = cv2.resize(frame, (16, 16), interpolation=cv2.INTER_AREA)
+        if tiny.ndim == 3:
+            tiny = cv2.cvtColor(tiny, cv2.COLOR_BGR2GRAY)
+        return tiny.astype(np.int16)
 
-    @staticmethod
-    def _angle(v1: np.ndarray, v2: Tuple[float, float]) -> float:
+    def get_latest(self) -> Dict[str, Any]:
         """
-        Tính góc giữa hai vector
-
-        Args:
-            v1: Vector thứ nhất
-            v2: Vector thứ hai
+        Lấy kết quả phân tích mới nhất
 
         Returns:
-            float: Góc tính bằng độ [0, 180]
+            Dict: Kết quả phân tích posture gần nhất
         """
-        denom = max(np.linalg.norm(v1) * np.linalg.norm(v2), 1e-7)
-        cos_ang = np.clip(np.dot(v1, v2) / denom, -1.0, 1.0)
-        return float(np.degrees(np.arccos(cos_ang)))
+        if not self._latest or "timestamp" not in self._latest:
+            # Return empty result if no analysis has been run
+            return self._empty_result()
+        return self._latest.copy()
 
     @staticmethod
-    def _normalize_angle_to_zero(angle: float) -> float:
+    def _normalize_angle_to_zero(angle):
         """
-        Chuẩn hóa góc về quanh 0 độ trong khoảng [-90, +90]
+        Chuẩn hóa góc về quanh 0 độ trong khoảng [-90, +90)
 
         Ví dụ:
         - 170° → -10° (vì 170° gần -10° hơn là 170°)
         - 150° → -30°
         - 95° → -85°
-        - 90° → 90° (giữ nguyên)
+        - -170° → 10°
         - 45° → 45° (giữ nguyên)
         - 0° → 0° (giữ nguyên)
 
         Args:
-            angle: Góc đầu vào [0, 180]
+            angle: Góc đầu vào (độ), float hoặc np.ndarray
 
         Returns:
-            float: Góc đã chuẩn hóa về [-90, +90]
+            Góc đã chuẩn hóa về [-90, +90), cùng kiểu với đầu vào
         """
-        # Giữ nguyên góc trong [-90, +90]
-        if -90 <= angle <= 90:
-            return angle
-
-        # Với góc > 90, chuyển về [-90, 0] bằng cách trừ 180
-        if angle > 90:
-            return angle - 180
-
-        # Với góc < -90, chuyển về [0, 90] bằng cách cộng 180
-        return angle + 180
+        # Rút gọn modulo 180 không rẽ nhánh, chạy được element-wise trên array
+        return ((angle + 90.0) % 180.0) - 90.0
 
     def _classify_normalized(self, yaw: float, pitch: float, shoulder: float, dist: Optional[float]) -> str:
         """
@@ -266,17 +371,19 @@ class PostureAnalyzer:
         if yaw is None or pitch is None or shoulder is None:
             return "unknown"
 
-        # Với góc đã chuẩn hóa, chỉ cần kiểm tra giá trị tuyệt đối
-        if abs(yaw) > self._max_head_yaw:
-            return "poor"
-        if abs(pitch) > self._max_head_pitch:
-            return "poor"
-        if abs(shoulder) > self._max_shoulder_tilt:
-            return "poor"
-        if dist is not None and (dist < self._min_dist_cm or dist > self._max_dist_cm):
-            return "poor"
-
-        return "good"
+        # Với góc đã chuẩn hóa, chỉ cần kiểm tra |góc| <= ngưỡng: một biểu thức so sánh
+        # chuỗi trên các ngưỡng đã unpack sẵn, không gọi abs() hay đọc attribute từng ngưỡng.
+        # Các góc là góc hướng của vector giữa các khớp nên bất biến với tỉ lệ và vị trí
+        # người trong khung hình. Không cần kiểm tra dist: posture_math đã clamp mọi
+        # khoảng cách vào [MIN_REASONABLE_DISTANCE, MAX_REASONABLE_DISTANCE] trước khi lọc.
+        max_yaw, max_pitch, max_shoulder = self._posture_limits
+        if (
+            -max_yaw <= yaw <= max_yaw
+            and -max_pitch <= pitch <= max_pitch
+            and -max_shoulder <= shoulder <= max_shoulder
+        ):
+            return "good"
+        return "poor"
 
     def _classify(self, yaw: float, pitch: float, shoulder: float, dist: Optional[float]) -> str:
         """
@@ -34,14 +34,20 @@ AEyePro Vision System - HOÀN CHỈNH SỬ DỤNG TOÀN BỘ PACKAGE VISION
 - Graceful error handling và recovery
 """
 
+import csv
 import sys
 import time
 import signal
 import threading
 import argparse
+import traceback
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 
 # Add project root to path
 current_dir = Path(__file__).parent
@@ -49,12 +55,14 @@ sys.path.insert(0, str(current_dir))
 
 try:
     import numpy as np
-    import pandas as pd
     import cv2
     import mediapipe as mp
-    from utils import get_config, append_csv_row
+    from utils import get_config
     from vision.eye_tracker import EyeTracker
     from vision.posture_analyzer import PostureAnalyzer
+    from vision import _overlay_kernels
+    from vision._overlay_kernels import blend_fill, classify_alerts, classify_health
+    from vision._posture_kernels import classify_panel_angles
     from vision.blink_detector import BlinkDetector
     from vision.drowsiness_detector import DrowsinessDetector
     from vision.health_data_collector import HealthDataCollector
@@ -64,6 +72,428 @@ except ImportError as e:
     sys.exit(1)
 
 
+@dataclass(slots=True)
+class FrameClock:
+    """
+    Thời gian của một vòng loop, tính một lần rồi truyền qua các bước xử lý/vẽ
+
+    Attributes:
+        now: time.time() đầu vòng loop
+        elapsed: Số giây từ lúc bắt đầu session
+        elapsed_min: elapsed tính theo phút
+        per_minute: 1 / max(elapsed_min, 0.1) - rate/phút = count * per_minute
+    """
+    now: float
+    elapsed: float
+    elapsed_min: float
+    per_minute: float
+
+    @classmethod
+    def tick(cls, start_time: Optional[float]) -> "FrameClock":
+        """Đọc đồng hồ một lần cho vòng loop hiện tại"""
+        now = time.time()
+        elapsed = now - start_time if start_time else 0.0
+        elapsed_min = elapsed / 60.0
+        return cls(now, elapsed, elapsed_min, 1.0 / max(elapsed_min, 0.1))
+
+
+@dataclass(slots=True)
+class OverlayContext:
+    """
+    Dữ liệu của một frame cho các panel overlay, unpack một lần rồi truyền cho mọi panel
+
+    Attributes:
+        clock: Thời gian của vòng loop hiện tại
+        eye_data, blink_data, posture_data, drowsy_data: Kết quả từng module (_EMPTY_DICT nếu không có)
+        blink_rate: Số lần chớp mắt / phút của session
+    """
+    clock: FrameClock
+    eye_data: Mapping[str, Any]
+    blink_data: Mapping[str, Any]
+    posture_data: Mapping[str, Any]
+    drowsy_data: Mapping[str, Any]
+    blink_rate: float
+
+    @classmethod
+    def from_result(cls, frame_result: Dict[str, Any], clock: FrameClock, total_blinks: int) -> "OverlayContext":
+        """Unpack frame_result và tính blink rate một lần cho frame hiện tại"""
+        get = frame_result.get
+        return cls(clock, get('eye_data') or _EMPTY_DICT, get('blink_data') or _EMPTY_DICT,
+                   get('posture_data') or _EMPTY_DICT, get('drowsy_data') or _EMPTY_DICT,
+                   total_blinks * clock.per_minute)
+
+
+@dataclass(slots=True)
+class SessionStats:
+    """Thống kê realtime của session, đọc/ghi mỗi frame bởi loop và overlay"""
+    total_blinks: int = 0
+    avg_ear: float = 0.0
+    avg_distance: float = 0.0
+    drowsy_events: int = 0
+    posture_alerts: int = 0
+    fps: float = 0.0
+
+
+# Record 1 row / giây của session: structured array (SoA theo cột) thay cho list dict,
+# cấp phát trước ~2 giờ và tự nới khi vượt
+_SESSION_DTYPE = np.dtype([
+    ('ts', 'f8'), ('ear', 'f4'), ('dist', 'f4'),
+    ('shoulder', 'f4'), ('pitch', 'f4'), ('yaw', 'f4'),
+    ('drowsy', 'u1'), ('posture', 'u1'),
+])
+_SESSION_ROWS = 3600 * 2
+# Mã posture status trong session_data (còn lại, vd "unknown" = 0)
+_POSTURE_CODES = {'good': 1, 'poor': 2}
+
+
+def _nan_if_none(value: Optional[float]) -> float:
+    """None → NaN để lưu vào cột float của session_data"""
+    return np.nan if value is None else value
+
+
+def _column_mean(column: np.ndarray, absolute: bool = False) -> float:
+    """Trung bình một cột float của session_data, bỏ qua NaN (0.0 nếu không có giá trị)"""
+    valid = column[~np.isnan(column)]
+    if valid.size == 0:
+        return 0.0
+    if absolute:
+        valid = np.abs(valid)
+    return float(valid.mean(dtype=np.float64))
+
+
+# Mapping rỗng read-only thay cho `{}` khi frame_result thiếu kết quả của một module,
+# dùng chung để không cấp phát dict mới mỗi frame
+_EMPTY_DICT: Mapping[str, Any] = MappingProxyType({})
+
+# drowsy_data khi không gọi được DrowsinessDetector (không có EAR / detector lỗi);
+# read-only, dùng chung cho mọi frame
+_DROWSY_FALLBACK = MappingProxyType({
+    'drowsiness_detected': False,
+    'reason': None,
+    'ear_duration': 0.0,
+    'posture_bad_duration': 0.0,
+    'gaze_off_duration': 0.0,
+})
+
+
+# Columns của summary.csv (1 row / session)
+_SUMMARY_HEADERS = [
+    # Session Information
+    'session_id', 'start_time', 'end_time', 'duration_minutes',
+    # Health Metrics - quan trọng nhất
+    'avg_ear', 'avg_distance_cm', 'drowsiness_events',
+    # Posture Analysis - 3 góc chính
+    'avg_shoulder_tilt', 'avg_head_pitch', 'avg_head_yaw'
+]
+
+# Các góc trong posture_data được chuẩn hóa mỗi frame
+_POSTURE_ANGLE_KEYS = (
+    'head_side_angle',    # Yaw: quay ngang
+    'head_updown_angle',  # Pitch: nghiêng lên/xuống
+    'head_roll',          # Roll: nghiêng bên
+    'shoulder_tilt',      # Tilt vai
+    'left_shoulder_angle',
+    'right_shoulder_angle',
+)
+
+# Màu/nhãn theo mã của classify_health: blink rate (0 = NORMAL) và eye fatigue (0 = LOW)
+_BLINK_HEALTH_STYLES = (
+    ((0, 255, 0), "NORMAL"),
+    ((255, 255, 0), "ABNORMAL"),
+)
+_FATIGUE_STYLES = (
+    ((0, 255, 0), "LOW"),
+    ((255, 255, 0), "MEDIUM"),
+    ((0, 100, 255), "HIGH"),
+)
+
+# Màu border alerts panel theo border_code của classify_alerts (good, warning, critical)
+_ALERT_BORDER_COLORS = ((0, 255, 0), (0, 255, 255), (0, 100, 255))
+# Alerts theo thứ tự hiển thị: (bit của classify_alerts, text, màu)
+_ALERT_MESSAGES = (
+    (_overlay_kernels.ALERT_TOO_CLOSE, "[DIST] Too close to screen!", (255, 100, 100)),
+    (_overlay_kernels.ALERT_TOO_FAR, "[DIST] Too far from screen!", (255, 100, 100)),
+    (_overlay_kernels.ALERT_EYE_FATIGUE, "[EYE] Eye fatigue detected", (255, 255, 0)),
+    (_overlay_kernels.ALERT_POOR_POSTURE, "[POSTURE] Poor sitting posture", (255, 150, 0)),
+    (_overlay_kernels.ALERT_DROWSY, "[!] DROWSINESS WARNING! (3s EAR low)", (0, 100, 255)),
+    (_overlay_kernels.ALERT_EAR_LOW, "[!] EAR getting low - stay alert!", (255, 255, 0)),
+    (_overlay_kernels.ALERT_BLINK_LOW, "[BLINK] Low blink rate - dry eyes", (255, 200, 0)),
+    (_overlay_kernels.ALERT_BLINK_HIGH, "[BLINK] High blink rate - stress?", (255, 200, 0)),
+)
+
+# Màu và nhãn theo mức classify_panel_angles (0 = GOOD, 1 = WARN, 2 = POOR)
+_PANEL_STATUS_STYLES = (
+    ((0, 255, 0), "GOOD"),
+    ((0, 255, 255), "WARN"),
+    ((0, 100, 255), "POOR"),
+)
+
+# Các dòng góc của posture panel theo thứ tự classify_panel_angles (yaw, pitch, shoulder):
+# (nhãn, hướng khi góc < 0, hướng khi góc > 0, khoảng cách thêm sau dòng)
+_POSTURE_ANGLE_ROWS = (
+    ("Head Turn", "LEFT", "RIGHT", 0),
+    ("Head Tilt", "UP", "DOWN", 0),
+    ("Shoulder", "LEFT", "RIGHT", 5),
+)
+
+# Vùng EAR: <= 0.22 thấp, <= 0.27 trung bình, > 0.27 tốt (bisect_left: ngưỡng thuộc vùng dưới)
+_EAR_BINS = (0.22, 0.27)
+_EAR_COLORS = ((0, 100, 255), (0, 255, 255), (0, 255, 0))
+
+# Vùng khoảng cách: [50, 80] OPTIMAL, [30, 100] OK, còn lại POOR (cả hai biên đều bao gồm)
+_DIST_BINS_LO = (30, 50)
+_DIST_BINS_HI = (80, 100)
+_DIST_STYLES = (
+    ((255, 100, 100), "POOR"),
+    ((255, 255, 0), "OK"),
+    ((0, 255, 0), "OPTIMAL"),
+)
+
+# MediaPipe Face Mesh face oval indices
+_FACE_OVAL = np.array([10, 338, 297, 332, 284, 251, 389, 356, 454, 323, 361, 288,
+                       397, 365, 379, 378, 400, 377, 152, 148, 176, 149, 150, 136,
+                       172, 58, 132, 93, 234, 127, 162, 21, 54, 103, 67, 109], dtype=np.intp)
+
+
+def _circle_offsets(radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Offset (dy, dx) các pixel của cv2.circle filled bán kính radius quanh tâm"""
+    size = 2 * radius + 1
+    stamp = np.zeros((size, size), dtype=np.uint8)
+    cv2.circle(stamp, (radius, radius), radius, 255, -1)
+    dy, dx = np.nonzero(stamp)
+    return (dy - radius).astype(np.int32), (dx - radius).astype(np.int32)
+
+
+# Mẫu điểm landmark (cv2.circle bán kính 1, filled) và điểm mắt (bán kính 3)
+_LANDMARK_DOT_DY, _LANDMARK_DOT_DX = _circle_offsets(1)
+_EYE_DOT_DY, _EYE_DOT_DX = _circle_offsets(3)
+
+
+def _scatter_dots(frame: np.ndarray, ipts: np.ndarray, dy: np.ndarray, dx: np.ndarray,
+                  color: Tuple[int, int, int]) -> None:
+    """
+    Vẽ chấm tròn filled tại mọi điểm bằng một lần fancy indexing thay vì gọi
+    cv2.circle cho từng điểm
+
+    Args:
+        frame: Frame BGR, được sửa trực tiếp
+        ipts: Array (N, 2) tọa độ pixel int (x, y)
+        dy, dx: Offset các pixel của chấm (xem _circle_offsets)
+        color: Màu BGR
+    """
+    h, w = frame.shape[:2]
+    ys = ipts[:, 1, None] + dy
+    xs = ipts[:, 0, None] + dx
+    inside = (ys >= 0) & (ys < h) & (xs >= 0) & (xs < w)
+    frame[ys[inside], xs[inside]] = color
+
+
+# Màu tay của stick figure theo mức shoulder tilt (<= 10°, <= 15°, còn lại)
+_FIGURE_ARM_COLORS = ((0, 255, 0), (255, 255, 0), (255, 100, 100))
+_FIGURE_PAD = 4
+
+
+def _draw_stick_figure(img: np.ndarray, x: int, y: int, body_color, arm_color) -> None:
+    """Vẽ stick figure của posture indicator (đầu, thân, tay, chân) với góc trên trái (x, y)"""
+    head_center = (x + 15, y + 10)
+    cv2.circle(img, head_center, 8, body_color, 2)
+
+    body_start = (head_center[0], head_center[1] + 8)
+    body_end = (head_center[0], y + 35)
+    cv2.line(img, body_start, body_end, body_color, 2)
+
+    shoulder_y = body_start[1] + 8
+    cv2.line(img, body_start, (body_start[0] - 15, shoulder_y + 15), arm_color, 3)
+    cv2.line(img, body_start, (body_start[0] + 15, shoulder_y + 15), arm_color, 3)
+
+    cv2.line(img, body_end, (body_end[0] - 10, body_end[1] + 15), body_color, 2)
+    cv2.line(img, body_end, (body_end[0] + 10, body_end[1] + 15), body_color, 2)
+
+
+def _build_posture_figures() -> Tuple[Tuple[np.ndarray, np.ndarray], ...]:
+    """
+    Rasterize sẵn stick figure cho từng mức shoulder tilt
+
+    Returns:
+        Tuple: (tile BGR, mask) theo mức 0 = GOOD, 1 = WARN, 2 = POOR (màu tay),
+        góc trên trái của figure nằm tại (_FIGURE_PAD, _FIGURE_PAD)
+    """
+    pad = _FIGURE_PAD
+    size = (50 + 2 * pad + 2, 30 + 2 * pad + 2)
+    mask = np.zeros(size, dtype=np.uint8)
+    _draw_stick_figure(mask, pad, pad, 255, 255)
+    figures = []
+    for arm_color in _FIGURE_ARM_COLORS:
+        tile = np.zeros(size + (3,), dtype=np.uint8)
+        _draw_stick_figure(tile, pad, pad, (255, 255, 255), arm_color)
+        figures.append((tile, mask))
+    return tuple(figures)
+
+
+_POSTURE_FIGURES = _build_posture_figures()
+
+
+def _distance_zone(distance: float) -> int:
+    """
+    Mức khoảng cách tới màn hình: 0 = POOR, 1 = OK, 2 = OPTIMAL
+
+    Mức là min của vị trí so với các biên dưới và biên trên, tra bằng bisect.
+    """
+    return min(bisect_right(_DIST_BINS_LO, distance), 2 - bisect_left(_DIST_BINS_HI, distance))
+
+
+def _blend_rect(frame: np.ndarray, pt1: Tuple[int, int], pt2: Tuple[int, int],
+                color: Tuple[int, int, int], frame_weight: float) -> None:
+    """
+    Tô nền bán trong suốt cho một hình chữ nhật, chỉ blend trên ROI của nó
+
+    Tương đương vẽ rectangle filled lên bản copy của frame rồi addWeighted toàn
+    frame, nhưng chỉ chạm vào vùng panel thay vì copy và blend cả frame HD.
+    Trọng số được lượng tử về bước 1/256 (sai khác tối đa 1 mức so với addWeighted).
+
+    Args:
+        frame: Frame BGR, được sửa trực tiếp
+        pt1, pt2: Góc trên trái / dưới phải (bao gồm, như cv2.rectangle)
+        color: Màu nền BGR
+        frame_weight: Trọng số của frame gốc (màu nền nhận 1 - frame_weight)
+    """
+    h, w = frame.shape[:2]
+    x1, y1 = max(pt1[0], 0), max(pt1[1], 0)
+    x2, y2 = min(pt2[0] + 1, w), min(pt2[1] + 1, h)
+    if x2 <= x1 or y2 <= y1:
+        return
+    # Blend số nguyên với trọng số cố định (kernel Numba nếu có), không cấp phát tint
+    blend_fill(frame[y1:y2, x1:x2], color[0], color[1], color[2], int(round(frame_weight * 256)))
+
+
+class _TextSpriteCache:
+    """
+    LRU cache sprite của chuỗi text (Hershey Simplex) đã rasterize sẵn
+
+    Mỗi (text, scale, color, thickness) được putText một lần lên mask 1 kênh rồi
+    crop về bounding box; các lần sau chỉ dán sprite vào ROI của frame. Mask nhị
+    phân (putText LINE_8) dán bằng cv2.copyTo; mask anti-aliased (bản OpenCV
+    mặc định LINE_AA) ghép bằng roi * (255 - mask) / 255 + offset (cv2.multiply +
+    cv2.add uint8, offset = màu * mask / 255 tính sẵn), nhanh hơn blendLinear float;
+    kết quả khớp cv2.putText, chỉ lệch tối đa 1 mức ở vài pixel viền do làm tròn.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._maxsize = maxsize
+        self._sprites: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    def _sprite(self, text: str, scale: float, color: Tuple[int, int, int], thickness: int) -> tuple:
+        """(dx, dy, tile, mask, blend) của sprite, dx/dy tính từ org; tile None nếu text rỗng"""
+        key = (text, scale, color, thickness)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            return sprite
+
+        (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+        pad = 2 * thickness + 2
+        mask = np.zeros((h + baseline + 2 * pad, w + 2 * pad), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, pad + h), cv2.FONT_HERSHEY_SIMPLEX, scale, 255, thickness)
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        if rows.size == 0:
+            sprite = (0, 0, None, None, None)
+        else:
+            mask = np.ascontiguousarray(mask[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1])
+            tile = np.empty(mask.shape + (3,), dtype=np.uint8)
+            tile[:] = color
+            blend = None
+            if np.count_nonzero((mask != 0) & (mask != 255)):
+                # (trọng số frame, offset màu) uint8 3 kênh
+                blend = (np.repeat((255 - mask)[..., None], 3, axis=2),
+                         np.rint(tile * (mask[..., None] * (1.0 / 255.0))).astype(np.uint8))
+            sprite = (int(cols[0]) - pad, int(rows[0]) - pad - h, tile, mask, blend)
+
+        self._sprites[key] = sprite
+        if len(self._sprites) > self._maxsize:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def put_text(self, frame: np.ndarray, text: str, org: Tuple[int, int], scale: float,
+                 color: Tuple[int, int, int], thickness: int = 1) -> None:
+        """Vẽ text lên frame như cv2.putText(frame, text, org, FONT_HERSHEY_SIMPLEX, ...)"""
+        dx, dy, tile, mask, blend = self._sprite(text, scale, color, thickness)
+        if tile is None:
+            return
+        x0 = org[0] + dx
+        y0 = org[1] + dy
+        th, tw = mask.shape
+        fh, fw = frame.shape[:2]
+        # Cắt sprite theo biên frame
+        sx0, sy0 = max(-x0, 0), max(-y0, 0)
+        sx1, sy1 = min(tw, fw - x0), min(th, fh - y0)
+        if sx1 <= sx0 or sy1 <= sy0:
+            return
+        roi = frame[y0 + sy0:y0 + sy1, x0 + sx0:x0 + sx1]
+        if blend is None:
+            cv2.copyTo(tile[sy0:sy1, sx0:sx1], mask[sy0:sy1, sx0:sx1], roi)
+        else:
+            cv2.multiply(roi, blend[0][sy0:sy1, sx0:sx1], dst=roi, scale=1.0 / 255.0)
+            cv2.add(roi, blend[1][sy0:sy1, sx0:sx1], dst=roi)
+
+
+# Sprite text của overlay (chỉ một thread vẽ overlay tại một thời điểm)
+_TEXT_SPRITES = _TextSpriteCache()
+
+
+def _put_text(frame: np.ndarray, text: str, org: Tuple[int, int], scale: float,
+              color: Tuple[int, int, int], thickness: int = 1) -> None:
+    """
+    cv2.putText (FONT_HERSHEY_SIMPLEX) qua sprite cache
+
+    Chỉ dùng cho text tĩnh hoặc ít đổi (nhãn trạng thái, timer theo giây, giá trị
+    làm tròn 0.1); text đổi mỗi frame (frame counter, EAR 3 chữ số) vẽ thẳng bằng
+    cv2.putText vì mỗi lần miss cache tốn hơn một lần putText.
+    """
+    _TEXT_SPRITES.put_text(frame, text, org, scale, color, thickness)
+
+
+# Static chrome của các panel có màu cố định: (panel, title, color, màu nền)
+# Nền panel blend 30% màu nền / 70% frame, nền header 70% đen
+_STATIC_PANELS = (
+    ("eye", "EYE TRACKING", (0, 200, 255), (20, 20, 40)),
+    ("posture", "POSTURE ANALYSIS", (255, 150, 0), (40, 20, 20)),
+    ("health", "HEALTH STATUS", (0, 255, 100), (20, 40, 20)),
+    ("statistics", "REAL-TIME STATISTICS", (255, 200, 0), (40, 40, 20)),
+)
+_PANEL_FRAME_WEIGHT = 0.7
+_HEADER_FRAME_WEIGHT = 0.3
+# Alerts panel: màu border/title/separator đổi theo border_code của classify_alerts nên
+# chrome được render sẵn một biến thể cho mỗi mức, region "alerts0".."alerts2"
+_ALERT_PANEL_TITLE = "ALERTS & RECOMMENDATIONS"
+_ALERT_PANEL_BG = (40, 20, 40)
+_ALERT_CHROME_REGIONS = tuple(f"alerts{code}" for code in range(len(_ALERT_BORDER_COLORS)))
+
+
+def _panel_rect(name: str, frame: np.ndarray) -> Tuple[int, int, int, int]:
+    """
+    Vị trí và kích thước panel overlay theo kích thước frame
+
+    Args:
+        name: "eye", "posture", "health", "statistics" hoặc "alerts"
+        frame: Frame hiển thị
+
+    Returns:
+        Tuple: (panel_x, panel_y, panel_width, panel_height)
+    """
+    frame_height, frame_width = frame.shape[:2]
+    if name == "eye":
+        return 15, 100, 280, 180
+    if name == "posture":
+        return frame_width - 280 - 15, 100, 280, 200
+    if name == "health":
+        return 15, frame_height - 160 - 15, 350, 160
+    if name == "alerts":
+        return frame_width - 280 - 15, frame_height - 140 - 15, 280, 140
+    # statistics: center bottom, after health status panel
+    return 390, frame_height - 120 - 15, 320, 120
+
+
 class AEyeProVisionApp:
     """
     AEyePro Vision System - Main Application
@@ -80,6 +510,11 @@ class AEyeProVisionApp:
         self.cfg = get_config(config_file)
         self.health_cfg = self.cfg.get("health_monitoring", {})
 
+        # Thread pool nội bộ của OpenCV: các lệnh vẽ/blend chỉ chạm ROI nhỏ và pipeline đã
+        # chạy song song bằng thread riêng (loop, posture worker, overlay), chia thêm mỗi
+        # lệnh cv2 ra N thread chỉ tốn chi phí dispatch và tranh CPU
+        cv2.setNumThreads(int(self.health_cfg.get("opencv_threads", 1)))
+
         # Application state
         self.start_time = None
         self.running = False
@@ -107,18 +542,61 @@ class AEyeProVisionApp:
         self.error_count = 0
 
         # Statistics
-        self.stats = {
-            'total_blinks': 0,
-            'avg_ear': 0.0,
-            'avg_distance': 0.0,
-            'drowsy_events': 0,
-            'posture_alerts': 0,
-            'fps': 0.0
-        }
-
-        # Data storage
-        self.session_data = []
-        self.eye_data_buffer = []
+        self.stats = SessionStats()
+
+        # Data storage: 1 row / giây (xem _SESSION_DTYPE), _sd_idx = số row đã ghi
+        self.session_data = np.empty(0, dtype=_SESSION_DTYPE)
+        self._sd_idx = 0
+        # EAR 30 frame gần nhất: ring buffer float32, mean cập nhật tăng dần qua running sum (O(1)/frame)
+        self._ear_ring = np.zeros(30, dtype=np.float32)
+        self._ear_idx = 0
+        self._ear_filled = 0
+        self._ear_sum = 0.0
+
+        # Posture chạy trên worker thread riêng: process_frame chỉ đẩy frame mới nhất vào
+        # slot (frame cũ chưa xử lý bị bỏ) và đọc kết quả gần nhất, không chờ pose inference
+        self._pose_slot: deque = deque(maxlen=1)
+        self._pose_ready = threading.Event()
+        self._pose_running = False
+        self._pose_thread: Optional[threading.Thread] = None
+        self._latest_posture: Dict[str, Any] = {}
+
+        # Summary CSV (mở trong setup_session_logging, đóng sau khi ghi summary)
+        self._summary_fh = None
+        self._summary_writer: Optional[csv.DictWriter] = None
+
+        # Buffer frame hiển thị của _create_comprehensive_overlay (tái sử dụng giữa các frame)
+        self._display_buf: Optional[np.ndarray] = None
+
+        # Overlay chạy trên compositor thread riêng: display_camera_feed chỉ đẩy frame mới nhất
+        # vào slot (frame cũ chưa vẽ bị bỏ) và hiển thị overlay hoàn chỉnh gần nhất, không chờ
+        # vẽ panels. Ba display buffer luân phiên: bản đã publish, bản đang imshow và bản
+        # compositor đang vẽ không bao giờ trùng nhau (chọn/claim buffer dưới _display_lock)
+        self._overlay_slot: deque = deque(maxlen=1)
+        self._overlay_ready = threading.Event()
+        self._overlay_running = False
+        self._overlay_thread: Optional[threading.Thread] = None
+        self._display_bufs: List[Optional[np.ndarray]] = [None, None, None]
+        self._display_lock = threading.Lock()
+        self._latest_display: Optional[np.ndarray] = None
+        self._shown_display: Optional[np.ndarray] = None
+        # Lớp HUD (header + panels) render sẵn, ghép lên frame mới khi dữ liệu hiển thị không đổi:
+        # (frame shape, hud keys theo panel, [(panel, rows, cols, weight, offset), ...]);
+        # chỉ render lại các panel có key đổi, tối đa mỗi frame chẵn một lần
+        self._overlay_parity = 0
+        self._hud_layer: Optional[tuple] = None
+        # Canvas nền đen/trắng dùng để tách trọng số frame của lớp HUD và buffer patch
+        # của lớp HUD theo vùng, cấp phát một lần theo shape:
+        # (shape, lo, hi, patches, các vùng có chồng nhau không)
+        self._hud_canvases: Optional[tuple] = None
+        # Static overlay chrome: (frame shape, session_id, {region: (rows, cols, weight, offset)})
+        self._overlay_chrome: Optional[tuple] = None
+        # Text đồng hồ chỉ đổi mỗi giây: (giây, text) của session clock và timestamp
+        self._session_clock_text: Tuple[int, str] = (-1, "")
+        self._timestamp_text: Tuple[int, str] = (-1, "")
+        # Biên dịch trước các kernel Numba của overlay (nếu có) để frame đầu không bị trễ
+        if self.show_camera:
+            _overlay_kernels.warmup()
 
         # Console display disabled - all info on camera overlay
         self.console_update_interval = float('inf')  # Disabled
@@ -153,11 +631,13 @@ class AEyeProVisionApp:
             # ✅ START EYE TRACKER (camera access)
             print("  🔌 Starting camera access...")
             self.eye_tracker.start()
+            self._start_posture_worker()
 
             # Initialize OpenCV window
             if self.show_camera:
                 cv2.namedWindow(self.camera_window_name, cv2.WINDOW_AUTOSIZE)
                 cv2.moveWindow(self.camera_window_name, 100, 100)  # Position window
+                self._start_overlay_worker()
                 print(f"[OK] Camera display enabled: {self.camera_window_name}")
                 print("  - Press 'q' in camera window to stop")
                 print("  - Click window X to close")
@@ -184,80 +664,196 @@ class AEyeProVisionApp:
         # Summary CSV file (1 record per session) - still handled here
         self.summary_csv_file = self.session_dir / "summary.csv"
 
-        # Create summary CSV if it doesn't exist
-        if not self.summary_csv_file.exists():
-            summary_headers = [
-                # Session Information
-                'session_id', 'start_time', 'end_time', 'duration_minutes',
-                # Health Metrics - quan trọng nhất
-                'avg_ear', 'avg_distance_cm', 'drowsiness_events',
-                # Posture Analysis - 3 góc chính
-                'avg_shoulder_tilt', 'avg_head_pitch', 'avg_head_yaw'
-            ]
-            append_csv_row({h: None for h in summary_headers}, self.summary_csv_file, summary_headers)
+        # Mở summary CSV một lần cho cả session (file mới thì ghi header); row summary
+        # được ghi bằng DictWriter này khi kết thúc session rồi đóng file
+        if self._summary_fh is not None:
+            self._summary_fh.close()
+        existing_header = None
+        if self.summary_csv_file.is_file() and self.summary_csv_file.stat().st_size > 0:
+            with self.summary_csv_file.open('r', newline='', encoding='utf-8') as f:
+                existing_header = next(csv.reader(f), None)
+        self._summary_fh = self.summary_csv_file.open('a', newline='', encoding='utf-8', buffering=8192)
+        self._summary_writer = csv.DictWriter(
+            self._summary_fh, fieldnames=existing_header or _SUMMARY_HEADERS, extrasaction='ignore'
+        )
+        if existing_header is None:
+            self._summary_writer.writeheader()
+
+        # Buffer record của session mới
+        self.session_data = np.empty(_SESSION_ROWS, dtype=_SESSION_DTYPE)
+        self._sd_idx = 0
 
         print(f"[OK] Session logging initialized - Health Data Collector handles CSV storage")
         return self.session_id
 
-    def process_frame(self) -> Dict[str, Any]:
+    def process_frame(self, run_posture: bool = True, clock: Optional[FrameClock] = None) -> Dict[str, Any]:
         """
         Xử lý một frame camera qua tất cả modules
 
+        Args:
+            run_posture: False để bỏ qua posture analysis ở frame này và dùng lại
+                         kết quả gần nhất (posture thay đổi chậm hơn nhiều so với mắt)
+            clock: Thời gian của vòng loop hiện tại (None = tự đọc đồng hồ)
+
         Returns:
-            Dict: Kết quả processing từ tất cả modules
+            Dict: Kết quả processing từ tất cả modules; 'frame' là frame camera đã dùng
+                  (cả khi có 'error'), caller dùng lại thay vì gọi get_frame() lần nữa
         """
+        frame = None
         try:
-            frame_result = {}
+            # Get frame (once per cycle) and eye tracking data
+            frame = self.eye_tracker.get_frame()
+            frame_result = {'frame': frame}
 
-            # Get frame and eye tracking data
             eye_data = self.eye_tracker.get_latest()
             if not eye_data or eye_data.get('landmarks') is None:
-                return {'error': 'No face detected'}
+                return {'error': 'No face detected', 'frame': frame}
 
             self.processed_frames += 1
             frame_result['eye_data'] = eye_data
-            frame_result['timestamp'] = time.time()
+            frame_result['timestamp'] = clock.now if clock is not None else time.time()
 
             # Process blink detection (using update method)
             blink_data = self.blink_detector.update()
             frame_result['blink_data'] = blink_data
 
             # Process posture first (required for drowsiness detection)
-            frame = self.eye_tracker.get_frame()
             if frame is not None:
-                # Run posture analysis
-                self.posture_analyzer.analyze(frame)
-                posture_data = self.posture_analyzer.get_latest()
-
-                # Normalize angles to be centered around 0 degrees
-                posture_data = self._normalize_posture_angles(posture_data)
+                # Submit frame to the posture worker (or reuse the latest result);
+                # PostureAnalyzer.analyze tự bỏ qua inference khi frame gần như không đổi
+                if run_posture:
+                    self._pose_slot.append(frame)
+                    self._pose_ready.set()
+                # Latest result, already normalized by the worker
+                posture_data = self._latest_posture
             else:
                 posture_data = {}
             frame_result['posture_data'] = posture_data
 
             # Process drowsiness detection with eye and posture data
-            eye_data = frame_result.get('eye_data', {})
-            try:
-                drowsy_data = self.drowsiness_detector.update(
-                    ear=eye_data.get('avg_ear'),
-                    posture_data=posture_data
-                )
-                frame_result['drowsy_data'] = drowsy_data
-            except Exception as e:
-                # Fallback if drowsiness detector fails
-                frame_result['drowsy_data'] = {
-                    'drowsiness_detected': False,
-                    'reason': None,
-                    'ear_duration': 0.0,
-                    'posture_bad_duration': 0.0,
-                    'gaze_off_duration': 0.0,
-                }
+            # (không có EAR thì dùng fallback, không gọi detector)
+            ear = eye_data.get('avg_ear')
+            if ear is None:
+                frame_result['drowsy_data'] = _DROWSY_FALLBACK
+            else:
+                try:
+                    frame_result['drowsy_data'] = self.drowsiness_detector.update(
+                        ear=ear,
+                        posture_data=posture_data
+                    )
+                except Exception:
+                    # Fallback if drowsiness detector fails
+                    frame_result['drowsy_data'] = _DROWSY_FALLBACK
 
             return frame_result
 
         except Exception as e:
             self.error_count += 1
-            return {'error': str(e)}
+            return {'error': str(e), 'frame': frame}
+
+    def _start_posture_worker(self):
+        """Khởi động posture worker thread (nếu chưa chạy)"""
+        if self._pose_running:
+            return
+        self._pose_running = True
+        self._pose_slot.clear()
+        self._pose_thread = threading.Thread(
+            target=self._posture_loop, name="PostureWorkerThread", daemon=True
+        )
+        self._pose_thread.start()
+
+    def _stop_posture_worker(self):
+        """Dừng posture worker thread và đợi nó thoát"""
+        if not self._pose_running:
+            return
+        self._pose_running = False
+        self._pose_ready.set()
+        if self._pose_thread is not None:
+            self._pose_thread.join(timeout=2.0)
+            self._pose_thread = None
+
+    def _posture_loop(self):
+        """
+        Posture worker loop - chạy trong thread riêng
+
+        - Lấy frame mới nhất trong slot (frame cũ đã bị thay thế thì bỏ qua)
+        - Chạy PostureAnalyzer và chuẩn hóa góc
+        - Publish kết quả bằng cách gán tham chiếu (atomic), dict không bị sửa sau đó
+        """
+        pose_slot = self._pose_slot
+        while self._pose_running:
+            try:
+                frame = pose_slot.pop()
+            except IndexError:
+                self._pose_ready.wait(0.1)
+                self._pose_ready.clear()
+                continue
+
+            try:
+                self.posture_analyzer.analyze(frame)
+                # Normalize angles to be centered around 0 degrees
+                posture_data = self._normalize_posture_angles(dict(self.posture_analyzer.get_latest()))
+            except Exception as e:
+                self.error_count += 1
+                print(f"[WARNING] Posture worker error: {e}")
+                continue
+            self._latest_posture = posture_data
+
+    def _start_overlay_worker(self):
+        """Khởi động overlay compositor thread (nếu chưa chạy)"""
+        if self._overlay_running:
+            return
+        self._overlay_running = True
+        self._overlay_slot.clear()
+        self._latest_display = None
+        self._shown_display = None
+        self._overlay_thread = threading.Thread(
+            target=self._overlay_loop, name="OverlayCompositorThread", daemon=True
+        )
+        self._overlay_thread.start()
+
+    def _stop_overlay_worker(self):
+        """Dừng overlay compositor thread và đợi nó thoát"""
+        if not self._overlay_running:
+            return
+        self._overlay_running = False
+        self._overlay_ready.set()
+        if self._overlay_thread is not None:
+            self._overlay_thread.join(timeout=2.0)
+            self._overlay_thread = None
+
+    def _overlay_loop(self):
+        """
+        Overlay compositor loop - chạy trong thread riêng
+
+        - Lấy (frame, frame_result, clock) mới nhất trong slot (frame cũ đã bị thay thế thì bỏ qua)
+        - Vẽ overlay vào display buffer không phải bản đã publish hay bản đang hiển thị
+        - Publish buffer bằng cách gán tham chiếu (atomic)
+        """
+        overlay_slot = self._overlay_slot
+        bufs = self._display_bufs
+        while self._overlay_running:
+            try:
+                frame, frame_result, clock = overlay_slot.pop()
+            except IndexError:
+                self._overlay_ready.wait(0.1)
+                self._overlay_ready.clear()
+                continue
+
+            with self._display_lock:
+                for idx, buf in enumerate(bufs):
+                    if buf is None or (buf is not self._latest_display and buf is not self._shown_display):
+                        break
+            if buf is None or buf.shape != frame.shape:
+                buf = np.empty_like(frame)
+                bufs[idx] = buf
+
+            try:
+                self._create_comprehensive_overlay(frame, frame_result, clock, out=buf)
+            except Exception as e:
+                print(f"[WARNING] Overlay compositor error: {e}")
+                continue
+            self._latest_display = buf
 
     def update_statistics(self, frame_result: Dict[str, Any]):
         """
@@ -269,42 +865,55 @@ class AEyeProVisionApp:
         if 'error' in frame_result:
             return
 
-        eye_data = frame_result.get('eye_data', {})
-        blink_data = frame_result.get('blink_data', {})
-        drowsy_data = frame_result.get('drowsy_data', {})
-        posture_data = frame_result.get('posture_data', {})
+        # Unpack một lần các giá trị cần dùng
+        get = frame_result.get
+        eye_data = get('eye_data') or _EMPTY_DICT
+        drowsy_data = get('drowsy_data') or _EMPTY_DICT
+        avg_ear = eye_data.get('avg_ear')
+        distance_cm = eye_data.get('distance_cm')
+        blink_detected = (get('blink_data') or _EMPTY_DICT).get('blink_detected')
+        is_drowsy = drowsy_data.get('is_drowsy') or drowsy_data.get('drowsiness_detected')
+        posture_quality = (get('posture_data') or _EMPTY_DICT).get('posture_quality')
 
         # Eye tracking stats
-        if eye_data.get('avg_ear'):
-            self.eye_data_buffer.append(eye_data['avg_ear'])
-            if len(self.eye_data_buffer) > 30:  # Keep last 30 frames
-                self.eye_data_buffer.pop(0)
-            self.stats['avg_ear'] = np.mean(self.eye_data_buffer)
+        if avg_ear:
+            ring = self._ear_ring
+            idx = self._ear_idx
+            if self._ear_filled == ring.shape[0]:  # Keep last 30 frames
+                self._ear_sum -= float(ring[idx])
+            else:
+                self._ear_filled += 1
+            ring[idx] = avg_ear
+            # Cộng giá trị đã làm tròn float32 để tổng luôn khớp với nội dung ring
+            self._ear_sum += float(ring[idx])
+            self._ear_idx = (idx + 1) % ring.shape[0]
+            self.stats.avg_ear = self._ear_sum / self._ear_filled
 
-        if eye_data.get('distance_cm'):
-            self.stats['avg_distance'] = eye_data['distance_cm']
+        if distance_cm:
+            self.stats.avg_distance = distance_cm
 
         # Blink stats
-        if blink_data.get('blink_detected'):
-            self.stats['total_blinks'] += 1
+        if blink_detected:
+            self.stats.total_blinks += 1
 
         # Drowsiness stats - track both is_drowsy and drowsiness_detected
-        if drowsy_data.get('is_drowsy') or drowsy_data.get('drowsiness_detected'):
+        if is_drowsy:
             # Only increment if this is a new detection
             if not hasattr(self, '_last_drowsy_state'):
                 self._last_drowsy_state = False
             
             if not self._last_drowsy_state:
-                self.stats['drowsy_events'] += 1
+                self.stats.drowsy_events += 1
             self._last_drowsy_state = True
         else:
             self._last_drowsy_state = False
 
         # Posture stats
-        if posture_data.get('posture_quality') == 'bad':
-            self.stats['posture_alerts'] += 1
+        if posture_quality == 'bad':
+            self.stats.posture_alerts += 1
 
-    def save_frame_data(self, frame_result: Dict[str, Any], frame_id: int):
+    def save_frame_data(self, frame_result: Dict[str, Any], frame_id: int,
+                        clock: Optional[FrameClock] = None):
         """
         Update health data collector with frame data (1 record per second) - AEYE style
         CSV storage is now handled by health_data_collector only
@@ -312,12 +921,13 @@ class AEyeProVisionApp:
         Args:
             frame_result: Kết quả xử lý frame
             frame_id: ID của frame
+            clock: Thời gian của vòng loop hiện tại (None = tự đọc đồng hồ)
         """
         if 'error' in frame_result:
             return
 
         # Only update data every second to match AEYE style
-        current_time = time.time()
+        current_time = clock.now if clock is not None else time.time()
         if not hasattr(self, '_last_save_time'):
             self._last_save_time = current_time
 
@@ -326,7 +936,6 @@ class AEyeProVisionApp:
             return
 
         self._last_save_time = current_time
-        elapsed = current_time - self.start_time if self.start_time else 0
 
         # Get data from all modules
         eye_data = frame_result.get('eye_data', {})
@@ -334,24 +943,45 @@ class AEyeProVisionApp:
         posture_data = frame_result.get('posture_data', {})
         drowsy_data = frame_result.get('drowsy_data', {})
 
+        avg_ear = eye_data.get('avg_ear')
+        distance_cm = eye_data.get('distance_cm', posture_data.get('eye_distance_cm'))
+        shoulder_tilt = posture_data.get('shoulder_tilt')
+        head_pitch = posture_data.get('head_updown_angle')
+        head_yaw = posture_data.get('head_side_angle')
+        drowsiness_detected = drowsy_data.get('drowsiness_detected', False)
+        posture_status = posture_data.get('status', 'unknown')
+
+        # Ghi 1 row vào session_data (nới buffer gấp đôi khi đầy)
+        idx = self._sd_idx
+        if idx >= self.session_data.shape[0]:
+            grown = np.empty(max(2 * idx, _SESSION_ROWS), dtype=_SESSION_DTYPE)
+            grown[:idx] = self.session_data[:idx]
+            self.session_data = grown
+        self.session_data[idx] = (
+            current_time, _nan_if_none(avg_ear), _nan_if_none(distance_cm),
+            _nan_if_none(shoulder_tilt), _nan_if_none(head_pitch), _nan_if_none(head_yaw),
+            bool(drowsiness_detected), _POSTURE_CODES.get(posture_status, 0),
+        )
+        self._sd_idx = idx + 1
+
         # ✅ CẬP NHẬT HEALTH DATA COLLECTOR - Chỉ essential metrics
         if self.health_collector:
             # Prepare focused health data với essential metrics only
             health_data = {
                 'timestamp': current_time,
-                'avg_ear': eye_data.get('avg_ear'),
+                'avg_ear': avg_ear,
 
                 # ✅ ERGONOMICS - Khoảng cách đến màn hình quan trọng
-                'distance_cm': eye_data.get('distance_cm', posture_data.get('eye_distance_cm')),
+                'distance_cm': distance_cm,
 
                 # ✅ TẬP TRUNG: 3 góc tư thế chính
-                'shoulder_tilt': posture_data.get('shoulder_tilt'),          # Góc nghiêng vai
-                'head_pitch': posture_data.get('head_updown_angle'),         # Góc nghiêng đầu trước-sau
-                'head_yaw': posture_data.get('head_side_angle'),            # Góc nghiêng đầu trái-phải
+                'shoulder_tilt': shoulder_tilt,          # Góc nghiêng vai
+                'head_pitch': head_pitch,                # Góc nghiêng đầu trước-sau
+                'head_yaw': head_yaw,                    # Góc nghiêng đầu trái-phải
 
                 # ✅ HEALTH STATUS - Trạng thái quan trọng nhất
-                'drowsiness_detected': drowsy_data.get('drowsiness_detected', False),
-                'posture_status': posture_data.get('status', 'unknown'),
+                'drowsiness_detected': drowsiness_detected,
+                'posture_status': posture_status,
             }
             # Health Data Collector sẽ tự động logging với essential storage
             self.health_collector.update_health_data(health_data)
@@ -360,7 +990,7 @@ class AEyeProVisionApp:
         """
         Calculate eye fatigue level based on EAR value
         """
-        avg_ear = eye_data.get('avg_ear', self.stats.get('avg_ear', 0.3))
+        avg_ear = eye_data.get('avg_ear', self.stats.avg_ear)
 
         if avg_ear < 0.2:
             return "HIGH"
@@ -381,17 +1011,24 @@ class AEyeProVisionApp:
         avg_fps = self.processed_frames / max(elapsed, 0.1)
         success_rate = (self.processed_frames / max(self.frame_count, 1)) * 100
 
+        # Records 1 giây của session (vectorized theo cột)
+        rows = self.session_data[:self._sd_idx]
+
         # Blink statistics
-        avg_blink_rate = self.stats['total_blinks'] / max(elapsed/60, 0.1)
-        avg_ear = self.stats.get('avg_ear', 0.3)
-        avg_distance = self.stats.get('avg_distance', 0)
+        avg_blink_rate = self.stats.total_blinks / max(elapsed/60, 0.1)
+        if rows.size:
+            avg_ear = _column_mean(rows['ear'])
+            avg_distance = _column_mean(rows['dist'])
+        else:
+            avg_ear = self.stats.avg_ear
+            avg_distance = self.stats.avg_distance
 
         # Posture statistics (simplified)
-        posture_alerts = self.stats['posture_alerts']
+        posture_alerts = self.stats.posture_alerts
         bad_posture_percentage = (posture_alerts / max(elapsed, 1)) * 100 if posture_alerts > 0 else 0
 
         # Drowsiness statistics
-        drowsiness_events = self.stats['drowsy_events']
+        drowsiness_events = self.stats.drowsy_events
 
         # Eye fatigue statistics
         eye_fatigue_percentage = 0
@@ -402,14 +1039,21 @@ class AEyeProVisionApp:
         else:
             eye_fatigue_percentage = 10
 
-        # Get posture data from health_data_collector
+        # Posture averages: từ session_data, fallback health_data_collector
         posture_data = {
             'avg_shoulder_tilt_deg': 0,
             'avg_head_pitch_deg': 0,
             'avg_head_yaw_deg': 0
         }
 
-        if self.health_collector:
+        if rows.size:
+            # Trung bình |góc| trên toàn session từ session_data
+            posture_data = {
+                'avg_shoulder_tilt_deg': _column_mean(rows['shoulder'], absolute=True),
+                'avg_head_pitch_deg': _column_mean(rows['pitch'], absolute=True),
+                'avg_head_yaw_deg': _column_mean(rows['yaw'], absolute=True),
+            }
+        elif self.health_collector:
             try:
                 # Get current statistics from health_data_collector
                 collector_stats = self.health_collector.get_current_stats()
@@ -423,7 +1067,7 @@ class AEyeProVisionApp:
 
         return {
             'duration_minutes': duration_minutes,
-            'total_blinks': self.stats['total_blinks'],
+            'total_blinks': self.stats.total_blinks,
             'avg_blink_rate': avg_blink_rate,
             'avg_ear': avg_ear,
             'avg_distance_cm': avg_distance,
@@ -438,27 +1082,38 @@ class AEyeProVisionApp:
             **posture_data
         }
 
-    def display_camera_feed(self, frame_result: Dict[str, Any]):
+    def display_camera_feed(self, frame_result: Dict[str, Any], clock: Optional[FrameClock] = None):
         """
         Hiển thị camera feed với comprehensive UI overlay
 
         Args:
             frame_result: Kết quả processing từ các modules
+            clock: Thời gian của vòng loop hiện tại (None = tự đọc đồng hồ)
         """
+        # Headless (show_camera=False): không dựng overlay; caller nên kiểm tra trước khi gọi
         if not self.show_camera:
             return
 
         try:
-            # Get original frame from eye tracker
-            frame = self.eye_tracker.get_frame()
+            # Frame đã lấy trong process_frame
+            frame = frame_result.get('frame')
             if frame is None:
                 return
 
-            # Create display frame with comprehensive overlay
-            display_frame = self._create_comprehensive_overlay(frame, frame_result)
+            if self._overlay_running:
+                # Giao frame cho compositor thread rồi hiển thị overlay hoàn chỉnh gần nhất
+                # (trễ tối đa một frame; loop không phải chờ vẽ overlay)
+                self._overlay_slot.append((frame, frame_result, clock))
+                self._overlay_ready.set()
+                with self._display_lock:
+                    display_frame = self._shown_display = self._latest_display
+            else:
+                # Create display frame with comprehensive overlay
+                display_frame = self._create_comprehensive_overlay(frame, frame_result, clock)
 
-            # Display the frame
-            cv2.imshow(self.camera_window_name, display_frame)
+            # Display the frame (compositor chưa xong frame đầu tiên thì chỉ xử lý phím)
+            if display_frame is not None:
+                cv2.imshow(self.camera_window_name, display_frame)
 
             # Check for keyboard input
             key = cv2.waitKey(1) & 0xFF
@@ -497,7 +1152,6 @@ class AEyeProVisionApp:
 
             # Ask for duration
             try:
-                import time
                 duration_input = input("\nCalibration duration (seconds, default=10): ").strip()
                 duration = float(duration_input) if duration_input else 10.0
                 duration = max(5.0, min(30.0, duration))  # Limit between 5-30 seconds
@@ -506,7 +1160,6 @@ class AEyeProVisionApp:
             except (ValueError, KeyboardInterrupt):
                 print("Using default 10 seconds...")
                 duration = 10.0
-                import time
                 time.sleep(2.0)
 
             # Run calibration using the current eye tracker
@@ -538,111 +1191,318 @@ class AEyeProVisionApp:
 
         except Exception as e:
             print(f"\nCALIBRATION ERROR: {e}")
-            import traceback
             traceback.print_exc()
         finally:
             # Resume main processing
             self.running = original_running
 
-    def _create_comprehensive_overlay(self, frame: np.ndarray, frame_result: Dict[str, Any]) -> np.ndarray:
+    def _create_comprehensive_overlay(self, frame: np.ndarray, frame_result: Dict[str, Any],
+                                      clock: Optional[FrameClock] = None,
+                                      out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Tạo comprehensive overlay với toàn bộ thông tin monitoring - Optimized for 30 FPS
 
         Args:
             frame: Original camera frame
             frame_result: Data từ tất cả modules
+            clock: Thời gian của vòng loop hiện tại (None = tự đọc đồng hồ)
+            out: Buffer đích cùng shape với frame (None = display buffer mặc định)
 
         Returns:
             Frame với full overlay UI
         """
-        display_frame = frame.copy()
-        h, w = display_frame.shape[:2]
+        # Frame của EyeTracker được chia sẻ với processing thread (read-only) nên không
+        # vẽ trực tiếp lên nó; copy vào display buffer tái sử dụng thay vì cấp phát mỗi frame
+        display_frame = out
+        if display_frame is None:
+            display_frame = self._display_buf
+            if display_frame is None or display_frame.shape != frame.shape:
+                display_frame = np.empty_like(frame)
+                self._display_buf = display_frame
+        np.copyto(display_frame, frame)
 
-        # Pre-calculate expensive operations
-        current_time = time.time()
-        elapsed = current_time - self.start_time if self.start_time else 0
+        # Đồng hồ của vòng loop, dùng chung cho mọi panel
+        if clock is None:
+            clock = FrameClock.tick(self.start_time)
 
         # Draw MediaPipe landmarks first (bottom layer)
         self._draw_face_landmarks(display_frame, frame_result)
 
-        # Create main UI panels with optimized drawing
-        self._draw_main_header_optimized(display_frame, current_time)
-        self._draw_eye_tracking_panel_optimized(display_frame, frame_result, w, elapsed)
-        self._draw_posture_panel_optimized(display_frame, frame_result, h, w)
-        self._draw_health_status_panel_optimized(display_frame, frame_result, h, elapsed)
-        self._draw_statistics_panel_optimized(display_frame, h, elapsed)
-        self._draw_alerts_panel_optimized(display_frame, frame_result, h, w)
+        self._update_display_fps(clock.now)
+
+        # Panel chỉ render lại khi dữ liệu nó hiển thị đổi (hud key của panel), tối đa ở mỗi
+        # frame chẵn; các frame còn lại ghép lớp HUD đã render lên frame mới (video dưới panel
+        # vẫn live)
+        ctx = OverlayContext.from_result(frame_result, clock, self.stats.total_blinks)
+        hud_keys = self._hud_keys(ctx)
+        layer = self._hud_layer
+        if layer is None or layer[0] != display_frame.shape:
+            layer = (display_frame.shape, hud_keys, self._render_hud_layer(display_frame.shape, ctx))
+            self._hud_layer = layer
+        elif self._overlay_parity == 0 and layer[1] != hud_keys:
+            dirty = tuple(key != old for key, old in zip(hud_keys, layer[1]))
+            layer = (display_frame.shape, hud_keys,
+                     self._render_hud_layer(display_frame.shape, ctx, dirty))
+            self._hud_layer = layer
+        self._overlay_parity ^= 1
+
+        for _, rows, cols, weight, offset in layer[2]:
+            roi = display_frame[rows, cols]
+            cv2.multiply(roi, weight, dst=roi, scale=1.0 / 255.0)
+            cv2.add(roi, offset, dst=roi)
 
         # Draw timestamp
-        self._draw_timestamp(display_frame)
+        self._draw_timestamp(display_frame, clock.now)
 
         return display_frame
 
-    def _draw_main_header_optimized(self, frame: np.ndarray, current_time: float):
-        """
-        Vẽ header chính với system info - Optimized version
+    def _build_overlay_chrome(self, shape: Tuple[int, ...]) -> Dict[str, tuple]:
         """
-        h, w = frame.shape[:2]
+        Render một lần lớp tĩnh của overlay: nền bán trong suốt, header title,
+        session id, border, title, separator của các panel
 
-        # Semi-transparent header background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), (w, 80), (0, 0, 0), -1)
-        cv2.addWeighted(frame, 0.3, overlay, 0.7, 0, frame)
+        Mỗi vùng lưu cặp uint8 (weight, offset) để ghép lên frame bằng
+        frame * weight / 255 + offset (cv2.multiply + cv2.add): pixel chrome có weight 0
+        và offset là màu chrome, pixel nền blend với màu nền, phần còn lại giữ nguyên frame.
 
-        # Main title
-        cv2.putText(frame, "AEYEPRO HEALTH MONITORING SYSTEM", (15, 25),
+        Returns:
+            Dict: Patch (rows, cols, weight, offset) theo vùng: "header", tên từng panel
+            trong _STATIC_PANELS và các biến thể _ALERT_CHROME_REGIONS
+        """
+        canvas = np.zeros(shape, dtype=np.uint8)
+        h, w = shape[:2]
+        patches = {}
+
+        def take_patch(name, x1, y1, x2, y2, background, bg_color, frame_weight):
+            rows = slice(max(y1, 0), min(y2 + 1, h))
+            cols = slice(max(x1, 0), min(x2 + 1, w))
+            tile = canvas[rows, cols].copy()
+            # Bỏ các pixel viền anti-alias mờ của chữ (giống overlay "No Face Detected"
+            # của VisionManager), tránh viền tối quanh chữ trên nền sáng
+            chrome = tile.max(axis=2) >= 128
+            # Nền: hình chữ nhật (bao gồm 2 biên, như cv2.rectangle) theo tọa độ trong patch
+            bx1, by1, bx2, by2 = background
+            bg_rows = slice(max(by1, 0) - rows.start, min(by2 + 1, h) - rows.start)
+            bg_cols = slice(max(bx1, 0) - cols.start, min(bx2 + 1, w) - cols.start)
+            w_frame = np.ones(chrome.shape, dtype=np.float32)
+            w_frame[bg_rows, bg_cols] = frame_weight
+            tile[bg_rows, bg_cols] = bg_color
+            tile[chrome] = canvas[rows, cols][chrome]
+            w_frame[chrome] = 0.0
+            weight = np.repeat(np.rint(w_frame * 255.0).astype(np.uint8)[..., None], 3, axis=2)
+            offset = np.rint(tile * (1.0 - w_frame)[..., None]).astype(np.uint8)
+            patches[name] = (rows, cols, weight, offset)
+            canvas.fill(0)
+
+        cv2.putText(canvas, "AEYEPRO HEALTH MONITORING SYSTEM", (15, 25),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-
-        # Session info
-        cv2.putText(frame, f"Session: {self.session_id}", (15, 50),
+        cv2.putText(canvas, f"Session: {self.session_id}", (15, 50),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        take_patch("header", 0, 0, w, 80, (0, 0, w, 80), (0, 0, 0), _HEADER_FRAME_WEIGHT)
+
+        # Mỗi panel render riêng để patch không lẫn chrome của panel chồng lên nó
+        panels = [(name, name, title, color, bg_color) for name, title, color, bg_color in _STATIC_PANELS]
+        panels += [(region, "alerts", _ALERT_PANEL_TITLE, color, _ALERT_PANEL_BG)
+                   for region, color in zip(_ALERT_CHROME_REGIONS, _ALERT_BORDER_COLORS)]
+        for region, name, title, color, bg_color in panels:
+            panel_x, panel_y, panel_width, panel_height = _panel_rect(name, canvas)
+            cv2.rectangle(canvas, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
+                         color, 2)
+            cv2.putText(canvas, title, (panel_x + 10, panel_y + 25),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+            cv2.line(canvas, (panel_x + 10, panel_y + 35), (panel_x + panel_width - 10, panel_y + 35),
+                      color, 1)
+            # Border dày 2px lấn 1px ra ngoài panel
+            take_patch(region, panel_x - 1, panel_y - 1, panel_x + panel_width + 1, panel_y + panel_height + 1,
+                       (panel_x, panel_y, panel_x + panel_width, panel_y + panel_height),
+                       bg_color, _PANEL_FRAME_WEIGHT)
+
+        return patches
+
+    def _composite_chrome(self, frame: np.ndarray, region: str):
+        """
+        Ghép lớp tĩnh (nền bán trong suốt + chrome) của một vùng lên frame trong một lượt
+
+        Gọi đúng tại vị trí trước đây blend nền rồi vẽ border/title nên thứ tự chồng
+        lớp giữa các panel (khi frame nhỏ và panel chồng nhau) không đổi.
+
+        Args:
+            frame: Frame hiển thị
+            region: "header", tên panel trong _STATIC_PANELS hoặc một _ALERT_CHROME_REGIONS
+        """
+        cache = self._overlay_chrome
+        if cache is None or cache[0] != frame.shape or cache[1] != self.session_id:
+            cache = (frame.shape, self.session_id, self._build_overlay_chrome(frame.shape))
+            self._overlay_chrome = cache
+        rows, cols, weight, offset = cache[2][region]
+        roi = frame[rows, cols]
+        cv2.multiply(roi, weight, dst=roi, scale=1.0 / 255.0)
+        cv2.add(roi, offset, dst=roi)
+
+    def _hud_keys(self, ctx: OverlayContext) -> tuple:
+        """
+        Khóa nội dung của từng panel HUD, theo thứ tự header, eye, posture, health,
+        statistics, alerts
+
+        Mỗi panel chỉ gồm giá trị làm đổi nội dung nó hiển thị: EAR (0.01), khoảng cách (cm),
+        posture status, drowsiness, blink, mức eye fatigue, số lỗi và giây của session.
+        Các giá trị hiển thị khác (FPS, số frame, success rate, progress bar, góc posture...)
+        được làm mới cùng giây của session nên trễ tối đa 1 giây.
+        """
+        eye_data = ctx.eye_data
+        ear = eye_data.get('avg_ear')
+        distance = eye_data.get('distance_cm')
+        ear_key = None if ear is None else round(ear, 2)
+        distance_key = None if distance is None else round(distance, 0)
+        posture_status = ctx.posture_data.get('status')
+        drowsy = bool(ctx.drowsy_data.get('drowsiness_detected'))
+        total_blinks = self.stats.total_blinks
+        second = int(ctx.clock.elapsed)
+        return (
+            (self.error_count, second),
+            (ear_key, distance_key, bool(ctx.blink_data.get('blink_detected')), total_blinks, second),
+            (posture_status, second),
+            (ear is None, drowsy, total_blinks,
+             classify_health(ctx.blink_rate, self.stats.avg_ear)[1], second),
+            (second,),
+            (ear_key, distance_key, posture_status, drowsy, total_blinks, second),
+        )
+
+    def _render_hud_layer(self, shape: Tuple[int, ...], ctx: OverlayContext,
+                          dirty: Optional[Tuple[bool, ...]] = None) -> List[tuple]:
+        """
+        Render header + panels thành lớp ghép được lên frame bất kỳ
+
+        Mọi thao tác vẽ của panel (vẽ đè màu, blend nền, blend sprite) đều affine theo
+        pixel frame bên dưới: out = frame * w + offset. Vẽ panels hai lần trên nền đen
+        (lo) và trắng (hi) cho offset = lo và w * 255 = hi - lo; ghép lên frame bằng
+        cv2.multiply + cv2.add uint8, lệch tối đa vài mức so với vẽ trực tiếp do làm tròn.
+
+        Patch được ghi đè vào buffer cấp phát sẵn cùng canvas (lớp cũ bị thay thế
+        ngay sau đó và chỉ thread overlay đọc nó) nên rebuild không cấp phát.
+
+        Args:
+            shape: Shape của frame hiển thị
+            ctx: Dữ liệu frame hiện tại
+            dirty: Cờ render lại theo panel (thứ tự như _hud_keys); None = render toàn bộ.
+                Bị bỏ qua khi các vùng chồng nhau (frame nhỏ) vì panel sau vẽ đè panel trước
+
+        Returns:
+            List: Patch (panel, rows, cols, weight, offset) uint8 theo vùng của _overlay_regions
+        """
+        canvases = self._hud_canvases
+        if canvases is None or canvases[0] != shape:
+            lo = np.empty(shape, dtype=np.uint8)
+            regions = self._overlay_regions(lo)
+            patches = [(panel, rows, cols, np.empty_like(lo[rows, cols]), np.empty_like(lo[rows, cols]))
+                       for panel, rows, cols in regions]
+            overlapping = any(
+                rows_a.start < rows_b.stop and rows_b.start < rows_a.stop
+                and cols_a.start < cols_b.stop and cols_b.start < cols_a.stop
+                for i, (_, rows_a, cols_a) in enumerate(regions)
+                for _, rows_b, cols_b in regions[i + 1:]
+            )
+            canvases = (shape, lo, np.empty(shape, dtype=np.uint8), patches, overlapping)
+            self._hud_canvases = canvases
+            dirty = None
+        lo, hi, patches, overlapping = canvases[1], canvases[2], canvases[3], canvases[4]
+        if dirty is None or overlapping:
+            todo = patches
+        else:
+            todo = [patch for patch in patches if dirty[patch[0]]]
+
+        drawers = (
+            self._draw_main_header_optimized,
+            self._draw_eye_tracking_panel_optimized,
+            self._draw_posture_panel_optimized,
+            self._draw_health_status_panel_optimized,
+            self._draw_statistics_panel_optimized,
+            self._draw_alerts_panel_optimized,
+        )
+        for canvas, value in ((lo, 0), (hi, 255)):
+            for _, rows, cols, _, _ in todo:
+                canvas[rows, cols] = value
+            if todo is patches:
+                for draw in drawers:
+                    draw(canvas, ctx)
+            else:
+                for panel, _, _, _, _ in todo:
+                    drawers[panel](canvas, ctx)
 
-        # Calculate FPS only once per second
+        for _, rows, cols, weight, offset in todo:
+            cv2.subtract(hi[rows, cols], lo[rows, cols], dst=weight)
+            np.copyto(offset, lo[rows, cols])
+        return patches
+
+    def _update_display_fps(self, current_time: float):
+        """
+        Đếm frame hiển thị và cập nhật stats.fps mỗi giây một lần
+        """
         self.display_fps_counter += 1
         if current_time - self.display_fps_time >= 1.0:
             display_fps = self.display_fps_counter / (current_time - self.display_fps_time)
             self.display_fps_counter = 0
             self.display_fps_time = current_time
-            self.stats['fps'] = display_fps
+            self.stats.fps = display_fps
+
+    def _overlay_regions(self, frame: np.ndarray) -> List[Tuple[int, slice, slice]]:
+        """
+        Các vùng (panel, rows, cols) chứa header và panels của comprehensive overlay,
+        panel là chỉ số theo thứ tự header, eye, posture, health, statistics, alerts
+
+        Mỗi panel mở rộng 1px cho border dày 2px, cộng phần nội dung vẽ tràn ra
+        ngoài khung: EAR bar của panel eye (tới panel_x + 300) và progress bar
+        của panel statistics (tới panel_y + 137).
+        """
+        h, w = frame.shape[:2]
+        rects = [(0, 0, w, 80)]
+        for name in ("eye", "posture", "health", "statistics", "alerts"):
+            panel_x, panel_y, panel_width, panel_height = _panel_rect(name, frame)
+            right = panel_x + panel_width
+            bottom = panel_y + panel_height
+            if name == "eye":
+                right = panel_x + 300
+            elif name == "statistics":
+                bottom = panel_y + 137
+            rects.append((panel_x - 1, panel_y - 1, right + 1, bottom + 1))
+
+        regions = []
+        for panel, (x1, y1, x2, y2) in enumerate(rects):
+            rows = slice(max(y1, 0), min(y2 + 1, h))
+            cols = slice(max(x1, 0), min(x2 + 1, w))
+            if rows.start < rows.stop and cols.start < cols.stop:
+                regions.append((panel, rows, cols))
+        return regions
+
+    def _draw_main_header_optimized(self, frame: np.ndarray, ctx: OverlayContext):
+        """
+        Vẽ header chính với system info - Optimized version
+        """
+        h, w = frame.shape[:2]
 
-        cv2.putText(frame, f"FPS: {self.stats['fps']:.1f} | Frames: {self.processed_frames} | Errors: {self.error_count}",
+        # Semi-transparent header background, main title và session info (lớp tĩnh render sẵn)
+        self._composite_chrome(frame, "header")
+
+        cv2.putText(frame, f"FPS: {self.stats.fps:.1f} | Frames: {self.processed_frames} | Errors: {self.error_count}",
                    (15, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
 
         # Status indicator
         status_color = (0, 255, 0) if self.error_count < 10 else (0, 255, 255) if self.error_count < 50 else (0, 0, 255)
         cv2.circle(frame, (w - 30, 30), 8, status_color, -1)
-        cv2.putText(frame, "ACTIVE", (w - 100, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.5, status_color, 1)
+        _put_text(frame, "ACTIVE", (w - 100, 35), 0.5, status_color, 1)
 
-    def _draw_eye_tracking_panel_optimized(self, frame: np.ndarray, frame_result: Dict[str, Any], frame_width: int, elapsed: float):
+    def _draw_eye_tracking_panel_optimized(self, frame: np.ndarray, ctx: OverlayContext):
         """
-        Vẽ eye tracking panel - Optimized version with pre-calculated elapsed time
+        Vẽ eye tracking panel - Optimized version with pre-calculated frame context
         """
-        eye_data = frame_result.get('eye_data', {})
-        blink_data = frame_result.get('blink_data', {})
+        eye_data = ctx.eye_data
+        blink_data = ctx.blink_data
 
         # Panel dimensions
-        panel_width = 280
-        panel_height = 180
-        panel_x = 15
-        panel_y = 100
-
-        # Background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (20, 20, 40), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
+        panel_x, panel_y, panel_width, panel_height = _panel_rect("eye", frame)
 
-        # Border
-        cv2.rectangle(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (0, 200, 255), 2)
-
-        # Title
-        cv2.putText(frame, "EYE TRACKING", (panel_x + 10, panel_y + 25),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 200, 255), 2)
-
-        # Separator line
-        cv2.line(frame, (panel_x + 10, panel_y + 35), (panel_x + panel_width - 10, panel_y + 35),
-                  (0, 200, 255), 1)
+        # Background, border, title và separator (lớp tĩnh render sẵn)
+        self._composite_chrome(frame, "eye")
 
         y_offset = panel_y + 55
         line_height = 18
@@ -654,12 +1514,7 @@ class AEyeProVisionApp:
             right_ear = eye_data.get('right_ear', 0)
 
             # Color coding for EAR
-            if ear > 0.27:
-                ear_color = (0, 255, 0)
-            elif ear > 0.22:
-                ear_color = (0, 255, 255)
-            else:
-                ear_color = (0, 100, 255)
+            ear_color = _EAR_COLORS[bisect_left(_EAR_BINS, ear)]
 
             # Draw EAR info
             cv2.putText(frame, f"L-EAR: {left_ear:.3f}", (panel_x + 10, y_offset),
@@ -682,145 +1537,76 @@ class AEyeProVisionApp:
                          (100, 100, 100), 1)
             y_offset += line_height
 
-        # Blink rate - use pre-calculated elapsed time
-        blink_rate = self.stats['total_blinks'] / max(elapsed/60, 0.1)
+        # Blink rate - use pre-calculated frame context
+        blink_rate = ctx.blink_rate
 
         if blink_data.get('blink_detected'):
-            cv2.putText(frame, "STATUS: BLINK DETECTED!", (panel_x + 10, y_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 2)
+            _put_text(frame, "STATUS: BLINK DETECTED!", (panel_x + 10, y_offset),
+                       0.5, (0, 255, 255), 2)
         else:
-            cv2.putText(frame, "STATUS: NORMAL", (panel_x + 10, y_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 0), 1)
+            _put_text(frame, "STATUS: NORMAL", (panel_x + 10, y_offset),
+                       0.4, (0, 255, 0), 1)
         y_offset += line_height
 
-        cv2.putText(frame, f"Total: {self.stats['total_blinks']} ({blink_rate:.1f}/min)",
-                   (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (200, 200, 200), 1)
+        _put_text(frame, f"Total: {self.stats.total_blinks} ({blink_rate:.1f}/min)",
+                   (panel_x + 10, y_offset), 0.4, (200, 200, 200), 1)
 
         # Distance
         if eye_data.get('distance_cm'):
             distance = eye_data['distance_cm']
-            if 50 <= distance <= 80:
-                distance_color = (0, 255, 0)
-            elif 30 <= distance <= 100:
-                distance_color = (255, 255, 0)
-            else:
-                distance_color = (255, 100, 100)
+            distance_color = _DIST_STYLES[_distance_zone(distance)][0]
             cv2.putText(frame, f"Distance: {distance:.1f}cm", (panel_x + 10, y_offset + line_height),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, distance_color, 1)
 
-    def _draw_posture_panel_optimized(self, frame: np.ndarray, frame_result: Dict[str, Any], frame_height: int, frame_width: int):
+    def _draw_posture_panel_optimized(self, frame: np.ndarray, ctx: OverlayContext):
         """
         Vẽ posture analysis panel - Optimized version
         """
-        posture_data = frame_result.get('posture_data', {})
-
-        # Panel dimensions - right side
-        panel_width = 280
-        panel_height = 200
-        panel_x = frame_width - panel_width - 15
-        panel_y = 100
+        posture_data = ctx.posture_data
 
-        # Background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (40, 20, 20), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
-
-        # Border
-        cv2.rectangle(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (255, 150, 0), 2)
-
-        # Title
-        cv2.putText(frame, "POSTURE ANALYSIS", (panel_x + 10, panel_y + 25),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 150, 0), 2)
+        # Panel dimensions
+        panel_x, panel_y, panel_width, panel_height = _panel_rect("posture", frame)
 
-        # Separator
-        cv2.line(frame, (panel_x + 10, panel_y + 35), (panel_x + panel_width - 10, panel_y + 35),
-                  (255, 150, 0), 1)
+        # Background, border, title và separator (lớp tĩnh render sẵn)
+        self._composite_chrome(frame, "posture")
 
         y_offset = panel_y + 55
         line_height = 18
 
-        # Head Movement Tracking
+        # Head Movement / Shoulder Analysis: classify all three angles in one kernel call
         head_side_angle = posture_data.get('head_side_angle')
-        if head_side_angle is not None and head_side_angle != 0:
-            # Color coding based on threshold
-            abs_angle = abs(head_side_angle)
-            if abs_angle <= 15:
-                color = (0, 255, 0)
-                status = "GOOD"
-            elif abs_angle <= 20:
-                color = (0, 255, 255)
-                status = "WARN"
-            else:
-                color = (0, 100, 255)
-                status = "POOR"
-
-            direction = "LEFT" if head_side_angle < 0 else "RIGHT" if head_side_angle > 0 else "CENTER"
-            cv2.putText(frame, f"Head Turn: {abs_angle:.1f}° {direction}",
-                       (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
-            cv2.putText(frame, status, (panel_x + 180, y_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
-            y_offset += line_height
-
         head_updown_angle = posture_data.get('head_updown_angle')
-        if head_updown_angle is not None and head_updown_angle != 0:
-            abs_angle = abs(head_updown_angle)
-            if abs_angle <= 15:
-                color = (0, 255, 0)
-                status = "GOOD"
-            elif abs_angle <= 22:
-                color = (0, 255, 255)
-                status = "WARN"
-            else:
-                color = (0, 100, 255)
-                status = "POOR"
-
-            direction = "DOWN" if head_updown_angle > 0 else "UP" if head_updown_angle < 0 else "LEVEL"
-            cv2.putText(frame, f"Head Tilt: {abs_angle:.1f}° {direction}",
-                       (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
-            cv2.putText(frame, status, (panel_x + 180, y_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
-            y_offset += line_height
-
-        # Shoulder Analysis
         shoulder_tilt = posture_data.get('shoulder_tilt')
-        if shoulder_tilt is not None and shoulder_tilt != 0:
-            abs_tilt = abs(shoulder_tilt)
-            if abs_tilt <= 10:
-                color = (0, 255, 0)
-                status = "GOOD"
-            elif abs_tilt <= 15:
-                color = (0, 255, 255)
-                status = "WARN"
-            else:
-                color = (0, 100, 255)
-                status = "POOR"
-
-            direction = "LEFT" if shoulder_tilt < 0 else "RIGHT" if shoulder_tilt > 0 else "LEVEL"
-            cv2.putText(frame, f"Shoulder: {abs_tilt:.1f}° {direction}",
+        abs_side, abs_updown, abs_tilt, side_code, updown_code, tilt_code = classify_panel_angles(
+            float(head_side_angle or 0.0), float(head_updown_angle or 0.0), float(shoulder_tilt or 0.0)
+        )
+
+        # Một dòng cho mỗi góc khác 0 (bỏ qua None/0): nhãn, giá trị tuyệt đối, hướng, mức
+        for (label, neg_dir, pos_dir, extra), angle, abs_angle, code in zip(
+            _POSTURE_ANGLE_ROWS,
+            (head_side_angle, head_updown_angle, shoulder_tilt),
+            (abs_side, abs_updown, abs_tilt),
+            (side_code, updown_code, tilt_code),
+        ):
+            if not angle:
+                continue
+            color, status = _PANEL_STATUS_STYLES[code]
+            direction = neg_dir if angle < 0 else pos_dir
+            cv2.putText(frame, f"{label}: {abs_angle:.1f}° {direction}",
                        (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
-            cv2.putText(frame, status, (panel_x + 180, y_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
-            y_offset += line_height + 5
+            _put_text(frame, status, (panel_x + 180, y_offset),
+                       0.4, color, 1)
+            y_offset += line_height + extra
 
         # Distance from camera
         distance = posture_data.get('eye_distance_cm') or posture_data.get('distance_cm')
         if distance is not None:
-            if 50 <= distance <= 80:
-                distance_color = (0, 255, 0)
-                distance_status = "OPTIMAL"
-            elif 30 <= distance <= 100:
-                distance_color = (255, 255, 0)
-                distance_status = "OK"
-            else:
-                distance_color = (255, 100, 100)
-                distance_status = "POOR"
+            distance_color, distance_status = _DIST_STYLES[_distance_zone(distance)]
 
             cv2.putText(frame, f"Distance: {distance:.1f} cm",
                        (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.5, distance_color, 1)
-            cv2.putText(frame, distance_status, (panel_x + 140, y_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, distance_color, 1)
+            _put_text(frame, distance_status, (panel_x + 140, y_offset),
+                       0.4, distance_color, 1)
             y_offset += line_height + 5
 
         # Visual posture indicator
@@ -839,65 +1625,45 @@ class AEyeProVisionApp:
             overall_color = (255, 255, 0)
             status_text = "[?] UNKNOWN"
 
-        cv2.putText(frame, status_text, (panel_x + 10, y_offset),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, overall_color, 2)
+        _put_text(frame, status_text, (panel_x + 10, y_offset),
+                   0.6, overall_color, 2)
 
-    def _draw_health_status_panel_optimized(self, frame: np.ndarray, frame_result: Dict[str, Any], frame_height: int, elapsed: float):
+    def _draw_health_status_panel_optimized(self, frame: np.ndarray, ctx: OverlayContext):
         """
-        Vẽ health status panel - Optimized version with pre-calculated elapsed time
+        Vẽ health status panel - Optimized version with pre-calculated frame context
         """
-        # Panel dimensions - left bottom
-        panel_width = 350
-        panel_height = 160
-        panel_x = 15
-        panel_y = frame_height - panel_height - 15
-
-        # Background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (20, 40, 20), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
-
-        # Border
-        cv2.rectangle(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (0, 255, 100), 2)
+        # Panel dimensions
+        panel_x, panel_y, panel_width, panel_height = _panel_rect("health", frame)
 
-        # Title
-        cv2.putText(frame, "HEALTH STATUS", (panel_x + 10, panel_y + 25),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 100), 2)
-
-        # Separator
-        cv2.line(frame, (panel_x + 10, panel_y + 35), (panel_x + panel_width - 10, panel_y + 35),
-                  (0, 255, 100), 1)
+        # Background, border, title và separator (lớp tĩnh render sẵn)
+        self._composite_chrome(frame, "health")
 
         y_offset = panel_y + 55
         line_height = 20
 
         # Get data
-        eye_data = frame_result.get('eye_data', {})
-        blink_data = frame_result.get('blink_data', {})
-        drowsy_data = frame_result.get('drowsy_data', {})
-
-        # Session duration - use pre-calculated elapsed time
-        hours = int(elapsed // 3600)
-        minutes = int((elapsed % 3600) // 60)
-        seconds = int(elapsed % 60)
-
-        cv2.putText(frame, f"Session: {hours:02d}:{minutes:02d}:{seconds:02d}",
-                   (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        eye_data = ctx.eye_data
+        drowsy_data = ctx.drowsy_data
+
+        # Session duration - use pre-calculated frame clock; chỉ format lại khi sang giây mới
+        elapsed_s = int(ctx.clock.elapsed)
+        if elapsed_s != self._session_clock_text[0]:
+            hours, rem = divmod(elapsed_s, 3600)
+            minutes, seconds = divmod(rem, 60)
+            self._session_clock_text = (elapsed_s, f"Session: {hours:02d}:{minutes:02d}:{seconds:02d}")
+
+        _put_text(frame, self._session_clock_text[1],
+                   (panel_x + 10, y_offset), 0.5, (200, 200, 200), 1)
         y_offset += line_height
 
-        # Blink rate analysis - use pre-calculated elapsed time
-        blink_rate = self.stats['total_blinks'] / max(elapsed/60, 0.1)
-        if 15 <= blink_rate <= 25:
-            blink_health = "NORMAL"
-            blink_color = (0, 255, 0)
-        else:
-            blink_health = "ABNORMAL"
-            blink_color = (255, 255, 0)
+        # Blink rate analysis - use pre-calculated frame context; blink rate và eye fatigue
+        # phân loại chung một lần gọi kernel
+        blink_rate = ctx.blink_rate
+        blink_code, fatigue_code = classify_health(blink_rate, self.stats.avg_ear)
+        blink_color, blink_health = _BLINK_HEALTH_STYLES[blink_code]
 
-        cv2.putText(frame, f"Blink Rate: {blink_rate:.1f}/min ({blink_health})",
-                   (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.5, blink_color, 1)
+        _put_text(frame, f"Blink Rate: {blink_rate:.1f}/min ({blink_health})",
+                   (panel_x + 10, y_offset), 0.5, blink_color, 1)
         y_offset += line_height
 
         # Drowsiness status
@@ -921,59 +1687,31 @@ class AEyeProVisionApp:
         else:
             drowsy_color = (0, 255, 0)
             drowsy_text = "[OK] AWAKE & ALERT"
-            duration_text = f"Events: {self.stats['drowsy_events']}"
+            duration_text = f"Events: {self.stats.drowsy_events}"
 
-        cv2.putText(frame, drowsy_text, (panel_x + 10, y_offset),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, drowsy_color, 2)
+        _put_text(frame, drowsy_text, (panel_x + 10, y_offset),
+                   0.5, drowsy_color, 2)
         y_offset += line_height
 
-        cv2.putText(frame, duration_text, (panel_x + 10, y_offset),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, drowsy_color, 1)
+        _put_text(frame, duration_text, (panel_x + 10, y_offset),
+                   0.4, drowsy_color, 1)
         y_offset += line_height
 
         # Eye fatigue indicator
         if eye_data.get('avg_ear'):
-            avg_ear = self.stats.get('avg_ear', eye_data['avg_ear'])
-            if avg_ear < 0.2:
-                fatigue_level = "HIGH"
-                fatigue_color = (0, 100, 255)
-            elif avg_ear < 0.25:
-                fatigue_level = "MEDIUM"
-                fatigue_color = (255, 255, 0)
-            else:
-                fatigue_level = "LOW"
-                fatigue_color = (0, 255, 0)
+            fatigue_color, fatigue_level = _FATIGUE_STYLES[fatigue_code]
+            _put_text(frame, f"Eye Fatigue: {fatigue_level}",
+                       (panel_x + 10, y_offset), 0.5, fatigue_color, 1)
 
-            cv2.putText(frame, f"Eye Fatigue: {fatigue_level}",
-                       (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.5, fatigue_color, 1)
-
-    def _draw_statistics_panel_optimized(self, frame: np.ndarray, frame_height: int, elapsed: float):
+    def _draw_statistics_panel_optimized(self, frame: np.ndarray, ctx: OverlayContext):
         """
-        Vẽ statistics panel - Optimized version with pre-calculated elapsed time
+        Vẽ statistics panel - Optimized version with pre-calculated frame context
         """
-        # Panel dimensions - center bottom
-        panel_width = 320
-        panel_height = 120
-        panel_x = 390  # Position after health status panel
-        panel_y = frame_height - panel_height - 15
-
-        # Background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (40, 40, 20), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
-
-        # Border
-        cv2.rectangle(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (255, 200, 0), 2)
+        # Panel dimensions
+        panel_x, panel_y, panel_width, panel_height = _panel_rect("statistics", frame)
 
-        # Title
-        cv2.putText(frame, "REAL-TIME STATISTICS", (panel_x + 10, panel_y + 25),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 200, 0), 2)
-
-        # Separator
-        cv2.line(frame, (panel_x + 10, panel_y + 35), (panel_x + panel_width - 10, panel_y + 35),
-                  (255, 200, 0), 1)
+        # Background, border, title và separator (lớp tĩnh render sẵn)
+        self._composite_chrome(frame, "statistics")
 
         y_offset = panel_y + 55
         line_height = 18
@@ -984,20 +1722,20 @@ class AEyeProVisionApp:
         y_offset += line_height
 
         success_rate = (self.processed_frames / max(self.frame_count, 1)) * 100
-        cv2.putText(frame, f"Success Rate: {success_rate:.1f}%",
-                   (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (200, 200, 200), 1)
+        _put_text(frame, f"Success Rate: {success_rate:.1f}%",
+                   (panel_x + 10, y_offset), 0.4, (200, 200, 200), 1)
         y_offset += line_height
 
-        cv2.putText(frame, f"Posture Alerts: {self.stats['posture_alerts']}",
-                   (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (200, 200, 200), 1)
+        _put_text(frame, f"Posture Alerts: {self.stats.posture_alerts}",
+                   (panel_x + 10, y_offset), 0.4, (200, 200, 200), 1)
         y_offset += line_height
 
-        # Progress bar for session - use pre-calculated elapsed time
-        progress = min((elapsed / 3600) * 100, 100)  # Progress towards 1 hour
+        # Progress bar for session - use pre-calculated frame clock
+        progress = min((ctx.clock.elapsed / 3600) * 100, 100)  # Progress towards 1 hour
         bar_width = int((progress / 100) * 200)
 
-        cv2.putText(frame, f"Session Progress: {progress:.1f}%",
-                   (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (200, 200, 200), 1)
+        _put_text(frame, f"Session Progress: {progress:.1f}%",
+                   (panel_x + 10, y_offset), 0.4, (200, 200, 200), 1)
         y_offset += line_height
 
         # Progress bar
@@ -1006,98 +1744,47 @@ class AEyeProVisionApp:
         cv2.rectangle(frame, (panel_x + 10, y_offset), (panel_x + 210, y_offset + 10),
                      (100, 100, 100), 1)
 
-    def _draw_alerts_panel_optimized(self, frame: np.ndarray, frame_result: Dict[str, Any], frame_height: int, frame_width: int):
+    def _draw_alerts_panel_optimized(self, frame: np.ndarray, ctx: OverlayContext):
         """
-        Vẽ alerts panel - Optimized version
+        Vẽ alerts panel - Optimized version with pre-calculated frame context
         """
         # Panel dimensions - right bottom
-        panel_width = 280
-        panel_height = 140
-        panel_x = frame_width - panel_width - 15
-        panel_y = frame_height - panel_height - 15
-
-        # Background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (40, 20, 40), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
+        panel_x, panel_y, panel_width, panel_height = _panel_rect("alerts", frame)
 
-        # Border (color based on alert level)
-        eye_data = frame_result.get('eye_data', {})
-        posture_data = frame_result.get('posture_data', {})
-        drowsy_data = frame_result.get('drowsy_data', {})
+        eye_data = ctx.eye_data
+        posture_data = ctx.posture_data
+        drowsy_data = ctx.drowsy_data
 
-        # Determine alert level
-        alert_count = 0
-        if eye_data.get('avg_ear', 0.3) < 0.22: alert_count += 1
-        if posture_data.get('status') == 'poor': alert_count += 1
-        if drowsy_data.get('drowsiness_detected'): alert_count += 2  # Higher priority
+        # Alert level và danh sách alerts trong một lần gọi kernel
+        # (blink rate - use pre-calculated frame context)
+        border_code, alert_flags = classify_alerts(
+            float(eye_data.get('avg_ear', 0.3)),
+            float(eye_data.get('distance_cm') or 0.0),
+            ctx.blink_rate,
+            posture_data.get('status') == 'poor',
+            bool(drowsy_data.get('drowsiness_detected')),
+        )
 
-        if alert_count >= 3:
-            border_color = (0, 100, 255)  # Red - Critical
-        elif alert_count >= 2:
-            border_color = (0, 255, 255)  # Yellow - Warning
-        else:
-            border_color = (0, 255, 0)    # Green - Good
-
-        cv2.rectangle(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     border_color, 2)
-
-        # Title
-        cv2.putText(frame, "ALERTS & RECOMMENDATIONS", (panel_x + 10, panel_y + 25),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, border_color, 2)
-
-        # Separator
-        cv2.line(frame, (panel_x + 10, panel_y + 35), (panel_x + panel_width - 10, panel_y + 35),
-                  border_color, 1)
+        # Background, border, title và separator theo màu của alert level (lớp tĩnh render sẵn)
+        self._composite_chrome(frame, _ALERT_CHROME_REGIONS[border_code])
 
         y_offset = panel_y + 55
         line_height = 16
 
-        # Generate alerts
-        alerts = []
-
-        # Eye-related alerts
-        if eye_data.get('distance_cm'):
-            distance = eye_data['distance_cm']
-            if distance < 40:
-                alerts.append(("[DIST] Too close to screen!", (255, 100, 100)))
-            elif distance > 100:
-                alerts.append(("[DIST] Too far from screen!", (255, 100, 100)))
-
-        if eye_data.get('avg_ear', 0.3) < 0.22:
-            alerts.append(("[EYE] Eye fatigue detected", (255, 255, 0)))
-
-        # Posture alerts
-        if posture_data.get('status') == 'poor':
-            alerts.append(("[POSTURE] Poor sitting posture", (255, 150, 0)))
-
-        # Drowsiness alerts - check for EAR approaching threshold
-        ear_value = eye_data.get('avg_ear', 0.3)
-        if drowsy_data.get('drowsiness_detected'):
-            alerts.append(("[!] DROWSINESS WARNING! (3s EAR low)", (0, 100, 255)))
-        elif ear_value < 0.28:  # Warning threshold before 3s mark
-            alerts.append(("[!] EAR getting low - stay alert!", (255, 255, 0)))
-
-        # Blink rate alerts - use elapsed time from start
-        elapsed = time.time() - self.start_time if self.start_time else 0
-        blink_rate = self.stats['total_blinks'] / max(elapsed/60, 0.1)
-        if blink_rate < 10:
-            alerts.append(("[BLINK] Low blink rate - dry eyes", (255, 200, 0)))
-        elif blink_rate > 30:
-            alerts.append(("[BLINK] High blink rate - stress?", (255, 200, 0)))
+        # Generate alerts (distance, eye, posture, drowsiness, blink rate)
+        alerts = [(text, color) for bit, text, color in _ALERT_MESSAGES if alert_flags & bit]
 
         # Display alerts (max 4)
         for i, (alert_text, color) in enumerate(alerts[:4]):
             if y_offset + line_height < panel_y + panel_height - 10:
-                cv2.putText(frame, alert_text, (panel_x + 10, y_offset),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.35, color, 1)
+                _put_text(frame, alert_text, (panel_x + 10, y_offset),
+                           0.35, color, 1)
                 y_offset += line_height
 
         # If no alerts
         if not alerts:
-            cv2.putText(frame, "[OK] All systems normal", (panel_x + 10, y_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+            _put_text(frame, "[OK] All systems normal", (panel_x + 10, y_offset),
+                       0.5, (0, 255, 0), 1)
     
     def _draw_face_landmarks(self, frame: np.ndarray, frame_result: Dict[str, Any]):
         """
@@ -1107,59 +1794,45 @@ class AEyeProVisionApp:
         if not self.show_face_mesh:
             return
             
-        eye_data = frame_result.get('eye_data', {})
+        eye_data = frame_result.get('eye_data') or _EMPTY_DICT
 
-        if eye_data and eye_data.get('landmarks'):
+        if eye_data.get('landmarks'):
             h, w = frame.shape[:2]
             landmarks = eye_data['landmarks']
             
             # VẼ TẤT CẢ 468 FACE MESH LANDMARKS
-            if True:
-                # Vẽ các điểm nhỏ màu xanh lá nhạt cho toàn bộ khuôn mặt
-                for idx, lm in enumerate(landmarks):
-                    x = int(lm.x * w)
-                    y = int(lm.y * h)
-                    cv2.circle(frame, (x, y), 1, (100, 255, 150), -1)
-                
-                # VẼ FACE CONTOUR (đường viền khuôn mặt) - highlight hơn
-                # MediaPipe Face Mesh face oval indices
-                FACE_OVAL = [10, 338, 297, 332, 284, 251, 389, 356, 454, 323, 361, 288,
-                            397, 365, 379, 378, 400, 377, 152, 148, 176, 149, 150, 136,
-                            172, 58, 132, 93, 234, 127, 162, 21, 54, 103, 67, 109]
-                
-                for i in range(len(FACE_OVAL)):
-                    pt1_idx = FACE_OVAL[i]
-                    pt2_idx = FACE_OVAL[(i + 1) % len(FACE_OVAL)]
-                    pt1 = (int(landmarks[pt1_idx].x * w), int(landmarks[pt1_idx].y * h))
-                    pt2 = (int(landmarks[pt2_idx].x * w), int(landmarks[pt2_idx].y * h))
-                    cv2.line(frame, pt1, pt2, (0, 255, 200), 2)
+            # Tọa độ pixel của mọi landmark trong một array (cắt phần thập phân như int());
+            # dùng luôn array pixel EyeTracker đã decode nếu có
+            lm_px = eye_data.get('landmarks_px')
+            if lm_px is not None:
+                ipts = lm_px.astype(np.int32)
+            else:
+                pts = np.fromiter(
+                    (c for lm in landmarks for c in (lm.x, lm.y)),
+                    dtype=np.float64,
+                    count=2 * len(landmarks),
+                ).reshape(-1, 2)
+                pts *= (w, h)
+                ipts = pts.astype(np.int32)
+
+            # Vẽ các điểm nhỏ màu xanh lá nhạt cho toàn bộ khuôn mặt: scatter mẫu
+            # cv2.circle bán kính 1 thay vì 468 lần gọi cv2.circle
+            _scatter_dots(frame, ipts, _LANDMARK_DOT_DY, _LANDMARK_DOT_DX, (100, 255, 150))
+
+            # VẼ FACE CONTOUR (đường viền khuôn mặt) - highlight hơn, một lần polylines
+            cv2.polylines(frame, [ipts[_FACE_OVAL]], True, (0, 255, 200), 2)
             
             # Draw eye regions with enhanced visualization
             if eye_data.get('left_eye') is not None and eye_data.get('right_eye') is not None:
-                left_eye = eye_data['left_eye']
-                right_eye = eye_data['right_eye']
-
-                # Draw left eye with connected points
-                for i, (x, y) in enumerate(left_eye):
-                    cv2.circle(frame, (int(x), int(y)), 3, (0, 255, 100), -1)
-                    if i < len(left_eye) - 1:
-                        cv2.line(frame, (int(x), int(y)),
-                               (int(left_eye[i+1][0]), int(left_eye[i+1][1])),
-                               (0, 255, 150), 2)
-                cv2.line(frame, (int(left_eye[-1][0]), int(left_eye[-1][1])),
-                       (int(left_eye[0][0]), int(left_eye[0][1])),
-                       (0, 255, 150), 2)
-
-                # Draw right eye with connected points
-                for i, (x, y) in enumerate(right_eye):
-                    cv2.circle(frame, (int(x), int(y)), 3, (100, 255, 0), -1)
-                    if i < len(right_eye) - 1:
-                        cv2.line(frame, (int(x), int(y)),
-                               (int(right_eye[i+1][0]), int(right_eye[i+1][1])),
-                               (150, 255, 0), 2)
-                cv2.line(frame, (int(right_eye[-1][0]), int(right_eye[-1][1])),
-                       (int(right_eye[0][0]), int(right_eye[0][1])),
-                       (150, 255, 0), 2)
+                # Draw each eye with connected points: một polylines khép kín cho đường
+                # viền rồi scatter các điểm lên trên
+                for eye, dot_color, line_color in (
+                    (eye_data['left_eye'], (0, 255, 100), (0, 255, 150)),
+                    (eye_data['right_eye'], (100, 255, 0), (150, 255, 0)),
+                ):
+                    eye_pts = np.asarray(eye).astype(np.int32)  # cắt phần thập phân như int()
+                    cv2.polylines(frame, [eye_pts], True, line_color, 2)
+                    _scatter_dots(frame, eye_pts, _EYE_DOT_DY, _EYE_DOT_DX, dot_color)
 
             # Draw gaze point with enhanced visualization
             if eye_data.get('gaze_point'):
@@ -1181,9 +1854,7 @@ class AEyeProVisionApp:
         h, w = frame.shape[:2]
 
         # Semi-transparent header background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), (w, 80), (0, 0, 0), -1)
-        cv2.addWeighted(frame, 0.3, overlay, 0.7, 0, frame)
+        _blend_rect(frame, (0, 0), (w, 80), (0, 0, 0), 0.3)
 
         # Main title
         cv2.putText(frame, "AEYEPRO HEALTH MONITORING SYSTEM", (15, 25),
@@ -1201,7 +1872,7 @@ class AEyeProVisionApp:
             self.display_fps_counter = 0
             self.display_fps_time = current_time
         else:
-            display_fps = self.stats.get('fps', 0)
+            display_fps = self.stats.fps
 
         cv2.putText(frame, f"FPS: {display_fps:.1f} | Frames: {self.processed_frames} | Errors: {self.error_count}",
                    (15, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
@@ -1225,10 +1896,7 @@ class AEyeProVisionApp:
         panel_y = 100
 
         # Background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (20, 20, 40), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
+        _blend_rect(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height), (20, 20, 40), 0.7)
 
         # Border
         cv2.rectangle(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
@@ -1283,7 +1951,7 @@ class AEyeProVisionApp:
             y_offset += line_height
 
         # Blink status and count
-        blink_rate = self.stats['total_blinks'] / max((time.time() - self.start_time) / 60, 0.1)
+        blink_rate = self.stats.total_blinks / max((time.time() - self.start_time) / 60, 0.1)
 
         if blink_data.get('blink_detected'):
             cv2.putText(frame, "STATUS: BLINK DETECTED!", (panel_x + 10, y_offset),
@@ -1293,7 +1961,7 @@ class AEyeProVisionApp:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 0), 1)
         y_offset += line_height
 
-        cv2.putText(frame, f"Total: {self.stats['total_blinks']} ({blink_rate:.1f}/min)",
+        cv2.putText(frame, f"Total: {self.stats.total_blinks} ({blink_rate:.1f}/min)",
                    (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (200, 200, 200), 1)
 
         # Distance
@@ -1316,10 +1984,7 @@ class AEyeProVisionApp:
         panel_y = 100
 
         # Background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (40, 20, 20), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
+        _blend_rect(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height), (40, 20, 20), 0.7)
 
         # Border
         cv2.rectangle(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
@@ -1442,39 +2107,25 @@ class AEyeProVisionApp:
         """
         Vẽ visual indicator cho posture (simplified human figure)
         """
-        # Draw simple stick figure representation
-        figure_height = 50
-        figure_width = 30
-
-        # Head
-        head_center = (x + figure_width // 2, y + 10)
-        cv2.circle(frame, head_center, 8, (255, 255, 255), 2)
-
-        # Body
-        body_start = (head_center[0], head_center[1] + 8)
-        body_end = (head_center[0], y + 35)
-        cv2.line(frame, body_start, body_end, (255, 255, 255), 2)
-
-        # Arms
-        shoulder_y = body_start[1] + 8
-        left_arm_end = (body_start[0] - 15, shoulder_y + 15)
-        right_arm_end = (body_start[0] + 15, shoulder_y + 15)
-
         # Color arms based on shoulder tilt
         shoulder_tilt = posture_data.get('shoulder_tilt', 0)
         if shoulder_tilt is None:
             shoulder_tilt = 0
-        arm_color = (0, 255, 0) if abs(shoulder_tilt) <= 10 else (255, 255, 0) if abs(shoulder_tilt) <= 15 else (255, 100, 100)
-
-        cv2.line(frame, body_start, left_arm_end, arm_color, 3)
-        cv2.line(frame, body_start, right_arm_end, arm_color, 3)
-
-        # Legs
-        legs_start = body_end
-        left_leg_end = (legs_start[0] - 10, legs_start[1] + 15)
-        right_leg_end = (legs_start[0] + 10, legs_start[1] + 15)
-        cv2.line(frame, legs_start, left_leg_end, (255, 255, 255), 2)
-        cv2.line(frame, legs_start, right_leg_end, (255, 255, 255), 2)
+        abs_tilt = abs(shoulder_tilt)
+        level = 0 if abs_tilt <= 10 else 1 if abs_tilt <= 15 else 2
+
+        # Simple stick figure: dán figure đã rasterize sẵn (một cv2.copyTo qua mask)
+        # thay vì 1 circle + 6 line mỗi frame
+        tile, mask = _POSTURE_FIGURES[level]
+        x0, y0 = x - _FIGURE_PAD, y - _FIGURE_PAD
+        th, tw = mask.shape
+        fh, fw = frame.shape[:2]
+        sx0, sy0 = max(-x0, 0), max(-y0, 0)
+        sx1, sy1 = min(tw, fw - x0), min(th, fh - y0)
+        if sx1 <= sx0 or sy1 <= sy0:
+            return
+        cv2.copyTo(tile[sy0:sy1, sx0:sx1], mask[sy0:sy1, sx0:sx1],
+                   frame[y0 + sy0:y0 + sy1, x0 + sx0:x0 + sx1])
 
     def _draw_health_status_panel(self, frame: np.ndarray, frame_result: Dict[str, Any], frame_height: int):
         """
@@ -1487,10 +2138,7 @@ class AEyeProVisionApp:
         panel_y = frame_height - panel_height - 15
 
         # Background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (20, 40, 20), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
+        _blend_rect(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height), (20, 40, 20), 0.7)
 
         # Border
         cv2.rectangle(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
@@ -1523,7 +2171,7 @@ class AEyeProVisionApp:
         y_offset += line_height
 
         # Blink rate analysis
-        blink_rate = self.stats['total_blinks'] / max(elapsed/60, 0.1)
+        blink_rate = self.stats.total_blinks / max(elapsed/60, 0.1)
         if 15 <= blink_rate <= 25:
             blink_health = "NORMAL"
             blink_color = (0, 255, 0)
@@ -1556,7 +2204,7 @@ class AEyeProVisionApp:
         else:
             drowsy_color = (0, 255, 0)
             drowsy_text = "[OK] AWAKE & ALERT"
-            duration_text = f"Events: {self.stats['drowsy_events']}"
+            duration_text = f"Events: {self.stats.drowsy_events}"
 
         cv2.putText(frame, drowsy_text, (panel_x + 10, y_offset),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, drowsy_color, 2)
@@ -1568,7 +2216,7 @@ class AEyeProVisionApp:
 
         # Eye fatigue indicator
         if eye_data.get('avg_ear'):
-            avg_ear = self.stats.get('avg_ear', eye_data['avg_ear'])
+            avg_ear = self.stats.avg_ear
             if avg_ear < 0.2:
                 fatigue_level = "HIGH"
                 fatigue_color = (0, 100, 255)
@@ -1593,10 +2241,7 @@ class AEyeProVisionApp:
         panel_y = frame_height - panel_height - 15
 
         # Background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (40, 40, 20), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
+        _blend_rect(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height), (40, 40, 20), 0.7)
 
         # Border
         cv2.rectangle(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
@@ -1623,7 +2268,7 @@ class AEyeProVisionApp:
                    (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (200, 200, 200), 1)
         y_offset += line_height
 
-        cv2.putText(frame, f"Posture Alerts: {self.stats['posture_alerts']}",
+        cv2.putText(frame, f"Posture Alerts: {self.stats.posture_alerts}",
                    (panel_x + 10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (200, 200, 200), 1)
         y_offset += line_height
 
@@ -1653,10 +2298,7 @@ class AEyeProVisionApp:
         panel_y = frame_height - panel_height - 15
 
         # Background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (40, 20, 40), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
+        _blend_rect(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height), (40, 20, 40), 0.7)
 
         # Border (color based on alert level)
         eye_data = frame_result.get('eye_data', {})
@@ -1717,7 +2359,7 @@ class AEyeProVisionApp:
 
         # Blink rate alerts
         elapsed = time.time() - self.start_time if self.start_time else 0
-        blink_rate = self.stats['total_blinks'] / max(elapsed/60, 0.1)
+        blink_rate = self.stats.total_blinks / max(elapsed/60, 0.1)
         if blink_rate < 10:
             alerts.append(("[BLINK] Low blink rate - dry eyes", (255, 200, 0)))
         elif blink_rate > 30:
@@ -1735,20 +2377,29 @@ class AEyeProVisionApp:
             cv2.putText(frame, "[OK] All systems normal", (panel_x + 10, y_offset),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
 
-    def _draw_timestamp(self, frame: np.ndarray):
+    def _draw_timestamp(self, frame: np.ndarray, current_time: Optional[float] = None):
         """
         Vẽ real-time timestamp
         """
-        timestamp = time.strftime("%H:%M:%S")
+        timestamp = self._clock_text(current_time)
         h, w = frame.shape[:2]
 
         # Semi-transparent background for timestamp
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (w - 120, 90), (w - 10, 115), (0, 0, 0), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
+        _blend_rect(frame, (w - 120, 90), (w - 10, 115), (0, 0, 0), 0.7)
 
-        cv2.putText(frame, timestamp, (w - 110, 108),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        _put_text(frame, timestamp, (w - 110, 108), 0.5, (255, 255, 255), 1)
+
+    def _clock_text(self, current_time: Optional[float] = None) -> str:
+        """
+        Giờ hiện tại dạng HH:MM:SS; strftime chỉ chạy khi sang giây mới
+
+        Args:
+            current_time: time.time() của frame (None = tự đọc đồng hồ)
+        """
+        now_s = int(time.time() if current_time is None else current_time)
+        if now_s != self._timestamp_text[0]:
+            self._timestamp_text = (now_s, time.strftime("%H:%M:%S", time.localtime(now_s)))
+        return self._timestamp_text[1]
 
     def _add_camera_overlay(self, frame: np.ndarray, frame_result: Dict[str, Any]):
         """
@@ -1761,9 +2412,8 @@ class AEyeProVisionApp:
         h, w = frame.shape[:2]
 
         # Create semi-transparent overlay for text background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, h-150), (w-10, h-10), (0, 0, 0), -1)
-        frame = cv2.addWeighted(frame, 0.7, overlay, 0.3, 0)
+        frame = frame.copy()
+        _blend_rect(frame, (10, h-150), (w-10, h-10), (0, 0, 0), 0.7)
 
         # Get data for display
         eye_data = frame_result.get('eye_data', {})
@@ -1833,10 +2483,7 @@ class AEyeProVisionApp:
         panel_height = 200
 
         # Semi-transparent background for posture data
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height),
-                     (0, 0, 0), -1)
-        cv2.addWeighted(frame, 0.7, overlay, 0.3, 0, frame)
+        _blend_rect(frame, (panel_x, panel_y), (panel_x + panel_width, panel_y + panel_height), (0, 0, 0), 0.7)
 
         # Title
         cv2.putText(frame, "POSTURE ANALYSIS", (panel_x + 10, panel_y + 25),
@@ -1904,10 +2551,8 @@ class AEyeProVisionApp:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
 
         # Add timestamp
-        import time
-        timestamp = time.strftime("%H:%M:%S")
-        cv2.putText(frame, f"Time: {timestamp}", (panel_x + 10, panel_y + panel_height - 10),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, (200, 200, 200), 1)
+        _put_text(frame, f"Time: {self._clock_text()}", (panel_x + 10, panel_y + panel_height - 10),
+                   0.4, (200, 200, 200), 1)
 
         return frame
 
@@ -1924,40 +2569,25 @@ class AEyeProVisionApp:
         if not posture_data:
             return posture_data
 
-        # Helper function to normalize angle to [-180, 180] range
-        def normalize_angle(angle):
-            if angle is None:
-                return None
-            # Normalize to [-180, 180]
-            while angle > 180:
-                angle -= 360
-            while angle < -180:
-                angle += 360
-            return float(angle)
-
-        # Normalize all angle values
-        angle_keys = [
-            'head_side_angle',    # Yaw: quay ngang
-            'head_updown_angle',  # Pitch: nghiêng lên/xuống
-            'head_roll',          # Roll: nghiêng bên
-            'shoulder_tilt',      # Tilt vai
-            'left_shoulder_angle',
-            'right_shoulder_angle'
-        ]
-
-        for key in angle_keys:
-            if key in posture_data and posture_data[key] is not None:
-                posture_data[key] = normalize_angle(posture_data[key])
+        # Normalize all angle values to (-180, 180] bằng một phép modulo (không lặp)
+        for key in _POSTURE_ANGLE_KEYS:
+            angle = posture_data.get(key)
+            if angle is not None:
+                posture_data[key] = 180.0 - ((180.0 - float(angle)) % 360.0)
 
         return posture_data
 
-    def update_fps_statistics(self):
+    def update_fps_statistics(self, clock: Optional[FrameClock] = None):
         """
         Cập nhật FPS statistics cho display purposes
+
+        Args:
+            clock: Thời gian của vòng loop hiện tại (None = tự đọc đồng hồ)
         """
-        current_time = time.time()
-        elapsed = current_time - self.start_time if self.start_time else 1
-        self.stats['fps'] = self.processed_frames / elapsed if elapsed > 0 else 0
+        if clock is None:
+            clock = FrameClock.tick(self.start_time)
+        elapsed = clock.elapsed if self.start_time else 1
+        self.stats.fps = self.processed_frames / elapsed if elapsed > 0 else 0
 
     def save_session_summary(self):
         """
@@ -1987,7 +2617,11 @@ class AEyeProVisionApp:
         }
 
         # ✅ SAVE TO SUMMARY CSV ONLY (không JSON - storage optimized)
-        append_csv_row(summary_row, self.summary_csv_file)
+        if self._summary_writer is not None:
+            self._summary_writer.writerow(summary_row)
+            self._summary_fh.close()
+            self._summary_fh = None
+            self._summary_writer = None
 
         # ✅ HEALTH DATA COLLECTOR SẼ TỰ ĐỘNG QUẢN LÝ DATA LOGGING
         print("[INFO] Health Data Collector is handling all data storage automatically")
@@ -2037,39 +2671,47 @@ class AEyeProVisionApp:
         print("Press Ctrl+C to stop monitoring or 'q' in camera window")
         print("=" * 60)
 
+        # Nhịp loop 30 FPS theo deadline trên đồng hồ monotonic (không nhảy khi chỉnh giờ hệ thống)
+        frame_interval = 1.0 / 30.0
+        next_deadline = time.monotonic()
+
         try:
             while self.running and not self.shutdown_requested:
-                loop_start = time.time()
+                # Đọc đồng hồ một lần cho cả vòng loop
+                clock = FrameClock.tick(self.start_time)
 
                 # Process frame
-                frame_result = self.process_frame()
+                frame_result = self.process_frame(clock=clock)
 
                 # Update statistics
                 self.update_statistics(frame_result)
 
                 # Update FPS for display
-                self.update_fps_statistics()
+                self.update_fps_statistics(clock)
 
                 # Save data
-                self.save_frame_data(frame_result, self.frame_count)
+                self.save_frame_data(frame_result, self.frame_count, clock)
 
-                # Update camera display with comprehensive overlay
-                self.display_camera_feed(frame_result)
+                # Update camera display with comprehensive overlay (headless: không dựng overlay)
+                if self.show_camera:
+                    self.display_camera_feed(frame_result, clock)
 
                 self.frame_count += 1
 
-                # Frame rate control (target 30 FPS)
-                processing_time = time.time() - loop_start
-                target_frame_time = 1.0 / 30.0  # 30 FPS
-                if processing_time < target_frame_time:
-                    time.sleep(target_frame_time - processing_time)
+                # Frame rate control (target 30 FPS): ngủ tới deadline kế tiếp; frame bị trễ
+                # thì đặt lại deadline từ hiện tại thay vì dồn trễ sang các frame sau
+                next_deadline += frame_interval
+                sleep_for = next_deadline - time.monotonic()
+                if sleep_for > 0:
+                    time.sleep(sleep_for)
+                else:
+                    next_deadline = time.monotonic()
 
             if self.shutdown_requested:
                 print("\n[STOPPED] Monitoring stopped by user request")
 
         except Exception as e:
             print(f"\n[ERROR] Error during monitoring: {e}")
-            import traceback
             traceback.print_exc()
         finally:
             self.running = False
@@ -2084,6 +2726,9 @@ class AEyeProVisionApp:
         print("\n[SHUTTING DOWN] AEyePro Vision System...")
 
         # Stop all modules
+        self._stop_posture_worker()
+        self._stop_overlay_worker()
+
         if self.eye_tracker:
             self.eye_tracker.stop()
             print("[OK] Eye tracker stopped")
@@ -2168,7 +2813,6 @@ def main():
         return 0 if success else 1
     except Exception as e:
         print(f"[FATAL ERROR] {e}")
-        import traceback
         traceback.print_exc()
         return 1
 
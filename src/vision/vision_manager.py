@@ -11,12 +11,12 @@ Version: 1.0.0
 import time
 import threading
 import traceback
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import cv2
 import numpy as np
 
-from vision.vision_app import AEyeProVisionApp
+from vision.vision_app import AEyeProVisionApp, FrameClock
 
 
 class VisionManager:
@@ -38,6 +38,20 @@ class VisionManager:
     - Prevents race conditions between Flask routes and vision thread
     """
     
+    # Target processing rate of the vision loop
+    TARGET_FPS = 30
+    FRAME_INTERVAL = 1.0 / TARGET_FPS
+    
+    # Posture analysis runs on every Nth frame (~10 Hz); posture changes far
+    # more slowly than eye state, so the other frames reuse the latest result
+    POSTURE_EVERY_N_FRAMES = 3
+    
+    # Number of rotating annotated-frame buffers
+    _FRAME_BUF_SLOTS = 3
+    
+    # Overlay shown while no face is detected
+    NO_FACE_MESSAGE = "No Face Detected - Please position your face in view"
+    
     def __init__(self, config_path: str = "settings.json"):
         """
         Initialize Vision Manager with configuration
@@ -55,13 +69,26 @@ class VisionManager:
         self.vision_thread: Optional[threading.Thread] = None
         self.is_running: bool = False
         
+        # Set by stop() to end the vision loop; also wakes it from its frame pacing wait
+        self._stop_event = threading.Event()
+        
         # Thread safety lock to prevent race conditions
         # This lock protects: is_running, vision_app, vision_thread
         self.lock = threading.Lock()
         
         # Latest processed data from vision modules
-        # Access to these should be protected by the lock
+        # Published by the vision thread as whole-object rebinds (atomic under the
+        # GIL), so readers take a reference without acquiring the lock
         self.latest_frame: Optional[np.ndarray] = None
+        # Rotating annotated-frame buffers: the producer draws into one while
+        # latest_frame points at another, so publishing is a pointer swap. With
+        # three slots a buffer is only rewritten two frames after it stopped
+        # being latest_frame, leaving lock-free readers ample time to copy it
+        self._frame_buffers: List[Optional[np.ndarray]] = [None] * self._FRAME_BUF_SLOTS
+        self._write_idx: int = 0
+        # Cached "No Face Detected" overlay: (frame shape, bbox slices, text pixels, glyph mask)
+        self._no_face_overlay: Optional[tuple] = None
+        # Built fresh for every publish and never mutated afterwards
         self.latest_health_metrics: Dict[str, Any] = {}
         
         # Error tracking
@@ -131,6 +158,7 @@ class VisionManager:
                 
                 # Mark as running before starting thread
                 self.is_running = True
+                self._stop_event.clear()
                 
                 # Create and start the vision processing thread
                 # daemon=True ensures thread terminates when main program exits
@@ -187,39 +215,40 @@ class VisionManager:
                     "error": "NOT_RUNNING"
                 }
             
+            # Signal the vision loop to stop; the event also interrupts its pacing wait
+            self.is_running = False
+            self._stop_event.set()
+            vision_thread = self.vision_thread
+            vision_app = self.vision_app
+        
+        # Wait for the vision thread to finish (with timeout) without holding the
+        # lock, so get_status() is not blocked for the duration of the join
+        if vision_thread and vision_thread.is_alive() and vision_thread is not threading.current_thread():
+            vision_thread.join(timeout=5.0)
+        
+        with self.lock:
             try:
-                # Signal the vision loop to stop
-                self.is_running = False
-                
-                # Wait for the vision thread to finish (with timeout)
-                if self.vision_thread and self.vision_thread.is_alive():
-                    # Release the lock temporarily while waiting for thread
-                    # to prevent deadlock if thread is trying to acquire lock
-                    threading.Thread(
-                        target=self._wait_for_thread_shutdown,
-                        daemon=True
-                    ).start()
-                
                 # Shutdown vision application and release resources
-                if self.vision_app:
+                if vision_app:
                     # Stop health data collector
-                    if hasattr(self.vision_app, 'health_collector') and self.vision_app.health_collector:
-                        self.vision_app.health_collector.stop_collection()
+                    if hasattr(vision_app, 'health_collector') and vision_app.health_collector:
+                        vision_app.health_collector.stop_collection()
                         print("[OK] Health Data Collector stopped")
                     
                     # Call shutdown which will save summary and cleanup
-                    if hasattr(self.vision_app, 'shutdown'):
-                        self.vision_app.shutdown()
+                    if hasattr(vision_app, 'shutdown'):
+                        vision_app.shutdown()
                     
                     # Stop eye tracker to release camera
-                    if hasattr(self.vision_app, 'eye_tracker') and self.vision_app.eye_tracker:
-                        self.vision_app.eye_tracker.stop()
-                    
-                    self.vision_app = None
+                    if hasattr(vision_app, 'eye_tracker') and vision_app.eye_tracker:
+                        vision_app.eye_tracker.stop()
                 
-                # Clear cached data
-                self.latest_frame = None
-                self.latest_health_metrics = {}
+                # Clear cached data, unless start() already brought up a new session
+                # while the old thread was being joined
+                if not self.is_running:
+                    self.vision_app = None
+                    self.latest_frame = None
+                    self.latest_health_metrics = {}
                 
                 return {
                     "success": True,
@@ -235,14 +264,26 @@ class VisionManager:
                     "details": traceback.format_exc()
                 }
     
-    def _wait_for_thread_shutdown(self):
+    def _pace(self, next_deadline: float) -> float:
         """
-        Helper method to wait for vision thread shutdown with timeout
+        Wait until the next frame deadline on a monotonic schedule
+        
+        Processing time is absorbed by the schedule instead of being added on top
+        of a fixed sleep. If the loop has fallen behind, the schedule restarts from
+        now rather than bursting to catch up. Returns early when stop() is called.
         
-        This runs in a separate thread to avoid blocking the stop() method
+        Args:
+            next_deadline: Monotonic deadline of the frame just processed
+            
+        Returns:
+            Monotonic deadline of the next frame
         """
-        if self.vision_thread:
-            self.vision_thread.join(timeout=5.0)
+        next_deadline += self.FRAME_INTERVAL
+        now = time.monotonic()
+        if next_deadline < now:
+            next_deadline = now
+        self._stop_event.wait(timeout=next_deadline - now)
+        return next_deadline
     
     def _vision_loop(self):
         """
@@ -260,84 +301,143 @@ class VisionManager:
         5. Emit data via WebSocket (if connected)
         
         Thread Safety:
-            Acquires self.lock only for brief updates to shared state
+            Never acquires self.lock: results are published by atomic rebinding
         """
         print("[VisionManager] Vision processing loop started")
         
         frame_id = 0
+        posture_counter = 0
+        next_deadline = time.monotonic()
         
         while True:
-            # Check if we should continue running (thread-safe check)
-            with self.lock:
-                if not self.is_running:
-                    break
+            # Check if we should continue running (lock-free event check)
+            if self._stop_event.is_set():
+                break
             
             try:
                 # Process one frame through all vision modules
                 # This calls eye_tracker, posture_analyzer, blink_detector, etc.
-                frame_result = self.vision_app.process_frame()
+                # Read the clock once per iteration and share it with every step
+                clock = FrameClock.tick(self.vision_app.start_time)
+                frame_result = self.vision_app.process_frame(
+                    run_posture=(posture_counter % self.POSTURE_EVERY_N_FRAMES == 0),
+                    clock=clock
+                )
+                posture_counter += 1
                 
-                # Extract camera frame first
-                raw_frame = self.vision_app.eye_tracker.get_frame()
+                # Camera frame used by process_frame (no second fetch)
+                raw_frame = frame_result.get('frame')
                 
-                # Create annotated frame with landmarks if enabled
-                if raw_frame is not None:
-                    annotated_frame = raw_frame.copy()
-                    
-                    # Add error message if no face detected
-                    if 'error' in frame_result:
-                        h, w = annotated_frame.shape[:2]
-                        cv2.putText(annotated_frame, "No Face Detected - Please position your face in view", 
-                                  (int(w*0.1), int(h*0.5)), cv2.FONT_HERSHEY_SIMPLEX, 
-                                  0.7, (0, 0, 255), 2)
-                    else:
-                        # Draw face landmarks if enabled
-                        if hasattr(self.vision_app, '_draw_face_landmarks'):
-                            self.vision_app._draw_face_landmarks(annotated_frame, frame_result)
-                else:
-                    annotated_frame = None
-                    
                 # Skip statistics update if there was an error
                 if 'error' in frame_result:
                     # Still update the frame for display, but skip data processing
-                    with self.lock:
-                        self.latest_frame = annotated_frame
-                    time.sleep(0.033)  # ~30 FPS
+                    self._publish_frame(self._annotate_frame(raw_frame, frame_result))
+                    next_deadline = self._pace(next_deadline)  # ~30 FPS
                     continue
                 
                 # Update statistics from frame result
                 self.vision_app.update_statistics(frame_result)
                 
                 # Save frame data for logging
-                self.vision_app.save_frame_data(frame_result, frame_id)
+                self.vision_app.save_frame_data(frame_result, frame_id, clock)
                 
-                # Update shared state with latest data (thread-safe)
-                with self.lock:
-                    self.latest_frame = annotated_frame  # Use annotated frame instead of raw frame
-                    self.latest_health_metrics = self._extract_health_metrics(frame_result)
-                    self.frame_count += 1
-                    
-                    # Update FPS calculation every second
-                    current_time = time.time()
-                    if current_time - self.last_fps_update_time >= 1.0:
-                        time_elapsed = current_time - self.last_fps_update_time
-                        self.frames_per_second = self.frame_count / time_elapsed
-                        self.frame_count = 0
-                        self.last_fps_update_time = current_time
+                # Draw overlays into the back buffer, then publish (atomic rebinds)
+                self._publish_frame(self._annotate_frame(raw_frame, frame_result))  # Use annotated frame instead of raw frame
+                self.latest_health_metrics = self._extract_health_metrics(frame_result)
+                self.frame_count += 1
+                
+                # Update FPS calculation every second
+                current_time = time.time()
+                if current_time - self.last_fps_update_time >= 1.0:
+                    time_elapsed = current_time - self.last_fps_update_time
+                    self.frames_per_second = self.frame_count / time_elapsed
+                    self.frame_count = 0
+                    self.last_fps_update_time = current_time
                 
                 frame_id += 1
                 
                 # Maintain processing rate at ~30 FPS
-                time.sleep(0.033)
+                next_deadline = self._pace(next_deadline)
                 
             except Exception as e:
                 print(f"[VisionManager] Error in vision loop: {e}")
-                with self.lock:
-                    self.last_error = str(e)
-                time.sleep(0.1)  # Brief pause before retry
+                self.last_error = str(e)
+                self._stop_event.wait(timeout=0.1)  # Brief pause before retry
+                next_deadline = time.monotonic()
         
         print("[VisionManager] Vision processing loop ended")
     
+    def _annotate_frame(self, raw_frame: Optional[np.ndarray], frame_result: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Copy raw frame into the back buffer and draw overlays on it
+        
+        The back buffer is never the one currently published as latest_frame,
+        nor the one published just before it.
+        
+        Args:
+            raw_frame: Camera frame from the eye tracker (not modified)
+            frame_result: Processing result from vision_app.process_frame()
+            
+        Returns:
+            The back buffer, or None if no frame is available
+        """
+        if raw_frame is None:
+            return None
+        
+        annotated_frame = self._frame_buffers[self._write_idx]
+        if annotated_frame is None or annotated_frame.shape != raw_frame.shape:
+            annotated_frame = np.empty_like(raw_frame)
+            self._frame_buffers[self._write_idx] = annotated_frame
+        np.copyto(annotated_frame, raw_frame)
+        
+        # Add error message if no face detected (pre-rendered glyphs, blitted via mask)
+        if 'error' in frame_result:
+            self._blit_no_face_overlay(annotated_frame)
+        else:
+            # Draw face landmarks if enabled
+            if hasattr(self.vision_app, '_draw_face_landmarks'):
+                self.vision_app._draw_face_landmarks(annotated_frame, frame_result)
+        
+        return annotated_frame
+    
+    def _blit_no_face_overlay(self, frame: np.ndarray) -> None:
+        """
+        Draw the "No Face Detected" message by copying cached text pixels
+        
+        The text is rasterized with cv2.putText once per frame shape; afterwards
+        only the pixels of its bounding box covered by the glyph mask are copied.
+        
+        Args:
+            frame: Annotated frame to draw on (modified in place)
+        """
+        if self._no_face_overlay is None or self._no_face_overlay[0] != frame.shape:
+            h, w = frame.shape[:2]
+            canvas = np.zeros_like(frame)
+            cv2.putText(canvas, self.NO_FACE_MESSAGE, 
+                      (int(w*0.1), int(h*0.5)), cv2.FONT_HERSHEY_SIMPLEX, 
+                      0.7, (0, 0, 255), 2)
+            # Keep solid glyph pixels only; faint anti-aliased edges on black would darken the frame
+            mask = canvas.max(axis=2) >= 128
+            x, y, bw, bh = cv2.boundingRect(mask.astype(np.uint8))
+            roi = (slice(y, y + bh), slice(x, x + bw))
+            self._no_face_overlay = (frame.shape, roi, canvas[roi].copy(), mask[roi][..., None])
+        
+        _, roi, text_pixels, where = self._no_face_overlay
+        np.copyto(frame[roi], text_pixels, where=where)
+    
+    def _publish_frame(self, annotated_frame: Optional[np.ndarray]) -> None:
+        """
+        Publish the back buffer as latest_frame and advance to the next buffer
+        
+        A single attribute rebind, so readers never need self.lock.
+        
+        Args:
+            annotated_frame: Buffer returned by _annotate_frame(), or None
+        """
+        self.latest_frame = annotated_frame
+        if annotated_frame is not None:
+            self._write_idx = (self._write_idx + 1) % self._FRAME_BUF_SLOTS
+    
     def _extract_health_metrics(self, frame_result: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract health metrics from frame result for WebSocket transmission
@@ -356,7 +456,8 @@ class VisionManager:
         posture_data = frame_result.get('posture_data', {})
         drowsy_data = frame_result.get('drowsy_data', {})
         
-        # Consolidate metrics into a structured format
+        # Consolidate metrics into a new structure on every publish; readers may
+        # keep the published dict, so it is never mutated afterwards
         metrics = {
             # Timestamp
             'timestamp': time.time(),
@@ -422,20 +523,22 @@ class VisionManager:
     
     def get_latest_frame(self) -> Optional[np.ndarray]:
         """
-        Get the latest processed camera frame (thread-safe)
+        Get the latest processed camera frame (thread-safe, lock-free)
         
         Returns:
             numpy array containing the latest frame, or None if not available
         """
-        with self.lock:
-            return self.latest_frame.copy() if self.latest_frame is not None else None
+        frame = self.latest_frame
+        return frame.copy() if frame is not None else None
     
     def get_latest_metrics(self) -> Dict[str, Any]:
         """
-        Get the latest health metrics (thread-safe)
+        Get the latest health metrics (thread-safe, lock-free)
+        
+        The published dict and its nested dicts are never mutated after
+        publishing, so the shallow copy is a consistent snapshot of one frame.
         
         Returns:
             Dict containing the latest health metrics
         """
-        with self.lock:
-            return self.latest_health_metrics.copy()
+        return self.latest_health_metrics.copy()